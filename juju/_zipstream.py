@@ -0,0 +1,290 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""A streaming writer of Zip archives, whose members are compressed in
+parallel, used to build charm archives.
+
+The archive is produced as a sequence of chunks of bytes, in order, so it
+can be written to a file or sent as the body of an upload without the
+whole of it being in memory. Members larger than 4GiB, and archives with
+more than 65535 members, use the zip64 extensions.
+"""
+
+from __future__ import annotations
+
+import collections
+import os
+import struct
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+# Archive members with these suffixes are already compressed, so they are
+# stored as is rather than deflated again
+COMPRESSED_SUFFIXES = frozenset((
+    ".whl",
+    ".gz",
+    ".tgz",
+    ".zip",
+    ".bz2",
+    ".xz",
+    ".zst",
+    ".jar",
+    ".charm",
+))
+
+# (stat.S_IFLNK | 0o755) << 16, the external attributes of a symlink member
+_SYMLINK_ATTR = 2716663808
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_ZIP_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_ZIP_END = struct.Struct("<4s4H2LH")
+_ZIP64_END = struct.Struct("<4sQ2H2L4Q")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+_ZIP64_LIMIT = 0xFFFFFFFF
+
+
+def _dos_date_time(mtime):
+    year, month, day, hour, minute, second = time.localtime(mtime)[:6]
+    if year < 1980:
+        year, month, day, hour, minute, second = 1980, 1, 1, 0, 0, 0
+    return (
+        (year - 1980) << 9 | month << 5 | day,
+        hour << 11 | minute << 5 | second // 2,
+    )
+
+
+class ArchiveMember:
+    """A member of an archive, with its content compressed, or only
+    checksummed if it is stored as is.
+
+    The content of a deflated member is held in memory until it is
+    written; a stored member is read from its file again when written.
+
+    :param str kind: "dir", "link" or "file".
+    :param str real_path: The path of the entry on disk.
+    :param str name: The name of the member in the archive.
+    :param bool compress: Whether to deflate the content of a file, unless
+        its suffix is one of :data:`COMPRESSED_SUFFIXES`.
+    """
+
+    __slots__ = (
+        "compressed_size",
+        "crc",
+        "data",
+        "date",
+        "external_attr",
+        "method",
+        "name",
+        "offset",
+        "real_path",
+        "size",
+        "time",
+    )
+
+    def __init__(self, kind, real_path, name, compress):
+        s = os.lstat(real_path)
+        self.real_path = real_path
+        self.date, self.time = _dos_date_time(s.st_mtime)
+        self.method = zipfile.ZIP_STORED
+        self.crc = 0
+        self.size = 0
+        self.data = b""
+        self.offset = 0
+        if kind == "dir":
+            self.name = name + "/"
+            self.external_attr = (s.st_mode & 0xFFFF) << 16 | 0x10
+        elif kind == "link":
+            self.name = name
+            self.external_attr = _SYMLINK_ATTR
+            self.date, self.time = _dos_date_time(0)
+            self.data = os.readlink(real_path).encode()
+            self.crc = zlib.crc32(self.data)
+            self.size = len(self.data)
+        else:
+            self.name = name
+            self.external_attr = (s.st_mode & 0xFFFF) << 16
+            self._read(compress and Path(name).suffix not in COMPRESSED_SUFFIXES)
+        self.compressed_size = len(self.data) if self.data is not None else self.size
+
+    def _read(self, compress):
+        compressor = None
+        if compress:
+            self.method = zipfile.ZIP_DEFLATED
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+            )
+        chunks = []
+        with open(self.real_path, "rb") as f:
+            for chunk in iter(partial(f.read, 1 << 20), b""):
+                self.crc = zlib.crc32(chunk, self.crc)
+                self.size += len(chunk)
+                if compressor is not None:
+                    chunks.append(compressor.compress(chunk))
+        if compressor is not None:
+            chunks.append(compressor.flush())
+            self.data = b"".join(chunks)
+        else:
+            # stored members are streamed from the file when written
+            self.data = None
+
+    def chunks(self):
+        """Yield the content of the member, as written in the archive."""
+        if self.data is not None:
+            yield self.data
+            return
+        with open(self.real_path, "rb") as f:
+            yield from iter(partial(f.read, 1 << 20), b"")
+
+    def _flags(self):
+        return 0x800 if not self.name.isascii() else 0
+
+    def local_header(self):
+        """Return the local file header of the member."""
+        name = self.name.encode()
+        size, compressed_size, extra = self.size, self.compressed_size, b""
+        if max(size, compressed_size) >= _ZIP64_LIMIT:
+            extra = struct.pack("<2H2Q", 1, 16, size, compressed_size)
+            size = compressed_size = _ZIP64_LIMIT
+        version = 45 if extra else 20
+        return (
+            _ZIP_LOCAL_HEADER.pack(
+                b"PK\x03\x04",
+                version,
+                0,
+                self._flags(),
+                self.method,
+                self.time,
+                self.date,
+                self.crc,
+                compressed_size,
+                size,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+
+    def central_header(self):
+        """Return the central directory header of the member, which must
+        have been given its ``offset`` in the archive.
+        """
+        name = self.name.encode()
+        fields = []
+        size, compressed_size, offset = self.size, self.compressed_size, self.offset
+        if size >= _ZIP64_LIMIT:
+            fields.append(size)
+            size = _ZIP64_LIMIT
+        if compressed_size >= _ZIP64_LIMIT:
+            fields.append(compressed_size)
+            compressed_size = _ZIP64_LIMIT
+        if offset >= _ZIP64_LIMIT:
+            fields.append(offset)
+            offset = _ZIP64_LIMIT
+        extra = b""
+        if fields:
+            extra = struct.pack(f"<2H{len(fields)}Q", 1, 8 * len(fields), *fields)
+        version = 45 if extra else 20
+        return (
+            _ZIP_CENTRAL_HEADER.pack(
+                b"PK\x01\x02",
+                version,
+                3,
+                version,
+                0,
+                self._flags(),
+                self.method,
+                self.time,
+                self.date,
+                self.crc,
+                compressed_size,
+                size,
+                len(name),
+                len(extra),
+                0,
+                0,
+                0,
+                self.external_attr,
+                offset,
+            )
+            + name
+            + extra
+        )
+
+
+def zip_end(count, central_size, central_offset):
+    """Return the end of central directory record of an archive, preceded
+    by the zip64 ones if needed.
+    """
+    end = b""
+    if count >= 0xFFFF or max(central_size, central_offset) >= _ZIP64_LIMIT:
+        zip64_offset = central_offset + central_size
+        end = _ZIP64_END.pack(
+            b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, central_size, central_offset
+        ) + _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, zip64_offset, 1)
+    return end + _ZIP_END.pack(
+        b"PK\x05\x06",
+        0,
+        0,
+        min(count, 0xFFFF),
+        min(count, 0xFFFF),
+        min(central_size, _ZIP64_LIMIT),
+        min(central_offset, _ZIP64_LIMIT),
+        0,
+    )
+
+
+def iter_zip(entries, workers=None, compress=True):
+    """Yield a Zip archive of ``entries`` as chunks of bytes.
+
+    Members are read and compressed ahead, in order, by ``workers``
+    threads. Each deflated member, i.e. each file without one of the
+    :data:`COMPRESSED_SUFFIXES`, is held whole in memory until it is
+    written, and up to 2 * ``workers`` members are in flight at a time, so
+    memory use is bounded by the size of the largest such files.
+
+    :param entries: Iterable of the (kind, real path, archive name) of the
+        members, in archive order. See :class:`ArchiveMember`.
+    :param int workers: Number of threads compressing the members.
+        Defaults to the number of CPUs.
+    :param bool compress: Whether to deflate the content of files.
+    """
+    workers = workers or os.cpu_count() or 1
+    entries = iter(entries)
+    pending = collections.deque()
+    offset = 0
+    members = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+
+        def fill():
+            while len(pending) < 2 * workers:
+                entry = next(entries, None)
+                if entry is None:
+                    return
+                pending.append(pool.submit(ArchiveMember, *entry, compress))
+
+        try:
+            fill()
+            while pending:
+                member = pending.popleft().result()
+                fill()
+                member.offset = offset
+                header = member.local_header()
+                yield header
+                offset += len(header)
+                yield from member.chunks()
+                offset += member.compressed_size
+                # only the headers are needed from now on
+                member.data = b""
+                members.append(member)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    central = b"".join(member.central_header() for member in members)
+    yield central
+    yield zip_end(len(members), len(central), offset)
@@ -90,14 +90,18 @@ class Application(model.ModelEntity):
         whenever a unit is added to this application.
 
         """
-        self.model.add_observer(callable_, "unit", "add", self._unit_match_pattern)
+        return self.model.add_observer(
+            callable_, "unit", "add", self._unit_match_pattern
+        )
 
     def on_unit_remove(self, callable_):
         """Add a "unit removed" observer to this entity, which will be called
         whenever a unit is removed from this application.
 
         """
-        self.model.add_observer(callable_, "unit", "remove", self._unit_match_pattern)
+        return self.model.add_observer(
+            callable_, "unit", "remove", self._unit_match_pattern
+        )
 
     @property
     def units(self):
@@ -554,9 +558,7 @@ class Application(model.ModelEntity):
 
         :return: str status
         """
-        client_facade = client.ClientFacade.from_connection(self.connection)
-
-        full_status = await client_facade.FullStatus(patterns=None)
+        full_status = await self.model.get_status()
         _app = full_status.applications.get(self.name, None)
         if not _app:
             raise JujuError(f"application is not in FullStatus : {self.name}")
@@ -806,16 +808,17 @@ class Application(model.ModelEntity):
 
         # Resolve the given charm URLs with an optionally specified preferred channel.
         # Channel provided via CharmOrigin.
-        resolved_charm_with_channel_results = await charms_facade.ResolveCharms(
-            resolve=[
+        resolved_charm_with_channel_results = await self.model._resolve_charm_results(
+            [
                 client.ResolveCharmWithChannel(
                     charm_origin=origin,
                     switch_charm=bool(switch),
                     reference=charm_url,
                 )
-            ]
+            ],
+            charms_facade,
         )
-        resolved_charm = resolved_charm_with_channel_results.results[0]
+        resolved_charm = resolved_charm_with_channel_results[0]
 
         # Get the destination origin and destination charm_url from the resolved charm
         if resolved_charm.error is not None:
@@ -919,7 +922,9 @@ class Application(model.ModelEntity):
         # Update the application
         await app_facade.SetCharm(**set_charm_args)
 
-        await self.model.block_until(lambda: self.data["charm-url"] == charm_url)
+        await self.model.block_until_changed(
+            lambda: self.data["charm-url"] == charm_url, entity_types=["application"]
+        )
 
     upgrade_charm = refresh
 
@@ -999,7 +1004,9 @@ class Application(model.ModelEntity):
         # Update application
         await app_facade.SetCharm(**set_charm_args)
 
-        await self.model.block_until(lambda: self.data["charm-url"] == charm_url)
+        await self.model.block_until_changed(
+            lambda: self.data["charm-url"] == charm_url, entity_types=["application"]
+        )
 
     async def get_metrics(self):
         """Get metrics for this application's units.
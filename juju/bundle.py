@@ -3,7 +3,12 @@
 from __future__ import annotations
 
 import base64
+import collections
+import copy
+import hashlib
+import heapq
 import io
+import json
 import logging
 import os
 import zipfile
@@ -12,7 +17,6 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Mapping, cast
 
 import requests
-import yaml
 from toposort import toposort_flatten
 
 from . import jasyncio, utils
@@ -20,6 +24,7 @@ from .client import client
 from .constraints import parse as parse_constraints
 from .errors import JujuError
 from .origin import Channel, Source
+from .placement import parse as parse_placement
 from .url import URL, Schema
 from .utils import get_base_from_origin_or_channel
 
@@ -29,16 +34,104 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Number of changes of a bundle plan which are applied at the same time
+DEFAULT_CONCURRENCY = 8
+
+
+class PlanCache:
+    """In-memory LRU cache of the change plans computed by the controller for
+    bundles, which can be shared by the models a bundle is deployed to.
+
+    Plans are keyed by a hash of the bundle and overlays, once local charms
+    and included files are resolved, and of the facts of the model and
+    controller the plan could depend on, so a plan is only reused for an
+    identical deployment.
+
+    :param int maxsize: Maximum number of plans kept.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(path, bundle, overlays, facts):
+        """Return the key of the plan of a bundle, or None if the bundle
+        can't be normalised, e.g. because of mixed types of keys.
+
+        :param str path: The path or url of the bundle.
+        :param dict bundle: The bundle.
+        :param list overlays: The overlays applied to the bundle.
+        :param dict facts: The facts of the model the bundle is deployed to.
+        """
+        try:
+            data = json.dumps(
+                [path, bundle, overlays, facts],
+                sort_keys=True,
+                separators=(",", ":"),
+                default=str,
+            )
+        except TypeError:
+            return None
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def get(self, key):
+        """Return a copy of the JSON data of the plan stored for ``key``, or
+        None. The changes of a plan may be modified as they are applied, so
+        a copy is returned on every hit.
+        """
+        plan = self._entries.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return copy.deepcopy(plan)
+
+    def put(self, key, plan):
+        """Store a copy of the JSON data of a plan for ``key``."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = copy.deepcopy(plan)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every plan."""
+        self._entries.clear()
+
+    def stats(self):
+        """Return the hit and miss counters, and the number of plans."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+        }
+
 
 class BundleHandler:
     """Handle bundles by using the API to translate bundle YAML into a plan of
     steps and then dispatching each of those using the API.
+
+    Changes of the plan which don't depend on each other are applied
+    concurrently, up to ``concurrency`` calls at a time, and ready changes
+    of the same kind are grouped into bulk calls where the API allows it.
+    A ``concurrency`` of 0 doesn't limit it.
+
+    Plans are reused from ``plan_cache``, a :class:`PlanCache`, if given.
     """
 
-    def __init__(self, model, trusted=False, forced=False):
+    def __init__(
+        self, model, trusted=False, forced=False, concurrency=None, plan_cache=None
+    ):
         self.model = model
         self.trusted = trusted
         self.forced = forced
+        self.concurrency = DEFAULT_CONCURRENCY if concurrency is None else concurrency
+        self.plan_cache = plan_cache
         self.bundle = None
         self.overlays = []
         self.overlay_removed_charms = set()
@@ -47,6 +140,8 @@ class BundleHandler:
         self.references = {}
         self._units_by_app = {}
         self.origins = {}
+        self._default_architecture = None
+        self._resolutions = {}
 
         for unit_name, unit in model.units.items():
             app_units = self._units_by_app.setdefault(unit.application, [])
@@ -160,17 +255,22 @@ class BundleHandler:
                 self.model.add_local_charm_dir(*params) for params in args
             ])
 
-            # Update the 'charm:' entry for each app with the new 'local:' url.
-            for app_name, charm_url, (charm_dir, series) in zip(apps, charm_urls, args):
-                metadata = utils.get_local_charm_metadata(charm_dir)
-                resources = await self.model.add_local_resources(
+            # Register and upload the local resources of every app
+            # concurrently too, as the model limits concurrent uploads.
+            app_resources = await jasyncio.gather(*[
+                self.model.add_local_resources(
                     app_name,
                     charm_url,
-                    metadata,
-                    resources=bundle.get("applications", {app_name: {}})[app_name].get(
-                        "resources", {}
-                    ),
+                    utils.get_local_charm_metadata(charm_dir),
+                    resources=apps_dict[app_name].get("resources", {}),
                 )
+                for app_name, charm_url, (charm_dir, _) in zip(apps, charm_urls, args)
+            ])
+
+            # Update the 'charm:' entry for each app with the new 'local:' url.
+            for app_name, charm_url, (charm_dir, series), resources in zip(
+                apps, charm_urls, args, app_resources
+            ):
                 apps_dict[app_name]["charm"] = charm_url
                 apps_dict[app_name]["resources"] = resources
                 origin = client.CharmOrigin(source="local", risk="stable")
@@ -220,7 +320,7 @@ class BundleHandler:
                             )
 
                         # get the contents of the file
-                        config_contents = yaml.safe_load(config_path.read_text())
+                        config_contents = utils.load_yaml_file(config_path)
 
                         # inline the configurations for the current app into
                         # the app['options']
@@ -295,19 +395,21 @@ class BundleHandler:
         if not bundle_yaml:
             raise JujuError("empty bundle, nothing to deploy")
 
-        _bundles = [b for b in yaml.safe_load_all(bundle_yaml)]
+        _bundles = utils.yaml_load_all(bundle_yaml)
         self.overlays = _bundles[1:]
         self.bundle = _bundles[0]
 
         if overlays != []:
             for overlay_yaml_path in overlays:
                 try:
-                    overlay_contents = Path(overlay_yaml_path).read_text()
+                    overlay_contents = utils.load_yaml_file(
+                        overlay_yaml_path, all_documents=True
+                    )
                 except OSError as e:
                     raise JujuError(
                         "unable to open overlay %s \n %s" % (overlay_yaml_path, e)
                     )
-                self.overlays.extend(yaml.safe_load_all(overlay_contents))
+                self.overlays.extend(overlay_contents)
 
         # gather the names of the removed charms so model.deploy
         # wouldn't wait for them to appear in the model
@@ -324,9 +426,19 @@ class BundleHandler:
 
         self.bundle, self.overlays = self._resolve_include_file_config(bundle_dir)
 
-        _yaml_data = [yaml.dump(self.bundle)]
+        key = None
+        if self.plan_cache is not None:
+            key = self.plan_cache.key(
+                path, self.bundle, self.overlays, self._plan_facts()
+            )
+            plan = self.plan_cache.get(key) if key is not None else None
+            if plan is not None:
+                self.plan = client.BundleChangesMapArgsResults.from_json(plan)
+                return
+
+        _yaml_data = [utils.yaml_dump(self.bundle)]
         for overlay in self.overlays:
-            _yaml_data.append(yaml.dump(overlay).replace("null", ""))  # noqa: PERF401
+            _yaml_data.append(utils.yaml_dump(overlay).replace("null", ""))  # noqa: PERF401
         yaml_data = "---\n".join(_yaml_data)
 
         self.plan = await self.bundle_facade.GetChangesMapArgs(
@@ -336,6 +448,22 @@ class BundleHandler:
         if self.plan.errors and any(self.plan.errors):
             raise JujuError(self.plan.errors)
 
+        if key is not None:
+            self.plan_cache.put(key, json.loads(self.plan.to_json()))
+
+    def _plan_facts(self):
+        """Return the facts of the model and controller which the plan of
+        a bundle could depend on.
+        """
+        info = self.model.info
+        return {
+            "server-version": self.model.connection().info.get("server-version"),
+            "agent-version": info.agent_version,
+            "default-series": info.default_series,
+            "default-base": info.default_base,
+            "empty": not (self.model.applications or self.model.machines),
+        }
+
     async def _download_bundle(self, charm_url, origin):
         if self.charms_facade is None:
             raise JujuError(
@@ -384,30 +512,90 @@ class BundleHandler:
                 return archive.read(member)
         raise JujuError("bundle.yaml not found")
 
-    async def _resolve_charms(self):
-        deployed = dict()
+    async def _architecture(self, url=None):
+        """Return the architecture of the charm at ``url``, or the default
+        architecture of the model, which is only looked up once per plan.
+
+        :param url: the URL of the charm, if any.
+        """
+        if url is not None and url.architecture:
+            return url.architecture
+        if self._default_architecture is None:
+            self._default_architecture = jasyncio.ensure_future(
+                self.model._resolve_architecture()
+            )
+        return await self._default_architecture
+
+    @staticmethod
+    def _resolution_key(url, origin):
+        base = origin.base
+        return (
+            str(url),
+            origin.track,
+            origin.risk,
+            origin.architecture,
+            origin.revision,
+            base.name if base is not None else None,
+            base.channel if base is not None else None,
+        )
 
+    async def _resolve_charm(self, url, origin):
+        """Resolve a charm, reusing the resolution of the same charm and
+        origin done earlier in this plan, if any.
+
+        :returns url.URL, client.CharmOrigin
+        """
+        return (await self._resolve_charm_batch([(url, origin)]))[0]
+
+    async def _resolve_charm_batch(self, charms):
+        """Resolve several charms, with one Charms.ResolveCharms call for
+        those not resolved earlier in this plan.
+
+        :param charms: list of (url, client.CharmOrigin) pairs.
+        :returns [(url.URL, client.CharmOrigin)], in the order of ``charms``
+        """
+        keys = [self._resolution_key(url, origin) for url, origin in charms]
+        missing = {}
+        for key, charm in zip(keys, charms):
+            if key not in self._resolutions:
+                missing.setdefault(key, charm)
+        if missing:
+            resolved = await self.model._resolve_charms(list(missing.values()))
+            self._resolutions.update(zip(missing, resolved))
+        return [self._resolutions[key] for key in keys]
+
+    async def _resolve_charms(self):
         specs = self.applications_specs
 
-        for name in self.applications:
+        pending = []
+        for name in sorted(self.applications):
             spec = specs[name]
             app = self.model.applications.get(name, None)
 
-            cons = None
             if app is not None:
-                deployed[name] = name
-
                 if is_local_charm(spec["charm"]):
                     spec["charm"] = self.model.applications[name]
                     continue
                 if spec["charm"] == app.charm_url:
                     continue
 
-                cons = await app.get_constraints()
-
             if is_local_charm(spec["charm"]):
                 continue
 
+            pending.append((spec, app))
+
+        # existing applications keep the architecture they are deployed on
+        constraints = [None] * len(pending)
+        if self.charms_facade is not None:
+            existing = [i for i, (_, app) in enumerate(pending) if app is not None]
+            results = await jasyncio.gather(*[
+                pending[i][1].get_constraints() for i in existing
+            ])
+            for i, cons in zip(existing, results):
+                constraints[i] = cons
+
+        charms = []
+        for (spec, _), cons in zip(pending, constraints):
             charm_url = URL.parse(spec["charm"])
 
             channel = (
@@ -419,31 +607,29 @@ class BundleHandler:
             series = spec.get("series", self.bundle.get("series", None))
             base = get_base_from_origin_or_channel(channel, series)
 
+            origin = client.CharmOrigin(
+                source=Source.CHARM_HUB.value,
+                risk=risk,
+                track=track,
+                base=base,
+            )
             if self.charms_facade is not None:
                 if cons is not None and cons["arch"] != "":
-                    architecture = cons["arch"]
+                    origin.architecture = cons["arch"]
                 else:
-                    architecture = await self.model._resolve_architecture(charm_url)
-
-                origin = client.CharmOrigin(
-                    source=Source.CHARM_HUB.value,
-                    architecture=architecture,
-                    risk=risk,
-                    track=track,
-                    base=base,
-                )
-                charm_url, charm_origin = await self.model._resolve_charm(
-                    charm_url, origin
-                )
-                spec["charm"] = str(charm_url)
-            else:
-                charm_origin = client.CharmOrigin(
-                    source=Source.CHARM_HUB.value,
-                    risk=risk,
-                    track=track,
-                    base=base,
-                )
+                    origin.architecture = await self._architecture(charm_url)
+            charms.append((spec, charm_url, channel, origin))
+
+        if self.charms_facade is not None:
+            resolved = await self._resolve_charm_batch([
+                (charm_url, origin) for _, charm_url, _, origin in charms
+            ])
+        else:
+            resolved = [(charm_url, origin) for _, charm_url, _, origin in charms]
 
+        for (spec, _, channel, _), (charm_url, charm_origin) in zip(charms, resolved):
+            if self.charms_facade is not None:
+                spec["charm"] = str(charm_url)
             if str(channel) not in self.origins:
                 self.origins[str(charm_url)] = {}
             self.origins[str(charm_url)][str(channel)] = charm_origin
@@ -452,13 +638,113 @@ class BundleHandler:
         await self._resolve_charms()
 
         changes = ChangeSet(self.plan.changes)
-        for step in changes.sorted():
-            change_cls = self.change_types.get(step.method)
-            if change_cls is None:
-                raise NotImplementedError(f"unknown change type: {step.method}")
-            change = change_cls(step.id_, step.requires, step.args)
+        await self._execute_changes(changes.sorted())
+
+    def _make_change(self, step):
+        change_cls = self.change_types.get(step.method)
+        if change_cls is None:
+            raise NotImplementedError(f"unknown change type: {step.method}")
+        return change_cls(step.id_, step.requires, step.args)
+
+    def _next_batch(self, changes, ready):
+        """Pop the first ready change off the ``ready`` heap, together with
+        the other ready changes which can be applied with it in one call.
+        """
+        i = heapq.heappop(ready)
+        key = changes[i].batch_key(self)
+        if key is None:
+            return [i]
+        batch, rest = [i], []
+        for j in ready:
+            if changes[j].batch_key(self) == key:
+                batch.append(j)
+            else:
+                rest.append(j)
+        if len(batch) > 1:
+            heapq.heapify(rest)
+            ready[:] = rest
+            batch.sort()
+        return batch
+
+    async def _run_batch(self, batch):
+        for change in batch:
             log.info(f"Applying change: {change}")
-            self.references[step.id_] = await change.run(self)
+        if len(batch) == 1:
+            return [await batch[0].run(self)]
+        return await type(batch[0]).run_batch(batch, self)
+
+    async def _execute_changes(self, steps):
+        """Apply the topologically sorted ``steps``, starting each one as
+        soon as the changes it requires are applied and their references
+        are set.
+
+        Ready changes of the same kind are applied together with one bulk
+        call, where the API allows it (see :meth:`ChangeInfo.batch_key`).
+
+        Once a change fails, no other change is started, so the changes
+        depending on it are never applied, and the changes in flight are
+        left to finish. The error of the failed change which comes first in
+        ``steps`` is then raised, whatever the order the changes failed in.
+
+        :param steps: The changes of the plan, in topological order.
+        """
+        changes = [self._make_change(step) for step in steps]
+        order = {step.id_: i for i, step in enumerate(steps)}
+        waiting_on = {}
+        dependents = {}
+        ready = []
+        for i, step in enumerate(steps):
+            # requirements outside of the plan are considered satisfied
+            requires = {r for r in step.requires if r in order and r != step.id_}
+            waiting_on[i] = len(requires)
+            for r in requires:
+                dependents.setdefault(order[r], []).append(i)
+            if not requires:
+                heapq.heappush(ready, i)
+
+        limit = self.concurrency or len(steps)
+        running = {}
+        failures = {}
+        try:
+            while ready or running:
+                while ready and len(running) < limit and not failures:
+                    batch = self._next_batch(changes, ready)
+                    task = jasyncio.ensure_future(
+                        self._run_batch([changes[i] for i in batch])
+                    )
+                    running[task] = batch
+                if not running:
+                    break
+                done, _ = await jasyncio.wait(
+                    running, return_when=jasyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    batch = running.pop(task)
+                    if task.cancelled():
+                        results = [jasyncio.CancelledError()] * len(batch)
+                    elif task.exception() is not None:
+                        results = [task.exception()] * len(batch)
+                    else:
+                        results = task.result()
+                    for i, result in zip(batch, results):
+                        if isinstance(result, BaseException):
+                            failures[i] = result
+                            continue
+                        self.references[steps[i].id_] = result
+                        for j in dependents.get(i, ()):
+                            waiting_on[j] -= 1
+                            if waiting_on[j] == 0:
+                                heapq.heappush(ready, j)
+        finally:
+            for task in running:
+                task.cancel()
+
+        if failures:
+            first = min(failures)
+            for i, error in sorted(failures.items()):
+                if i != first:
+                    log.error("Change %s also failed: %r", steps[i].id_, error)
+            raise failures[first]
 
     @property
     def applications(self):
@@ -544,13 +830,10 @@ class ChangeSet:
         for change in self.changes:
             changes[change.id_] = set(change.requires)
         sorted_changes = toposort_flatten(changes)
-        results = []
-        for change_id in sorted_changes:
-            for change in self.changes:
-                if change_id == change.id_:
-                    results.append(change)
-                    break
-        return results
+        by_id = {}
+        for change in self.changes:
+            by_id.setdefault(change.id_, change)
+        return [by_id[change_id] for change_id in sorted_changes if change_id in by_id]
 
 
 class ChangeInfo:
@@ -575,6 +858,29 @@ class ChangeInfo:
             else:
                 setattr(self, v, None)
 
+    def batch_key(self, context):
+        """Return a key shared by the changes which can be applied together
+        with :meth:`run_batch`, or None if this change is applied on its own.
+
+        Only called once the changes this one requires are applied.
+
+        :param context: is used for any methods or properties required to
+            perform a change.
+        """
+        return None
+
+    @classmethod
+    async def run_batch(cls, changes, context):
+        """Executes several changes with the same :meth:`batch_key`.
+
+        :param changes: the changes to execute.
+        :param context: is used for any methods or properties required to
+            perform a change.
+        :return: the result of each change, in order, or the exception it
+            failed with.
+        """
+        return [await change.run(context) for change in changes]
+
 
 class AddApplicationChange(ChangeInfo):
     _toPy = {
@@ -639,15 +945,15 @@ class AddApplicationChange(ChangeInfo):
 
         # resolve indirect references
         charm = context.resolve(self.charm)
-        options = {}
-        if self.options is not None:
-            options = self.options
+        options = self.options if self.options is not None else {}
         if context.trusted:
             if model.info.agent_version < client.Number.from_json("2.4.0"):
                 raise NotImplementedError(
                     f"trusted is not supported on model version {model.info.agent_version}"
                 )
-            options["trust"] = "true"
+            # copied, so that the args of the change, which may come from a
+            # cached plan, are left as they are
+            options = {**options, "trust": "true"}
 
         url = URL.parse(str(charm))
 
@@ -767,7 +1073,7 @@ class AddCharmChange(ChangeInfo):
                 ch = Channel.parse(self.channel).normalize()
             arch = self.architecture
             if not arch:
-                arch = await context.model._resolve_architecture(url)
+                arch = await context._architecture(url)
             base = get_base_from_origin_or_channel(ch, self.series)
             origin = client.CharmOrigin(
                 source=Source.CHARM_HUB.value,
@@ -777,7 +1083,7 @@ class AddCharmChange(ChangeInfo):
                 revision=self.revision,
                 base=base,
             )
-            identifier, origin = await context.model._resolve_charm(url, origin)
+            identifier, origin = await context._resolve_charm(url, origin)
 
         if identifier is None:
             raise JujuError(f"unknown charm {self.charm}")
@@ -837,6 +1143,30 @@ class AddMachineChange(ChangeInfo):
         :param context: is used for any methods or properties required to
             perform a change.
         """
+        result = (await self.run_batch([self], context))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def batch_key(self, context):
+        return self.method()
+
+    @classmethod
+    async def run_batch(cls, changes, context):
+        params = [change._params(context) for change in changes]
+        results = await context.machine_manager_facade.AddMachines(params=params)
+        machines = []
+        for result in results.machines:
+            if result.error:
+                machines.append(
+                    ValueError("Error adding machine: %s" % result.error.message)
+                )
+                continue
+            log.debug("Added new machine %s", result.machine)
+            machines.append(result.machine)
+        return machines
+
+    def _params(self, context):
         # Fix up values, as necessary.
         params = {}
         if self.parent_id is not None:
@@ -864,15 +1194,7 @@ class AddMachineChange(ChangeInfo):
         else:
             params["container_type"] = self.container_type
 
-        # Submit the request.
-        params = client.AddMachineParams(**params)
-        results = await context.machine_manager_facade.AddMachines(params=[params])
-        error = results.machines[0].error
-        if error:
-            raise ValueError("Error adding machine: %s" % error.message)
-        machine = results.machines[0].machine
-        log.debug("Added new machine %s", machine)
-        return machine
+        return client.AddMachineParams(**params)
 
     def __str__(self):
         machine = "new machine"
@@ -983,6 +1305,49 @@ class AddUnitChange(ChangeInfo):
             to=placement,
         )
 
+    def batch_key(self, context):
+        if context.model.info.type_ == "caas":
+            # scaled one change at a time, see Application.add_unit
+            return None
+        return (self.method(), context.resolve(self.application))
+
+    @classmethod
+    async def run_batch(cls, changes, context):
+        application = context.resolve(changes[0].application)
+        results = [None] * len(changes)
+        placed, unplaced = [], []
+        for k, change in enumerate(changes):
+            if context._units_by_app.get(application):
+                unit_name = context._units_by_app[application].pop()
+                log.debug("Reusing unit %s for %s", unit_name, application)
+                results[k] = context.model.units[unit_name]
+                continue
+            placement = context.resolve(change.to)
+            if placement:
+                placed.append((k, placement))
+            else:
+                unplaced.append((k, None))
+        new = placed + unplaced
+        if not new:
+            return results
+
+        # The placements apply to the first units added, in order, so
+        # the units to place go first.
+        log.debug("Adding %s new units for %s", len(new), application)
+        app = context.model.applications[application]
+        result = await app._facade().AddUnits(
+            application=application,
+            placement=parse_placement([p for _, p in placed]) if placed else None,
+            num_units=len(new),
+            attach_storage=[],
+        )
+        units = await jasyncio.gather(*[
+            context.model._wait_for_new("unit", unit_id) for unit_id in result.units
+        ])
+        for (k, _), unit in zip(new, units):
+            results[k] = [unit]
+        return results
+
     def __str__(self):
         return f"add {self.application} unit to {self.to}"
 
@@ -1186,12 +1551,36 @@ class SetAnnotationsChange(ChangeInfo):
         :param context: is used for any methods or properties required to
             perform a change.
         """
+        entity = await self._entity(context)
+        return await entity.set_annotations(self.annotations)
+
+    async def _entity(self, context):
         entity_id = context.resolve(self.id)
         try:
-            entity = context.model.state.get_entity(self.entity_type, entity_id)
+            return context.model.state.get_entity(self.entity_type, entity_id)
         except KeyError:
-            entity = await context.model._wait_for_new(self.entity_type, entity_id)
-        return await entity.set_annotations(self.annotations)
+            return await context.model._wait_for_new(self.entity_type, entity_id)
+
+    def batch_key(self, context):
+        return self.method()
+
+    @classmethod
+    async def run_batch(cls, changes, context):
+        entities = await jasyncio.gather(*[
+            change._entity(context) for change in changes
+        ])
+        # The errors returned by Annotations.Set don't say which entity
+        # they are about, so every change gets the whole result, as the
+        # reference of a single change does.
+        result = await context.ann_facade.Set(
+            annotations=[
+                client.EntityAnnotations(
+                    entity=entity.tag, annotations=change.annotations
+                )
+                for change, entity in zip(changes, entities)
+            ]
+        )
+        return [result] * len(changes)
 
     def __str__(self):
         return f"set annotations for {self.id}"
@@ -0,0 +1,422 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""A cache of charm resolutions and charm metadata, which can be shared by
+the models of a process, and optionally persisted between processes.
+
+Resolving a charm (``Charms.ResolveCharms``) and fetching its metadata
+(``Charms.CharmInfo``) give the same answers for every model of a
+controller, so deploying the same charms into many models doesn't need to
+ask the controller again each time::
+
+    cache = CharmCache(ttl=600, directory="~/.cache/python-libjuju/charms")
+    for name in model_names:
+        model = Model(charm_cache=cache)
+        await model.connect(name)
+        await model.deploy("postgresql")
+
+Entries are kept per controller, in least recently used order, and expire
+``ttl`` seconds after they were stored, so that newly released revisions
+are eventually picked up. :meth:`CharmCache.invalidate` drops entries
+early.
+
+When the cache is used from an event loop, the changed entries are written
+in an executor, at most once every ``save_delay`` seconds, rather than on
+every change. Call :meth:`CharmCache.flush` to write them before exiting.
+
+Local charms are handled by :class:`LocalCharmCache`, which keeps the
+archives built from charm directories by their content hash, and remembers
+which of them were uploaded to which model, so that deploying an unchanged
+charm directory again neither rebuilds nor uploads it.
+"""
+
+from __future__ import annotations
+
+import collections
+import hashlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from . import jasyncio
+
+log = logging.getLogger(__name__)
+
+RESOLVE = "resolve"
+CHARM_INFO = "charm-info"
+
+
+def dump_result(result):
+    """Return the JSON data of a facade result, including the fields
+    unknown to the client, e.g. the supported-series of a resolution.
+    """
+    data = json.loads(result.to_json())
+    data.update(result.unknown_fields)
+    return data
+
+
+class CharmCache:
+    """In-memory LRU cache, with expiry and optional on-disk persistence, of
+    the charm resolutions and charm metadata returned by controllers.
+
+    Values are stored as JSON data, and a copy is returned on every hit, so
+    callers are free to modify what they get.
+
+    :param int maxsize: Maximum number of entries kept per controller.
+    :param float ttl: Seconds an entry is valid for after it was stored.
+    :param directory: Optional directory where the entries are persisted,
+        in one ``<controller-uuid>.json`` file per controller.
+    :param float save_delay: Seconds the changes are held for before they
+        are persisted, when there is a running event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 3600,
+        directory=None,
+        save_delay: float = 1.0,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.directory = Path(directory).expanduser() if directory else None
+        self.save_delay = save_delay
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        # controllers with changes that aren't persisted yet
+        self._dirty = set()
+        self._save_handle = None
+        self._writing = None
+        # snapshots are numbered, so that a write never replaces a newer one
+        # and none is done after clear()
+        self._snapshots = itertools.count()
+        self._written = {}
+        self._cleared = -1
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def _key(kind, key):
+        return json.dumps([kind, key], sort_keys=True, separators=(",", ":"))
+
+    def _controller(self, controller_uuid):
+        entries = self._entries.get(controller_uuid)
+        if entries is None:
+            entries = self._entries[controller_uuid] = self._load(controller_uuid)
+        return entries
+
+    def _path(self, controller_uuid):
+        return self.directory / f"{controller_uuid}.json"
+
+    def _load(self, controller_uuid):
+        entries = collections.OrderedDict()
+        if self.directory is None:
+            return entries
+        try:
+            with open(self._path(controller_uuid), encoding="utf-8") as f:
+                for key, entry in json.load(f):
+                    entries[key] = entry
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            log.warning(
+                "Ignoring unreadable charm cache for %s: %s", controller_uuid, e
+            )
+        return entries
+
+    def _save(self, controller_uuid):
+        if self.directory is None:
+            return
+        self._dirty.add(controller_uuid)
+        try:
+            loop = jasyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self._save_later, loop)
+
+    def _save_later(self, loop):
+        self._save_handle = None
+        if self._dirty:
+            self._writing = loop.run_in_executor(None, self._write, *self._snapshot())
+
+    def _snapshot(self):
+        # serialized here, as the entries may change while they are written
+        data = {
+            uuid: json.dumps(list(self._entries.get(uuid, {}).items()))
+            for uuid in self._dirty
+        }
+        self._dirty.clear()
+        return next(self._snapshots), data
+
+    def _write(self, snapshot, data):
+        with self._write_lock:
+            if snapshot < self._cleared:
+                return
+            for controller_uuid, text in data.items():
+                if snapshot < self._written.get(controller_uuid, -1):
+                    continue
+                self._written[controller_uuid] = snapshot
+                try:
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(text)
+                    os.replace(tmp, self._path(controller_uuid))
+                except OSError as e:
+                    log.warning(
+                        "Unable to save charm cache for %s: %s", controller_uuid, e
+                    )
+
+    def flush(self):
+        """Persist the changes which haven't been written yet, e.g. before
+        exiting. This blocks until they are written.
+        """
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._dirty:
+            self._write(*self._snapshot())
+
+    def stats(self):
+        """Return the hit and miss counters, and the number of entries."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": sum(len(entries) for entries in self._entries.values()),
+        }
+
+    def get(self, controller_uuid, kind, key):
+        """Return a copy of the value stored for ``key``, or None if there
+        is none or it has expired.
+
+        :param str controller_uuid: The controller the value comes from.
+        :param str kind: The kind of value, e.g. :data:`RESOLVE`.
+        :param key: JSON serializable key of the value.
+        """
+        entries = self._controller(controller_uuid)
+        cache_key = self._key(kind, key)
+        entry = entries.get(cache_key)
+        if entry is not None and time.time() - entry["stored"] >= self.ttl:
+            del entries[cache_key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entries.move_to_end(cache_key)
+        return json.loads(json.dumps(entry["value"]))
+
+    def put(self, controller_uuid, kind, key, value, charm=None):
+        """Store the JSON data ``value`` for ``key``.
+
+        :param str charm: The name of the charm the value is about, to allow
+            invalidating it with :meth:`invalidate`.
+        """
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        entries = self._controller(controller_uuid)
+        cache_key = self._key(kind, key)
+        entries[cache_key] = {"stored": time.time(), "charm": charm, "value": value}
+        entries.move_to_end(cache_key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        self._save(controller_uuid)
+
+    def invalidate(self, charm=None, controller_uuid=None):
+        """Drop entries, e.g. after publishing a new revision of a charm.
+
+        :param str charm: Only drop the entries about the charm of this name.
+        :param str controller_uuid: Only drop the entries of this
+            controller.
+        """
+        if controller_uuid is not None:
+            self._controller(controller_uuid)
+            controllers = [controller_uuid]
+        else:
+            if self.directory is not None:
+                for path in self.directory.glob("*.json"):
+                    self._controller(path.stem)
+            controllers = list(self._entries)
+        for uuid in controllers:
+            entries = self._entries[uuid]
+            for key in [
+                k for k, e in entries.items() if charm is None or e["charm"] == charm
+            ]:
+                del entries[key]
+            self._save(uuid)
+
+    def clear(self):
+        """Drop every entry, including the persisted ones."""
+        self._entries.clear()
+        self._dirty.clear()
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self.directory is not None:
+            with self._write_lock:
+                self._cleared = next(self._snapshots)
+                for path in self.directory.glob("*.json"):
+                    path.unlink(missing_ok=True)
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalCharmCache:
+    """Cache of the archives of local charm directories, by content hash,
+    and of the charms uploaded from them to each model.
+
+    The content hash of a charm directory is only computed again when the
+    names, sizes, modes or modification times of its files change.
+
+    :param directory: The directory where the archives and the index of
+        the cache are kept.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory).expanduser()
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _index_path(self):
+        return self.directory / "index.json"
+
+    def _load(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except FileNotFoundError:
+                self._index = {}
+            except (OSError, ValueError) as e:
+                log.warning("Ignoring unreadable local charm cache index: %s", e)
+                self._index = {}
+            self._index.setdefault("trees", {})
+            self._index.setdefault("uploads", {})
+        return self._index
+
+    def _save(self):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._index, f)
+            os.replace(tmp, self._index_path())
+        except OSError as e:
+            log.warning("Unable to save local charm cache index: %s", e)
+
+    def archive(self, charm_dir):
+        """Return the path to the archive of ``charm_dir`` and its content
+        hash, building the archive only if it isn't in the cache yet. A
+        charm archive is returned as is, with the hash of its content.
+
+        This blocks, so it should be run in an executor.
+
+        :param charm_dir: The charm directory, or charm archive.
+        :returns (Path, str)
+        """
+        from .model import CharmArchiveGenerator
+
+        charm_dir = Path(charm_dir).expanduser().absolute()
+        if charm_dir.is_file():
+            generator = None
+            s = charm_dir.stat()
+            signature = f"{s.st_size}:{s.st_mtime_ns}"
+        else:
+            generator = CharmArchiveGenerator(str(charm_dir))
+            signature = generator.stat_signature()
+        with self._lock:
+            trees = self._load()["trees"]
+            known = trees.get(str(charm_dir))
+        if known is not None and known["signature"] == signature:
+            content_hash = known["hash"]
+        else:
+            if generator is None:
+                content_hash = _file_hash(charm_dir)
+            else:
+                content_hash = generator.content_hash()
+            with self._lock:
+                trees[str(charm_dir)] = {"signature": signature, "hash": content_hash}
+                self._save()
+
+        if generator is None:
+            return charm_dir, content_hash
+
+        path = self.directory / f"{content_hash}.charm"
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".charm.tmp")
+            os.close(fd)
+            try:
+                generator.make_archive(tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        return path, content_hash
+
+    @staticmethod
+    def _upload_key(model_uuid, content_hash, series):
+        return f"{model_uuid}:{content_hash}:{series or ''}"
+
+    def uploaded(self, model_uuid, content_hash, series):
+        """Return the record of the upload of the charm of ``content_hash``
+        to the model, as a dict with its "charm-url" and the "seconds" the
+        upload took, or None.
+        """
+        key = self._upload_key(model_uuid, content_hash, series)
+        with self._lock:
+            return self._load()["uploads"].get(key)
+
+    def record_upload(self, model_uuid, content_hash, series, charm_url, seconds):
+        """Remember that the charm of ``content_hash`` was uploaded to the
+        model as ``charm_url``, which took ``seconds``.
+        """
+        key = self._upload_key(model_uuid, content_hash, series)
+        with self._lock:
+            self.misses += 1
+            self._load()["uploads"][key] = {"charm-url": charm_url, "seconds": seconds}
+            self._save()
+
+    def record_reuse(self, record):
+        """Account for the reuse of an uploaded charm instead of uploading
+        it again, and return the seconds saved.
+        """
+        with self._lock:
+            self.hits += 1
+            self.time_saved += record["seconds"]
+        return record["seconds"]
+
+    def forget_upload(self, model_uuid, content_hash, series):
+        """Forget the upload of a charm, e.g. which the model doesn't have
+        anymore.
+        """
+        key = self._upload_key(model_uuid, content_hash, series)
+        with self._lock:
+            if self._load()["uploads"].pop(key, None) is not None:
+                self._save()
+
+    def stats(self):
+        """Return the hit and miss counters of the uploads, and the seconds
+        saved by not uploading charms again.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "time_saved": self.time_saved,
+        }
@@ -2,6 +2,7 @@
 # Licensed under the Apache V2, see LICENCE file for details.
 
 import json
+from functools import partial
 
 import requests
 
@@ -14,14 +15,21 @@ from .errors import JujuError
 class CharmHub:
     def __init__(self, model):
         self.model = model
+        self._url = None
 
     async def _charmhub_url(self):
-        model_conf = await self.model.get_config()
-        return model_conf["charmhub-url"]
+        # The charmhub-url of a model can't be changed, so it is only
+        # looked up once
+        if self._url is None:
+            model_conf = await self.model.get_config()
+            self._url = model_conf["charmhub-url"]
+        return self._url
 
     async def request_charmhub_with_retry(self, url, retries):
+        loop = jasyncio.get_running_loop()
         for _ in range(retries):
-            _response = requests.get(url)  # noqa: S113
+            # requests blocks, so it is run in a thread
+            _response = await loop.run_in_executor(None, partial(requests.get, url))
             if _response.status_code == 200:
                 return _response
             await jasyncio.sleep(5)
@@ -234,6 +234,8 @@ class Connection:
 
         self.messages = IdQueue()
         self.monitor = Monitor(connection=self)
+        # Optional recorder of the RPC traffic, see juju.replay.DeltaRecorder
+        self.recorder = None
         if max_frame_size is None:
             max_frame_size = self.MAX_FRAME_SIZE
         self.max_frame_size = max_frame_size
@@ -588,6 +590,8 @@ class Connection:
                     raise
         result = await self._recv(msg["request-id"])
         log.debug(f"connection id : {id(self)} <--- {result}")
+        if self.recorder is not None:
+            self.recorder.record_rpc(outgoing, result)
 
         if not result:
             return result
@@ -5,8 +5,6 @@ import abc
 import os
 import pathlib
 
-import yaml
-
 from juju import tag
 from juju.client import client as jujuclient
 from juju.client.gocookies import GoCookieJar
@@ -15,7 +13,7 @@ from juju.errors import (
     JujuError,
     PylibjujuProgrammingError,
 )
-from juju.utils import juju_config_dir
+from juju.utils import juju_config_dir, load_yaml_file
 
 API_ENDPOINTS_KEY = "api-endpoints"
 
@@ -174,10 +172,9 @@ class FileJujuData(JujuData):
             return self._loaded[filename].get(key)
         # TODO use the file lock like Juju does.
         filepath = os.path.join(self.path, filename)
-        with open(filepath) as f:
-            data = yaml.safe_load(f)
-            self._loaded[filename] = data
-            return data.get(key)
+        data = load_yaml_file(filepath)
+        self._loaded[filename] = data
+        return data.get(key)
 
     def cookies_for_controller(self, controller_name):
         f = pathlib.Path(self.path) / "cookies" / (controller_name + ".json")
@@ -19,6 +19,7 @@ __all__ = [
 __patches__ = [
     "ResourcesFacade",
     "AllWatcherFacade",
+    "AllModelWatcherFacade",
     "ActionFacade",
 ]
 
@@ -117,6 +118,21 @@ class AllWatcherFacade(Type):
         return result
 
 
+class AllModelWatcherFacade(Type):
+    """Patch rpc method of the all-model watcher to add in 'id' stuff."""
+
+    async def rpc(self, msg):
+        if not hasattr(self, "Id"):
+            controller = _client.ControllerFacade.from_connection(self.connection)
+
+            result = await controller.WatchAllModels()
+            self.Id = result.watcher_id
+
+        msg["Id"] = self.Id
+        result = await self.connection.rpc(msg, encoder=TypeEncoder)
+        return result
+
+
 class ActionFacade(Type):
     class _FindTagsResults(Type):
         _toSchema = {"matches": "matches"}
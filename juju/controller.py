@@ -885,6 +885,30 @@ class Controller:
         jasyncio.ensure_future(_watcher(stop_event))
         return stop_event
 
+    async def watch_all_models(self, model_uuids=None, watch_filter=None):
+        """Watch the state of all the models of the controller over this
+        connection.
+
+        The returned watcher has received the current state of every model
+        when this returns. Observers can be added to it as with
+        :meth:`juju.model.Model.add_observer`, optionally for a single
+        model. Call ``stop()`` on the watcher, or use it as an async context
+        manager, to stop watching.
+
+        :param model_uuids: Optional list of the uuids of the models to
+            watch. Defaults to all models.
+        :param watch_filter: Optional :class:`juju.model.WatchFilter`, or
+            dict of its arguments, applied to the deltas of every model.
+        :return ControllerWatcher: The started watcher.
+        """
+        from juju.model import ControllerWatcher
+
+        watcher = ControllerWatcher(
+            self, model_uuids=model_uuids, watch_filter=watch_filter
+        )
+        await watcher.start()
+        return watcher
+
     async def add_secret_backends(self, id_, name, backend_type, config):
         """Add a new secret backend.
 
@@ -37,6 +37,9 @@ from asyncio import (
 from asyncio import (
     Queue as Queue,
 )
+from asyncio import (
+    Semaphore as Semaphore,
+)
 from asyncio import (
     TimeoutError as TimeoutError,  # noqa: A004
 )
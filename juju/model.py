@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import base64
 import collections
+import copy
+import gzip
 import hashlib
 import json
 import logging
@@ -12,24 +14,34 @@ import re
 import stat
 import sys
 import tempfile
+import time
 import warnings
 import weakref
-import zipfile
 from concurrent.futures import CancelledError
 from datetime import datetime, timedelta
+from enum import Enum
+from fnmatch import fnmatchcase
 from functools import partial
+from itertools import count
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal, Mapping, overload
 
 import websockets
-import yaml
 from typing_extensions import deprecated
 
-from . import jasyncio, provisioner, tag, utils
+from . import _zipstream, jasyncio, provisioner, tag, utils
 from .annotationhelper import _get_annotations, _set_annotations
-from .bundle import BundleHandler, get_charm_series, is_local_charm
+from .bundle import BundleHandler, PlanCache, get_charm_series, is_local_charm
+from .charmcache import (
+    CHARM_INFO,
+    RESOLVE,
+    CharmCache,
+    LocalCharmCache,
+    dump_result,
+)
 from .charmhub import CharmHub
 from .client import client, connection, connector
+from .client.facade import TypeEncoder
 from .client.overrides import Caveat, Macaroon
 from .constraints import parse as parse_constraints
 from .constraints import parse_storage_constraints
@@ -40,6 +52,7 @@ from .errors import (
     JujuAPIError,
     JujuAppError,
     JujuBackupError,
+    JujuConnectionError,
     JujuError,
     JujuMachineError,
     JujuModelConfigError,
@@ -54,7 +67,10 @@ from .offerendpoints import ParseError as OfferParseError
 from .offerendpoints import parse_local_endpoint, parse_offer_url
 from .origin import Channel, Source
 from .placement import parse as parse_placement
+from .query import StateIndex
+from .query import query as query_state
 from .secrets import create_secret_data, read_secret_data
+from .status import StatusCache, derive_status
 from .tag import application as application_tag
 from .url import URL, Schema
 from .version import DEFAULT_ARCHITECTURE
@@ -70,6 +86,202 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+DEFAULT_RESOURCE_UPLOADS = 4
+
+# Number of charms resolved and added at the same time by Model.deploy_many
+DEFAULT_DEPLOY_CONCURRENCY = 8
+
+
+class OverflowPolicy(Enum):
+    """What a queued observer does with a new delta when its queue is full.
+
+    BLOCK makes the watcher wait until the observer catches up, which
+    applies backpressure all the way to the AllWatcher.
+
+    DROP_OLDEST discards the oldest pending delta to make room.
+
+    COALESCE replaces a pending delta for the same entity with the newer
+    one, so that the observer only sees the latest change for an entity
+    it hasn't processed yet. If there is no pending delta for the entity,
+    the policy falls back to BLOCK.
+
+    """
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop-oldest"
+    COALESCE = "coalesce"
+
+    def __str__(self):
+        return self.value
+
+
+class _ObserverQueue:
+    """Bounded, ordered delivery queue for a single observer.
+
+    Deltas are delivered one at a time, in the order they were put, by a
+    single worker task which is started lazily on the first put. If
+    ``deliver`` is False, there is no worker and deltas are taken from the
+    queue with :meth:`get` instead.
+
+    """
+
+    def __init__(
+        self, observer, model, maxsize, overflow=OverflowPolicy.BLOCK, deliver=True
+    ):
+        if maxsize < 1:
+            raise ValueError(f"queue_size must be at least 1, got {maxsize}")
+        self.observer = observer
+        self.model = model
+        self.maxsize = maxsize
+        self.overflow = OverflowPolicy(overflow)
+        self._pending = collections.OrderedDict()
+        self._seq = count()
+        self._not_empty = jasyncio.Event()
+        self._not_full = jasyncio.Event()
+        self._worker = None
+        self.deliver = deliver
+        self.closed = False
+        self.max_depth = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self):
+        """The number of deltas waiting to be delivered."""
+        return len(self._pending)
+
+    def stats(self):
+        """Return a dict of the queue metrics."""
+        return {
+            "depth": self.depth,
+            "max-depth": self.max_depth,
+            "max-size": self.maxsize,
+            "overflow": str(self.overflow),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+    async def put(self, delta, old_obj, new_obj):
+        if self.closed:
+            return
+        if self.deliver and (self._worker is None or self._worker.done()):
+            self._worker = jasyncio.create_task(self._run())
+
+        if self.overflow is OverflowPolicy.COALESCE:
+            key = (delta.entity, delta.get_id())
+            if key in self._pending:
+                pending_delta, first_old, _ = self._pending[key]
+                if pending_delta.type == "add" and delta.type == "change":
+                    # the other observers get the same delta, so it is
+                    # copied rather than changed
+                    delta = copy.copy(delta)
+                    delta.type = "add"
+                self._pending[key] = (delta, first_old, new_obj)
+                self.coalesced += 1
+                return
+        else:
+            key = next(self._seq)
+
+        while len(self._pending) >= self.maxsize:
+            if self.overflow is OverflowPolicy.DROP_OLDEST:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            else:
+                self._not_full.clear()
+                await self._not_full.wait()
+                if self.closed:
+                    return
+
+        self._pending[key] = (delta, old_obj, new_obj)
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._not_empty.set()
+
+    async def get(self):
+        """Remove and return the oldest (delta, old_obj, new_obj) tuple,
+        waiting for one if the queue is empty.
+
+        Returns None once the queue is closed.
+
+        """
+        while not self._pending:
+            if self.closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _, item = self._pending.popitem(last=False)
+        self._not_full.set()
+        self.delivered += 1
+        return item
+
+    async def _run(self):
+        while True:
+            item = await self.get()
+            if item is None:
+                return
+            delta, old_obj, new_obj = item
+            try:
+                await self.observer(delta, old_obj, new_obj, self.model)
+            except Exception:
+                log.exception("Error in observer %s", self.observer.callable_)
+
+    def stop(self):
+        """Stop the worker task and discard any pending deltas.
+
+        The worker is started again by the next put.
+
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._pending.clear()
+        self._not_full.set()
+
+    def close(self):
+        """Stop the queue for good, waking up anyone waiting on it."""
+        self.stop()
+        self.closed = True
+        self._not_empty.set()
+
+    def end(self):
+        """Stop taking deltas, and have :meth:`get` return None once the
+        pending ones have been taken.
+
+        """
+        self.closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+
+class _BatchObserver:
+    """Handle for a callable registered with Model.add_batch_observer."""
+
+    def __init__(self, callable_):
+        self.callable_ = callable_
+
+
+def _coalesce_deltas(deltas):
+    """Collapse the deltas of one watcher batch so that each entity keeps
+    only its latest change.
+
+    A delta is dropped when a later delta in the batch targets the same
+    entity, unless it is a removal; removals are kept so that an entity
+    that is removed and then re-created within the batch is still seen
+    going away. The surviving deltas keep the order in which they arrived.
+
+    """
+    result = []
+    last_index = {}
+    for delta in deltas:
+        key = (delta.entity, delta.get_id())
+        index = last_index.get(key)
+        if index is not None and result[index].type != "remove":
+            result[index] = None
+        last_index[key] = len(result)
+        result.append(delta)
+    return [delta for delta in result if delta is not None]
+
 
 class _Observer:
     """Wrapper around an observer callable.
@@ -79,12 +291,16 @@ class _Observer:
 
     """
 
-    def __init__(self, callable_, entity_type, action, entity_id, predicate):
+    def __init__(
+        self, callable_, entity_type, action, entity_id, predicate, once=False
+    ):
         self.callable_ = callable_
         self.entity_type = entity_type
         self.action = action
         self.entity_id = entity_id
         self.predicate = predicate
+        self.once = once
+        self.queue = None
         if self.entity_id:
             self.entity_id = str(self.entity_id)
             if not self.entity_id.startswith("^"):
@@ -134,15 +350,170 @@ class ModelObserver:
         pass
 
 
+class WatchFilter:
+    """Client-side filter for the deltas a :class:`Model` keeps.
+
+    Deltas which don't match are dropped before they reach the model state
+    or any observer, which saves memory and processing for tools that only
+    care about part of a large model.
+
+    :param entity_types: Optional list of the entity types to keep, e.g.
+        ``["application", "unit", "machine"]``. The "model" entity is always
+        kept, as the library relies on it.
+    :param applications: Optional list of application name patterns, which
+        can use wildcards ('*'). Application, unit, relation and offer
+        deltas are only kept if they belong to a matching application.
+    :param units: Optional list of unit name patterns, which can use
+        wildcards ('*'). If given, unit deltas are only kept if the unit
+        name matches, regardless of ``applications``.
+
+    Note that waiting for entities that are filtered out, e.g. running
+    actions while "action" is not in ``entity_types``, will never complete.
+
+    """
+
+    def __init__(self, entity_types=None, applications=None, units=None):
+        self.entity_types = set(entity_types) if entity_types else None
+        self.applications = list(applications) if applications else None
+        self.units = list(units) if units else None
+
+    @staticmethod
+    def _match(name, patterns):
+        return name is not None and any(fnmatchcase(name, p) for p in patterns)
+
+    def matches(self, delta):
+        """Return True if the delta should be kept."""
+        entity = delta.entity
+        if entity == "model":
+            return True
+        if self.entity_types is not None and entity not in self.entity_types:
+            return False
+        if entity == "unit" and self.units is not None:
+            return self._match(delta.data.get("name"), self.units)
+        if self.applications is None:
+            return True
+        if entity == "application":
+            return self._match(delta.data.get("name"), self.applications)
+        if entity == "unit":
+            return self._match(delta.data.get("application"), self.applications)
+        if entity == "applicationOffer":
+            return self._match(delta.data.get("application-name"), self.applications)
+        if entity == "relation":
+            return any(
+                self._match(ep.get("application-name"), self.applications)
+                for ep in delta.data.get("endpoints") or []
+            )
+        return True
+
+
+class ModelChangeStream:
+    """Async iterator over the changes of a model.
+
+    Created by :meth:`Model.changes`. Yields :class:`juju.delta.EntityDelta`
+    instances, in the order they were applied to the model, until the
+    stream is closed, or the model is disconnected or its watcher stops.
+    Use it as an async context manager, or call :meth:`close`, to stop
+    receiving changes.
+
+    """
+
+    def __init__(
+        self,
+        model,
+        entity_types=None,
+        ids=None,
+        since_snapshot=False,
+        buffer_size=1000,
+        overflow=OverflowPolicy.BLOCK,
+    ):
+        self.model = model
+        if isinstance(entity_types, str):
+            entity_types = [entity_types]
+        self.entity_types = set(entity_types) if entity_types else None
+        self.ids = {str(id_) for id_ in ids} if ids is not None else None
+
+        self._snapshot = collections.deque()
+        if since_snapshot:
+            self._snapshot.extend(self._current_state())
+        # Registering straight after taking the snapshot, with nothing
+        # awaited in between, so that no delta can fall in the gap
+        self._observer = _Observer(self, None, None, None, self._matches)
+        self._observer.queue = _ObserverQueue(
+            self._observer, model, buffer_size, overflow, deliver=False
+        )
+        model._observers[self._observer] = self
+
+    def _matches(self, delta):
+        return (self.entity_types is None or delta.entity in self.entity_types) and (
+            self.ids is None or str(delta.get_id()) in self.ids
+        )
+
+    def _current_state(self):
+        for entity_type, entities in list(self.model.state.state.items()):
+            for history in list(entities.values()):
+                if history[-1] is None:
+                    continue
+                try:
+                    delta = get_entity_delta(
+                        client.Delta([entity_type, "change", history[-1]])
+                    )
+                except KeyError:
+                    continue
+                if self._matches(delta):
+                    delta.type = "add"
+                    yield delta
+
+    @property
+    def queue(self):
+        return self._observer.queue
+
+    def close(self):
+        """Stop receiving changes and end the iteration."""
+        self._snapshot.clear()
+        self.model.remove_observer(self._observer)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._snapshot:
+            return self._snapshot.popleft()
+        item = await self.queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item[0]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_state_generations = count()
+
+# Memo of the data keys of entity attributes, e.g. "workload-version" for
+# "workload_version"
+_data_keys: dict[str, str] = {}
+
+
 class ModelState:
     """Holds the state of the model, including the delta history of all
     entities in the model.
 
     """
 
+    SNAPSHOT_VERSION = 2
+
     def __init__(self, model):
         self.model = model
         self.state = dict()
+        # Changes whenever the history deques are replaced, see
+        # ModelEntity._entity_history
+        self.generation = next(_state_generations)
+        self.index = StateIndex()
+        self.stale = False
+        self._stale_entities = set()
 
     @overload
     def _live_entity_map(
@@ -235,6 +606,39 @@ class ModelState:
         """
         return self._live_entity_map("relation")
 
+    def query(
+        self,
+        entity_type,
+        name=None,
+        application=None,
+        machine=None,
+        where=None,
+        fields=None,
+    ):
+        """Return the data of the live entities of ``entity_type`` which
+        match the given filters, without creating any entity objects.
+
+        Filters on the indexed status fields are answered from the index.
+        See :func:`juju.query.query` for the parameters, e.g.::
+
+            state.query(
+                "unit",
+                application="db-*",
+                where={"workload-status.current": "error"},
+                fields=["workload-status.message"],
+            )
+
+        """
+        return query_state(
+            self,
+            entity_type,
+            name=name,
+            application=application,
+            machine=machine,
+            where=where,
+            fields=fields,
+        )
+
     def entity_history(self, entity_type, entity_id):
         """Return the history deque for an entity."""
         return self.state[entity_type][entity_id]
@@ -262,14 +666,85 @@ class ModelState:
         history = self.state.setdefault(delta.entity, {}).setdefault(
             delta.get_id(), collections.deque()
         )
+        old_data = history[-1] if history else None
 
         history.append(delta.data)
         if delta.type == "remove":
             history.append(None)
+        self.index.update(delta.entity, delta.get_id(), old_data, history[-1])
 
         entity = self.get_entity(delta.entity, delta.get_id())
         return entity.previous(), entity
 
+    def save(self, path):
+        """Write a compact snapshot of the current state to ``path``.
+
+        Only the latest data of the entities that are alive is kept, as
+        gzipped JSON. The snapshot can be loaded back with :meth:`load`,
+        e.g. through the ``warm_start`` parameter of :meth:`Model.connect`.
+
+        """
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "model-uuid": getattr(self.model, "uuid", None),
+            # [id, data] pairs rather than objects, as JSON keys would turn
+            # integer ids, like those of relations, into strings
+            "entities": {
+                entity_type: [
+                    [entity_id, history[-1]]
+                    for entity_id, history in entities.items()
+                    if history[-1] is not None
+                ]
+                for entity_type, entities in self.state.items()
+            },
+        }
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def load(self, path, model_uuid=None):
+        """Replace the current state with a snapshot written by :meth:`save`.
+
+        The loaded state is marked stale until it has been reconciled with
+        the first full batch of deltas from the watcher.
+
+        :param path: Path of the snapshot file.
+        :param str model_uuid: If given, the snapshot is only loaded if it
+            was taken from the model with this uuid.
+        :return bool: True if the snapshot was loaded.
+
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning("Unable to load model snapshot %s: %s", path, e)
+            return False
+        if snapshot.get("version") != self.SNAPSHOT_VERSION:
+            log.warning("Ignoring model snapshot %s: unknown version", path)
+            return False
+        if model_uuid is not None and snapshot.get("model-uuid") != model_uuid:
+            log.warning("Ignoring model snapshot %s: taken from another model", path)
+            return False
+
+        self.state = {
+            entity_type: {
+                entity_id: collections.deque([data]) for entity_id, data in entities
+            }
+            for entity_type, entities in snapshot["entities"].items()
+        }
+        self.generation = next(_state_generations)
+        self.index.rebuild(self.state)
+        self.stale = True
+        self._stale_entities = {
+            (entity_type, entity_id)
+            for entity_type, entities in self.state.items()
+            for entity_id in entities
+        }
+        return True
+
     def get_entity(
         self, entity_type, entity_id, history_index=-1, connected=True
     ) -> ModelEntity | None:
@@ -328,36 +803,59 @@ class ModelEntity:
         self.model = model
         self._history_index = history_index
         self.connected = connected
-        self.connection = model.connection()
         self._status = "unknown"
+        self._history = None
+        self._generation = None
 
     def __repr__(self):
         return f'<{type(self).__name__} entity_id="{self.entity_id}">'
 
+    @property
+    def connection(self):
+        """The connection of the model of this entity.
+
+        Entities only need it to make API calls, so they can be created
+        from the state of a model which isn't connected, e.g. one fed by a
+        :class:`ControllerWatcher` or a replay.
+
+        """
+        return self.model.connection()
+
     def __getattr__(self, name: str) -> Any:
         """Fetch object attributes from the underlying data dict held in the
         model.
 
         """
-        try:
-            return self.safe_data[name]
-        except KeyError:
-            name = name.replace("_", "-")
-            if name in self.safe_data:
-                return self.safe_data[name]
-            else:
-                raise
+        data = self.safe_data
+        if name in data:
+            return data[name]
+        key = _data_keys.get(name)
+        if key is None:
+            key = _data_keys[name] = name.replace("_", "-")
+        if key in data:
+            return data[key]
+        raise KeyError(name)
 
     def __bool__(self):
         return bool(self.data)
 
     def on_change(self, callable_):
-        """Add a change observer to this entity."""
-        self.model.add_observer(callable_, self.entity_type, "change", self.entity_id)
+        """Add a change observer to this entity.
+
+        Returns a handle that can be passed to :meth:`Model.remove_observer`.
+        """
+        return self.model.add_observer(
+            callable_, self.entity_type, "change", self.entity_id
+        )
 
     def on_remove(self, callable_):
-        """Add a remove observer to this entity."""
-        self.model.add_observer(callable_, self.entity_type, "remove", self.entity_id)
+        """Add a remove observer to this entity.
+
+        Returns a handle that can be passed to :meth:`Model.remove_observer`.
+        """
+        return self.model.add_observer(
+            callable_, self.entity_type, "remove", self.entity_id
+        )
 
     @property
     def entity_type(self):
@@ -365,21 +863,21 @@ class ModelEntity:
         'application' or 'unit', etc.
 
         """
+        cls = self.__class__
+        entity_type = cls.__dict__.get("_entity_type")
+        if entity_type is not None:
+            return entity_type
+
         # Allow the overriding of entity names from the type instead of from
         # the class name. Useful because Model and ModelInfo clash and we really
         # want ModelInfo to be called Model.
-        if hasattr(self.__class__, "type_name_override") and callable(
-            self.__class__.type_name_override
-        ):
-            return self.__class__.type_name_override()
-
-        def first_lower(s):
-            if len(s) == 0:
-                return s
-            else:
-                return s[0].lower() + s[1:]
-
-        return first_lower(self.__class__.__name__)
+        if hasattr(cls, "type_name_override") and callable(cls.type_name_override):
+            entity_type = cls.type_name_override()
+        else:
+            name = cls.__name__
+            entity_type = name[:1].lower() + name[1:]
+        cls._entity_type = entity_type
+        return entity_type
 
     @property
     def current(self):
@@ -399,11 +897,8 @@ class ModelEntity:
         model.
 
         """
-        return (
-            self.data is None
-            or self.model.state.entity_data(self.entity_type, self.entity_id, -1)
-            is None
-        )
+        history = self._entity_history()
+        return history[self._history_index] is None or history[-1] is None
 
     @property
     def alive(self):
@@ -413,12 +908,24 @@ class ModelEntity:
         """
         return not self.dead
 
+    def _entity_history(self):
+        """Return the history deque of this entity.
+
+        The deque is looked up once and kept, since applying a delta only
+        appends to it. It is looked up again if the model state replaced its
+        deques, e.g. when loading a snapshot.
+
+        """
+        state = self.model.state
+        if self._generation != state.generation:
+            self._history = state.entity_history(self.entity_type, self.entity_id)
+            self._generation = state.generation
+        return self._history
+
     @property
     def data(self):
         """The data dictionary for this entity."""
-        return self.model.state.entity_data(
-            self.entity_type, self.entity_id, self._history_index
-        )
+        return self._entity_history()[self._history_index]
 
     @property
     def safe_data(self):
@@ -428,13 +935,14 @@ class ModelEntity:
         raise `DeadEntityException`.
 
         """
-        if self.data is None:
+        data = self._entity_history()[self._history_index]
+        if data is None:
             raise DeadEntityException(
                 f"Entity {self.entity_type}:{self.entity_id} is dead - its attributes can no longer be "
                 "accessed. Use the .previous() method on this object to get "
                 "a copy of the object at its previous state."
             )
-        return self.data
+        return data
 
     def previous(self):
         """Return a copy of this object as was at its previous state in
@@ -539,9 +1047,9 @@ class LocalDeployType:
 
         if app_name is None:
             if is_bundle:
-                bundle_with_overlays = [
-                    b for b in yaml.safe_load_all(bundle_path.read_text())
-                ]
+                bundle_with_overlays = utils.load_yaml_file(
+                    bundle_path, all_documents=True
+                )
                 app_name = bundle_with_overlays[0].get("name", "")
             else:
                 app_name = utils.get_local_charm_metadata(entity_path)["name"]
@@ -623,6 +1131,77 @@ class CharmhubDeployType:
         )
 
 
+class SettingsCache:
+    """Shares the config and constraints of a model between its callers.
+
+    As :class:`juju.status.StatusCache` does for FullStatus, concurrent
+    requests are served by a single in-flight call, and results are reused
+    for ``ttl`` seconds. Results are discarded when the model sets its config
+    or constraints, or the watcher sees the model change.
+    """
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl
+        self._results = {}
+        self._in_flight = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key, fetch, max_age: float | None = None):
+        """Return the result of ``fetch()``, shared by the callers of ``key``.
+
+        :param str key: What is fetched, e.g. "config".
+        :param fetch: Coroutine function fetching it.
+        :param float max_age: Maximum age, in seconds, of a cached result
+            that may be returned. Defaults to the ``ttl`` of the cache.
+        """
+        max_age = self.ttl if max_age is None else max_age
+        cached = self._results.get(key)
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            self.hits += 1
+            return cached[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            in_flight = jasyncio.ensure_future(
+                self._fetch(key, fetch, self._generation)
+            )
+            in_flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._in_flight[key] = in_flight
+        return await jasyncio.shield(in_flight)
+
+    async def _fetch(self, key, fetch, generation):
+        started = time.monotonic()
+        try:
+            result = await fetch()
+            # a result fetched before an invalidation may be stale already
+            if generation == self._generation:
+                self._results[key] = (started, result)
+            return result
+        finally:
+            if generation == self._generation:
+                self._in_flight.pop(key, None)
+
+    def invalidate(self):
+        """Discard all cached results, and stop sharing in-flight calls."""
+        self._generation += 1
+        self._results.clear()
+        self._in_flight.clear()
+
+    def stats(self):
+        """Return a dict of the cache metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
 class Model:
     """The main API for interacting with a Juju model."""
 
@@ -634,6 +1213,13 @@ class Model:
         max_frame_size=None,
         bakery_client=None,
         jujudata=None,
+        coalesce_deltas=False,
+        status_ttl=0,
+        charm_cache=None,
+        local_charm_cache=None,
+        resource_uploads=DEFAULT_RESOURCE_UPLOADS,
+        plan_cache=None,
+        config_ttl=0,
     ):
         """Instantiate a new Model.
 
@@ -647,6 +1233,27 @@ class Model:
         :param bakery_client httpbakery.Client: The bakery client to use
             for macaroon authorization.
         :param jujudata JujuData: The source for current controller information
+        :param bool coalesce_deltas: If True, multiple deltas for the same
+            entity within one watcher batch are collapsed into the latest one
+            before being applied and passed to observers. Removals are always
+            kept, so observers still see every entity that goes away.
+        :param float status_ttl: How long, in seconds, a FullStatus result
+            is reused by :meth:`get_status` and the other status helpers.
+            See :class:`juju.status.StatusCache`.
+        :param charm_cache: Optional :class:`juju.charmcache.CharmCache` of
+            charm resolutions and charm metadata, which may be shared with
+            other models.
+        :param local_charm_cache: Optional
+            :class:`juju.charmcache.LocalCharmCache` of the archives of local
+            charms, and of their uploads, used by :meth:`add_local_charm_dir`.
+        :param int resource_uploads: Maximum number of local resources
+            uploaded at the same time by :meth:`add_local_resources`, across
+            all the applications being deployed.
+        :param plan_cache: Optional :class:`juju.bundle.PlanCache` of the
+            change plans of bundles, which may be shared with other models.
+        :param float config_ttl: How long, in seconds, the results of
+            :meth:`get_config` and :meth:`get_constraints` are reused. See
+            :class:`SettingsCache`.
         """
         self._connector = connector.Connector(
             max_frame_size=max_frame_size,
@@ -654,6 +1261,16 @@ class Model:
             jujudata=jujudata,
         )
         self._observers = weakref.WeakValueDictionary()
+        self._batch_observers = {}
+        self._coalesce_deltas = coalesce_deltas
+        self._watch_filter = None
+        self._delta_recorder = None
+        self._status_cache = StatusCache(self, ttl=status_ttl)
+        self._settings_cache = SettingsCache(ttl=config_ttl)
+        self._charm_cache = charm_cache
+        self._local_charm_cache = local_charm_cache
+        self._plan_cache = plan_cache
+        self._resource_uploads = jasyncio.Semaphore(max(resource_uploads, 1))
         self.state = ModelState(self)
         self._info = None
         self._mode = None
@@ -735,7 +1352,19 @@ class Model:
         :param int max_frame_size: The maximum websocket frame size to allow.
         :param specified_facades: (deprecated) overwrite the facades with a series of
             specified facades.
+        :param warm_start: Path of a model state snapshot written by
+            :meth:`save_state`. If the snapshot can be loaded, the model is
+            usable as soon as the connection is made, serving the snapshot
+            state (see :meth:`wait_for_fresh_state`) while the watcher
+            fetches the current state in the background.
+        :param WatchFilter watch_filter: Only keep the deltas matching this
+            filter in the model state. Either a :class:`WatchFilter` or a dict
+            of its parameters. If None, everything is kept.
         """
+        warm_start = kwargs.pop("warm_start", None)
+        watch_filter = kwargs.pop("watch_filter", None)
+        if isinstance(watch_filter, dict):
+            watch_filter = WatchFilter(**watch_filter)
         is_debug_log_conn = "debug_log_conn" in kwargs
         if not is_debug_log_conn:
             await self.disconnect()
@@ -790,7 +1419,8 @@ class Model:
                 )
             await self._connector.connect(**kwargs)
         if not is_debug_log_conn:
-            await self._after_connect(model_name, model_uuid)
+            self._watch_filter = watch_filter
+            await self._after_connect(model_name, model_uuid, warm_start=warm_start)
 
     async def connect_model(self, model_name, **kwargs):
         """.. deprecated:: 0.6.2
@@ -820,9 +1450,31 @@ class Model:
         await self._connector.connect(**kwargs)
         await self._after_connect(model_uuid=uuid)
 
-    async def _after_connect(self, model_name=None, model_uuid=None):
+    async def _after_connect(self, model_name=None, model_uuid=None, warm_start=None):
+        # Results cached before connecting may be from another model
+        self._status_cache.invalidate()
+        self._settings_cache.invalidate()
+        warm = warm_start is not None and self.state.load(warm_start, model_uuid)
         self._watch()
+        if warm:
+            # Serve the snapshot straight away; the first batch from the
+            # AllWatcher reconciles it in the background.
+            log.debug("Warm started model state from %s", warm_start)
+        else:
+            await self._wait_for_watch_received()
+
+        if self._info is None:
+            # TODO (cderici): See if this can be optimized away, or at least
+            # be done lazily (i.e. not every time after_connect, but whenever
+            # self.info is needed -- which here can be bypassed if model_uuid
+            # is known)
+            async with ConnectedController(self.connection()) as contr:
+                self._info = await contr.get_model_info(model_name, model_uuid)
+                log.debug("Got ModelInfo: %s", vars(self.info))
+
+        self.uuid = self.info.uuid
 
+    async def _wait_for_watch_received(self):
         # Wait for the first packet of data from the AllWatcher,
         # which contains all information on the model.
         # TODO this means that we can't do anything until
@@ -854,16 +1506,24 @@ class Model:
                 )
             raise self._watcher_task.exception()
 
-        if self._info is None:
-            # TODO (cderici): See if this can be optimized away, or at least
-            # be done lazily (i.e. not every time after_connect, but whenever
-            # self.info is needed -- which here can be bypassed if model_uuid
-            # is known)
-            async with ConnectedController(self.connection()) as contr:
-                self._info = await contr.get_model_info(model_name, model_uuid)
-                log.debug("Got ModelInfo: %s", vars(self.info))
+    async def wait_for_fresh_state(self):
+        """Wait until the model state reflects the first full batch of data
+        from the watcher.
 
-        self.uuid = self.info.uuid
+        This returns immediately unless the model was connected with
+        ``warm_start``, in which case the state served until then comes from
+        the snapshot and may be out of date.
+
+        """
+        if self.state.stale:
+            await self._wait_for_watch_received()
+
+    def save_state(self, path):
+        """Write a snapshot of the current model state to ``path``, to be
+        used as the ``warm_start`` of a later :meth:`connect`.
+
+        """
+        self.state.save(path)
 
     async def disconnect(self):
         """Shut down the watcher task and close websockets."""
@@ -879,32 +1539,89 @@ class Model:
             await self._watch_stopped.wait()
             self._watch_stopping.clear()
 
+        for o in list(self._observers):
+            if o.queue is not None and o.queue.deliver:
+                o.queue.stop()
+        self._end_change_streams()
+
         if self.is_connected():
             await self._connector.disconnect(entity="model")
             self._info = None
+        self._status_cache.invalidate()
+        self._settings_cache.invalidate()
 
-    async def add_local_charm_dir(self, charm_dir, series):
+    async def add_local_charm_dir(self, charm_dir, series, stream=False):
         """Upload a local charm to the model.
 
         This will automatically generate an archive from
-        the charm dir.
+        the charm dir, in a thread so as not to block the event loop.
 
         :param charm_dir: Path to the charm directory
         :param series: Charm series
+        :param bool stream: Stream the archive into the upload as it is
+            built, instead of writing it to a temporary file first. The
+            upload is then sent with chunked transfer encoding. Ignored
+            when the model has a :attr:`local_charm_cache`.
 
         """
         charm_dir = Path(charm_dir)
+        if self._local_charm_cache is not None:
+            return await self._add_cached_local_charm(charm_dir, series)
+
+        loop = jasyncio.get_running_loop()
         if charm_dir.suffix == ".charm":
-            fn = charm_dir
+            charm_url = await self._upload_local_charm(charm_dir, series)
+        elif stream:
+            archive = CharmArchiveGenerator(str(charm_dir)).iter_archive()
+            func = partial(self.add_local_charm, archive, series)
+            charm_url = await loop.run_in_executor(None, func)
         else:
-            # FIXME this is probably a bug, the file is never removed
-            fn = tempfile.NamedTemporaryFile().name  # noqa: SIM115
-            CharmArchiveGenerator(str(charm_dir)).make_archive(fn)
+            with tempfile.TemporaryDirectory() as tmp:
+                fn = Path(tmp, f"{charm_dir.name}.charm")
+                generator = CharmArchiveGenerator(str(charm_dir))
+                await loop.run_in_executor(None, generator.make_archive, fn)
+                charm_url = await self._upload_local_charm(fn, series)
+
+        log.debug("Uploaded local charm: %s -> %s", charm_dir, charm_url)
+        return charm_url
+
+    async def _upload_local_charm(self, fn, series):
         with open(str(fn), "rb") as fh:
             func = partial(self.add_local_charm, fh, series, os.stat(str(fn)).st_size)
             loop = jasyncio.get_running_loop()
-            charm_url = await loop.run_in_executor(None, func)
+            return await loop.run_in_executor(None, func)
+
+    async def _add_cached_local_charm(self, charm_dir, series):
+        """Upload a local charm through the :attr:`local_charm_cache`,
+        unless the model already has a charm with the same content.
+        """
+        cache = self._local_charm_cache
+        started = time.monotonic()
+        loop = jasyncio.get_running_loop()
+        fn, content_hash = await loop.run_in_executor(None, cache.archive, charm_dir)
+
+        model_uuid = self.info.uuid
+        record = cache.uploaded(model_uuid, content_hash, series)
+        if record is not None:
+            charms_facade = client.CharmsFacade.from_connection(self.connection())
+            try:
+                await charms_facade.CharmInfo(record["charm-url"])
+            except JujuAPIError:
+                cache.forget_upload(model_uuid, content_hash, series)
+            else:
+                saved = cache.record_reuse(record)
+                log.info(
+                    "Local charm %s is unchanged, reusing %s (saved %.1fs)",
+                    charm_dir,
+                    record["charm-url"],
+                    saved,
+                )
+                return record["charm-url"]
 
+        charm_url = await self._upload_local_charm(fn, series)
+        cache.record_upload(
+            model_uuid, content_hash, series, charm_url, time.monotonic() - started
+        )
         log.debug("Uploaded local charm: %s -> %s", charm_dir, charm_url)
         return charm_url
 
@@ -913,9 +1630,11 @@ class Model:
 
         Returns the 'local:...' url that should be used to deploy the charm.
 
-        :param charm_file: Path to charm zip archive
+        :param charm_file: Charm zip archive, as a file object, or an
+            iterable of chunks of bytes
         :param series: Charm series
-        :param size: Size of the archive, in bytes
+        :param size: Size of the archive, in bytes. If not given, the archive
+            is sent with chunked transfer encoding
         :return str: 'local:...' url for deploying the charm
         :raises: :class:`JujuError` if the upload fails
 
@@ -961,10 +1680,14 @@ class Model:
         log.debug("Resetting model")
         for app in self.applications.values():
             await app.destroy()
-        await self.block_until(lambda: len(self.applications) == 0)
+        await self.block_until_changed(
+            lambda: len(self.applications) == 0, entity_types=["application"]
+        )
         for machine in self.machines.values():
             await machine.destroy(force=force)
-        await self.block_until(lambda: len(self.machines) == 0)
+        await self.block_until_changed(
+            lambda: len(self.machines) == 0, entity_types=["machine"]
+        )
 
     async def create_storage_pool(self, name, provider_type, attributes=""):
         """Create or define a storage pool.
@@ -1134,8 +1857,10 @@ class Model:
             no_wait=no_wait,
         )
         if block_until_done:
-            await self.block_until(
-                lambda: app_name not in self.applications, timeout=timeout
+            await self.block_until_changed(
+                lambda: app_name not in self.applications,
+                entity_types=["application"],
+                timeout=timeout,
             )
 
     async def block_until(self, *conditions, timeout=None, wait_period=0.5):
@@ -1152,7 +1877,58 @@ class Model:
 
         await utils.block_until(done, timeout=timeout, wait_period=wait_period)
         if _disconnected():
-            raise websockets.ConnectionClosed(1006, "no reason")
+            # No close frame was received or sent, i.e. close code 1006
+            raise websockets.ConnectionClosed(None, None)
+
+    async def block_until_changed(
+        self, *conditions, entity_types=None, timeout=None, recheck_period=None
+    ):
+        """Return only after all conditions are true.
+
+        Like :meth:`block_until`, but instead of polling, the conditions are
+        checked once and then again only when a change to one of the
+        ``entity_types`` (e.g. ``["application", "unit"]``; all types if
+        None) arrives from the watcher, or when the watcher stops. If
+        ``recheck_period`` is given, they are also checked at least that
+        often, which is useful for conditions that depend on more than the
+        model state.
+
+        Raises `websockets.ConnectionClosed` if disconnected.
+        """
+
+        def _disconnected():
+            return not (self.is_connected() and self.connection().is_open)
+
+        def done():
+            return _disconnected() or all(c() for c in conditions)
+
+        if isinstance(entity_types, str):
+            entity_types = [entity_types]
+        predicate = None
+        if entity_types:
+            entity_types = set(entity_types)
+
+            def predicate(delta):
+                return delta.entity in entity_types
+
+        changed = jasyncio.Event()
+
+        async def _on_change(delta, old, new, model):  # noqa: RUF029
+            changed.set()
+
+        observer = self.add_observer(_on_change, predicate=predicate)
+        stopped = jasyncio.ensure_future(self._watch_stopped.wait())
+        stopped.add_done_callback(lambda _: changed.set())
+        try:
+            await utils.block_until_notified(
+                done, event=changed, timeout=timeout, recheck_period=recheck_period
+            )
+        finally:
+            stopped.cancel()
+            self.remove_observer(observer)
+        if _disconnected():
+            # No close frame was received or sent, i.e. close code 1006
+            raise websockets.ConnectionClosed(None, None)
 
     @property
     def tag(self):
@@ -1210,6 +1986,44 @@ class Model:
         """Return a list of all Relations currently in the model."""
         return list(self.state.relations.values())
 
+    def query(self, entity_type, **filters):
+        """Return the data of the live entities of ``entity_type`` which
+        match ``filters``, as plain dicts.
+
+        This is cheap enough to call on every refresh of a dashboard. See
+        :meth:`ModelState.query` for the filters.
+
+        """
+        return self.state.query(entity_type, **filters)
+
+    @property
+    def status_cache(self) -> StatusCache:
+        """The FullStatus cache shared by the status helpers of this model."""
+        return self._status_cache
+
+    @property
+    def settings_cache(self) -> SettingsCache:
+        """The cache of the config and constraints of this model."""
+        return self._settings_cache
+
+    @property
+    def charm_cache(self) -> CharmCache | None:
+        """The cache of charm resolutions and charm metadata used by this
+        model, if any.
+
+        """
+        return self._charm_cache
+
+    @property
+    def local_charm_cache(self) -> LocalCharmCache | None:
+        """The cache of local charm archives used by this model, if any."""
+        return self._local_charm_cache
+
+    @property
+    def plan_cache(self) -> PlanCache | None:
+        """The cache of bundle change plans used by this model, if any."""
+        return self._plan_cache
+
     @property
     def charmhub(self):
         """Return a charmhub repository for requesting charm information using
@@ -1242,7 +2056,15 @@ class Model:
         return self._mode is not None and "strict" in self._mode
 
     def add_observer(
-        self, callable_, entity_type=None, action=None, entity_id=None, predicate=None
+        self,
+        callable_,
+        entity_type=None,
+        action=None,
+        entity_id=None,
+        predicate=None,
+        once=False,
+        queue_size=None,
+        overflow=OverflowPolicy.BLOCK,
     ):
         """Register an "on-model-change" callback
 
@@ -1276,24 +2098,155 @@ class Model:
         will be called with a delta as its only argument. If the predicate
         function returns True, the ``callable_`` will be called.
 
+        If ``once`` is True, the observer is removed as soon as it has been
+        called for the first matching delta.
+
+        By default every matching delta is delivered in a task of its own,
+        so calls may overlap and complete out of order. Passing
+        ``queue_size`` switches the observer to ordered delivery instead:
+        deltas are held in a bounded queue and delivered one at a time, in
+        order, by a single worker task. ``overflow`` (an
+        :class:`OverflowPolicy`) decides what happens when the queue is
+        full. Note that with ``OverflowPolicy.BLOCK`` a slow observer holds
+        up the watcher, so the observer must not wait on further model
+        changes itself. Queue metrics are available from
+        :meth:`observer_queue_stats`. ``queue_size`` has no effect on
+        ``once`` observers.
+
+        Returns a handle for the registered observer, which can be passed to
+        :meth:`remove_observer` once the observer is no longer needed.
+
         """
-        observer = _Observer(callable_, entity_type, action, entity_id, predicate)
+        observer = _Observer(
+            callable_, entity_type, action, entity_id, predicate, once=once
+        )
+        if queue_size is not None and not once:
+            observer.queue = _ObserverQueue(observer, self, queue_size, overflow)
         self._observers[observer] = callable_
+        return observer
 
-    def _watch(self):
-        """Start an asynchronous watch against this model.
+    def remove_observer(self, observer):
+        """Unregister an "on-model-change" callback.
 
-        See :meth:`add_observer` to register an onchange callback.
+        :param observer: Either the handle returned by :meth:`add_observer`,
+            or the callable that was registered, in which case every observer
+            registered with that callable is removed.
+        :return bool: True if at least one observer was removed.
+
+        """
+        if isinstance(observer, _BatchObserver):
+            return self._batch_observers.pop(observer, None) is not None
+        if isinstance(observer, _Observer):
+            removed = [observer] if observer in self._observers else []
+        else:
+            removed = [o for o in list(self._observers) if o.callable_ is observer]
+        for o in removed:
+            self._observers.pop(o, None)
+            if o.queue is not None:
+                o.queue.close()
+        batch_removed = [
+            o for o, c in list(self._batch_observers.items()) if c is observer
+        ]
+        for o in batch_removed:
+            del self._batch_observers[o]
+        return bool(removed or batch_removed)
+
+    def changes(
+        self,
+        entity_type=None,
+        ids=None,
+        since_snapshot=False,
+        buffer_size=1000,
+        overflow=OverflowPolicy.BLOCK,
+    ) -> ModelChangeStream:
+        """Return an async iterator over the changes to this model.
+
+        The iterator yields :class:`juju.delta.EntityDelta` instances for
+        every change received from the watcher after this call, in order::
+
+            async with model.changes(entity_type="unit") as changes:
+                async for delta in changes:
+                    print(delta.type, delta.get_id(), delta.data)
+
+        :param entity_type: Optional entity type, or list of entity types,
+            e.g. ``["application", "unit"]``, to receive changes for.
+        :param ids: Optional list of entity ids to receive changes for.
+        :param bool since_snapshot: If True, the iterator first yields an
+            "add" delta for every matching entity currently in the model.
+        :param int buffer_size: The maximum number of changes buffered
+            while the consumer is busy.
+        :param OverflowPolicy overflow: What to do when the buffer is full.
+            See :class:`OverflowPolicy`. With the default, ``BLOCK``, the
+            watcher waits for the consumer to catch up.
+
+        The iterator keeps receiving changes until it is closed, either by
+        leaving the ``async with`` block or by calling its ``close`` method.
+
+        """
+        return ModelChangeStream(
+            self,
+            entity_types=entity_type,
+            ids=ids,
+            since_snapshot=since_snapshot,
+            buffer_size=buffer_size,
+            overflow=overflow,
+        )
+
+    def add_batch_observer(self, callable_):
+        """Register a callback for whole batches of model changes.
+
+        ``callable_`` is called once for every batch of deltas received
+        from the watcher, after the entire batch has been applied to the
+        model state. It should be Awaitable and accept two positional
+        arguments:
+
+            changes - A list of (delta, old_obj, new_obj) tuples, in the
+                order they were applied, with the same meaning as the
+                arguments passed to :meth:`add_observer` callbacks.
+
+            model - The :class:`Model` itself.
+
+        Returns a handle which can be passed to :meth:`remove_observer`.
+        The model keeps a strong reference to ``callable_``, and so to the
+        object of a bound method, until the observer is removed with
+        :meth:`remove_observer`.
+
+        """
+        observer = _BatchObserver(callable_)
+        self._batch_observers[observer] = callable_
+        return observer
+
+    def _end_change_streams(self):
+        """End the iteration of every :class:`ModelChangeStream` of the
+        model, after the changes they already hold, e.g. because the
+        watcher stopped.
+
+        """
+        for o in list(self._observers):
+            if o.queue is not None and not o.queue.deliver:
+                o.queue.end()
+
+    def observer_queue_stats(self):
+        """Return the delivery queue metrics of every queued observer.
+
+        :return list: One dict per observer registered with a
+            ``queue_size``, holding the observer ``callable``, the current
+            ``depth``, the ``max-depth`` reached, and counts of
+            ``delivered``, ``dropped`` and ``coalesced`` deltas.
+
+        """
+        return [
+            {"callable": o.callable_, **o.queue.stats()}
+            for o in list(self._observers)
+            if o.queue is not None
+        ]
+
+    def _watch(self):
+        """Start an asynchronous watch against this model.
+
+        See :meth:`add_observer` to register an onchange callback.
 
         """
-
-        def _post_step(obj):
-            # Once we get the model, ensure we're running in the correct state
-            # as a post step.
-            if isinstance(obj, ModelInfo) and obj.safe_data is not None:
-                model_config = obj.safe_data["config"]
-                if "mode" in model_config:
-                    self._mode = model_config["mode"]
 
         async def _all_watcher():
             # First attempt to get the model config so we know what mode the
@@ -1324,46 +2277,37 @@ class Model:
                         del allwatcher.Id
                         continue
                     except websockets.ConnectionClosed:
-                        if self.connection().monitor.status == connection.Monitor.ERROR:
+                        monitor = self.connection().monitor
+                        if monitor.reconnecting.locked():
+                            # the receiver is already reopening the
+                            # connection, wait for it to finish
+                            log.warning("Watcher: connection closed, waiting")
+                            async with monitor.reconnecting:
+                                pass
+                        elif monitor.status == connection.Monitor.ERROR:
                             # closed unexpectedly, try to reopen
                             log.warning("Watcher: connection closed, reopening")
                             await self.connection().reconnect()
-                            if (
-                                self.connection().monitor.status
-                                != connection.Monitor.CONNECTED
-                            ):
-                                # reconnect failed; abort and shutdown
-                                log.error(
-                                    "Watcher: automatic reconnect "
-                                    "failed; stopping watcher"
-                                )
-                                break
-                            del allwatcher.Id
-                            continue
                         else:
                             # closed on request, go ahead and shutdown
                             break
+                        if monitor.status != connection.Monitor.CONNECTED:
+                            # reconnect failed; abort and shutdown
+                            log.error(
+                                "Watcher: automatic reconnect failed; stopping watcher"
+                            )
+                            break
+                        del allwatcher.Id
+                        continue
                     if self._watch_stopping.is_set():
                         try:
                             await allwatcher.Stop()
                         except websockets.ConnectionClosed:
                             pass  # can't stop on a closed conn
                         break
-                    for delta in results.deltas:
-                        entity = None
-                        try:
-                            entity = get_entity_delta(delta)
-                        except KeyError:
-                            if self.strict_mode:
-                                raise JujuError(f"unknown delta type '{delta.entity}'")
-
-                        if not self.strict_mode and entity is None:
-                            continue
-                        old_obj, new_obj = self.state.apply_delta(entity)
-                        await self._notify_observers(entity, old_obj, new_obj)
-                        # Post step ensure that we can handle any settings
-                        # that need to be correctly set as a post step.
-                        _post_step(new_obj)
+                    if self._delta_recorder is not None:
+                        self._delta_recorder.record_deltas(results.deltas)
+                    await self._apply_deltas(results.deltas)
                     self._watch_received.set()
             except CancelledError:
                 pass
@@ -1371,6 +2315,7 @@ class Model:
                 log.exception("Error in watcher")
                 raise
             finally:
+                self._end_change_streams()
                 self._watch_stopped.set()
 
         log.debug("Starting watcher task")
@@ -1379,6 +2324,74 @@ class Model:
         self._watch_stopped.clear()
         self._watcher_task = jasyncio.create_task(_all_watcher())
 
+    async def _apply_deltas(self, deltas):
+        """Apply one batch of raw deltas from the AllWatcher to the model
+        state and notify observers.
+
+        :param deltas: The raw deltas (:class:`juju.client.overrides.Delta`)
+            of one ``AllWatcher.Next`` result.
+        :return list: The applied changes, as (delta, old_obj, new_obj)
+            tuples.
+
+        """
+
+        def _post_step(obj):
+            # Once we get the model, ensure we're running in the correct state
+            # as a post step.
+            if isinstance(obj, ModelInfo) and obj.data is not None:
+                self._settings_cache.invalidate()
+                model_config = obj.safe_data["config"]
+                if "mode" in model_config:
+                    self._mode = model_config["mode"]
+
+        watch_filter = self._watch_filter
+        entities = []
+        for delta in deltas:
+            entity = None
+            try:
+                entity = get_entity_delta(delta)
+            except KeyError:
+                if self.strict_mode:
+                    raise JujuError(f"unknown delta type '{delta.entity}'")
+
+            if not self.strict_mode and entity is None:
+                continue
+            if watch_filter is not None and not watch_filter.matches(entity):
+                continue
+            entities.append(entity)
+
+        if self._coalesce_deltas:
+            entities = _coalesce_deltas(entities)
+
+        if self.state.stale:
+            # This is the first full batch since a warm start: anything from
+            # the snapshot which is not in it is gone from the model.
+            stale = self.state._stale_entities - {
+                (entity.entity, entity.get_id()) for entity in entities
+            }
+            for entity_type, entity_id in sorted(stale):
+                data = self.state.entity_data(entity_type, entity_id, -1)
+                if data is not None:
+                    entities.append(
+                        get_entity_delta(client.Delta([entity_type, "remove", data]))
+                    )
+            self.state.stale = False
+            self.state._stale_entities = set()
+
+        applied = []
+        for entity in entities:
+            old_obj, new_obj = self.state.apply_delta(entity)
+            await self._notify_observers(entity, old_obj, new_obj)
+            # Post step ensure that we can handle any settings
+            # that need to be correctly set as a post step.
+            _post_step(new_obj)
+            applied.append((entity, old_obj, new_obj))
+
+        if applied:
+            for callable_ in list(self._batch_observers.values()):
+                jasyncio.ensure_future(callable_(applied, self))
+        return applied
+
     async def _notify_observers(self, delta, old_obj, new_obj):
         """Call observing callbacks, notifying them of a change in model state
 
@@ -1395,11 +2408,16 @@ class Model:
 
         log.debug("Model changed: %s %s %s", delta.entity, delta.type, delta.get_id())
 
-        for o in self._observers:
+        for o in list(self._observers):
             if o.cares_about(delta):
-                jasyncio.ensure_future(o(delta, old_obj, new_obj, self))
+                if o.once:
+                    self.remove_observer(o)
+                if o.queue is not None:
+                    await o.queue.put(delta, old_obj, new_obj)
+                else:
+                    jasyncio.ensure_future(o(delta, old_obj, new_obj, self))
 
-    async def _wait(self, entity_type, entity_id, action, predicate=None):
+    async def _wait(self, entity_type, entity_id, action, predicate=None, timeout=None):
         """Block the calling routine until a given action has happened to the
         given entity
 
@@ -1411,6 +2429,11 @@ class Model:
             whether the delta contains the specific action we're looking
             for. For example, you might check to see whether a 'change'
             has a 'completed' status. See the _Observer class for details.
+        :param timeout: optional number of seconds to wait before raising
+            asyncio.TimeoutError. Waits forever if None.
+
+        The observer used for waiting is always removed before returning,
+        whether the wait succeeded, timed out or was cancelled.
 
         """
         q = jasyncio.Queue()
@@ -1418,13 +2441,18 @@ class Model:
         async def callback(delta, old, new, model):
             await q.put(delta.get_id())
 
-        self.add_observer(callback, entity_type, action, entity_id, predicate)
-        entity_id = await q.get()
+        observer = self.add_observer(
+            callback, entity_type, action, entity_id, predicate, once=True
+        )
+        try:
+            entity_id = await jasyncio.wait_for(q.get(), timeout)
+        finally:
+            self.remove_observer(observer)
         # object might not be in the entity_map if we were waiting for a
         # 'remove' action
         return self.state._live_entity_map(entity_type).get(entity_id)
 
-    async def _wait_for_new(self, entity_type, entity_id):
+    async def _wait_for_new(self, entity_type, entity_id, timeout=None):
         """Wait for a new object to appear in the Model and return it.
 
         Waits for an object of type ``entity_type`` with id ``entity_id``
@@ -1436,10 +2464,14 @@ class Model:
         # if the entity is already in the model, just return it
         if entity_id in self.state._live_entity_map(entity_type):
             return self.state._live_entity_map(entity_type)[entity_id]
-        return await self._wait(entity_type, entity_id, None)
+        return await self._wait(entity_type, entity_id, None, timeout=timeout)
+
+    async def wait_for_action(self, action_id, timeout=None):
+        """Given an action, wait for it to complete.
 
-    async def wait_for_action(self, action_id):
-        """Given an action, wait for it to complete."""
+        :param float timeout: Seconds to wait before raising
+            asyncio.TimeoutError. Waits forever if None.
+        """
         if action_id.startswith("action-"):
             # if we've been passed action.tag, transform it into the
             # id that the api deltas will use.
@@ -1448,7 +2480,7 @@ class Model:
         def predicate(delta):
             return delta.data["status"] in ("completed", "failed")
 
-        return await self._wait("action", action_id, None, predicate)
+        return await self._wait("action", action_id, None, predicate, timeout=timeout)
 
     async def get_annotations(self):
         """Get annotations on this model.
@@ -1655,7 +2687,9 @@ class Model:
             "{}:{}".format(app, data["name"]) for app, data in result.endpoints.items()
         ]
 
-        await self.block_until(lambda: _find_relation(*specs) is not None)
+        await self.block_until_changed(
+            lambda: _find_relation(*specs) is not None, entity_types=["relation"]
+        )
         return _find_relation(*specs)
 
     async def relate(self, relation1, relation2):
@@ -1795,6 +2829,7 @@ class Model:
         devices=None,
         trust=False,
         attach_storage=[],
+        bundle_concurrency=None,
     ):
         """Deploy a new service or bundle.
 
@@ -1834,6 +2869,214 @@ class Model:
 
         :param str[] attach_storage: Existing storage to attach to the deployed unit
             (not available on k8s models)
+        :param int bundle_concurrency: When deploying a bundle, the number of
+            calls applying the changes of its plan made at the same time.
+            Defaults to :data:`juju.bundle.DEFAULT_CONCURRENCY`; 0 doesn't
+            limit it.
+        """
+        entity, schema, res = await self._resolve_deploy(
+            entity_url,
+            application_name=application_name,
+            channel=channel,
+            force=force,
+            base=base,
+            series=series,
+            revision=revision,
+            trust=trust,
+            attach_storage=attach_storage,
+        )
+
+        if res.is_bundle:
+            handler = BundleHandler(
+                self,
+                trusted=trust,
+                forced=force,
+                concurrency=bundle_concurrency,
+                plan_cache=self._plan_cache,
+            )
+            await handler.fetch_plan(entity, res.origin, overlays=overlays)
+            await handler.execute_plan()
+            extant_apps = {app for app in self.applications}
+            pending_apps = handler.applications - extant_apps
+            if pending_apps:
+                # new apps will usually be in the model by now, but if some
+                # haven't made it yet we'll need to wait on them to be added
+                await jasyncio.gather(*[
+                    jasyncio.ensure_future(self._wait_for_new("application", app_name))
+                    for app_name in pending_apps
+                ])
+            return [
+                app
+                for name, app in self.applications.items()
+                if name in handler.applications
+            ]
+        else:
+            if overlays:
+                raise JujuError(
+                    "options provided but not supported when deploying a charm: overlays=%s"
+                    % overlays
+                )
+            deploy_kwargs = await self._prepare_charm_deploy(
+                entity,
+                schema,
+                res,
+                application_name=application_name,
+                bind=bind,
+                channel=channel,
+                config=config,
+                constraints=constraints,
+                force=force,
+                num_units=num_units,
+                resources=resources,
+                series=series,
+                storage=storage,
+                to=to,
+                devices=devices,
+                trust=trust,
+                attach_storage=attach_storage,
+            )
+            return await self._deploy(**deploy_kwargs)
+
+    async def deploy_many(self, specs, concurrency=DEFAULT_DEPLOY_CONCURRENCY):
+        """Deploy several charms at once.
+
+        The charms are resolved and added to the model, with their
+        resources, concurrently, and then all the applications are deployed
+        with bulk calls, rather than one call per application as with
+        :meth:`deploy`.
+
+        :param specs: List of dicts of the keyword arguments of
+            :meth:`deploy` for each application, e.g.
+            ``{"entity_url": "postgresql", "num_units": 3}``. Bundles and
+            overlays aren't supported.
+        :param int concurrency: Maximum number of charms being resolved and
+            added at the same time. 0 doesn't limit it.
+        :returns: A list with, for each spec in order, the deployed
+            :class:`juju.application.Application`, or the exception which
+            prevented deploying it.
+        """
+        limit = jasyncio.Semaphore(concurrency) if concurrency else None
+        # The model defaults are the same for every charm
+        defaults = await jasyncio.gather(
+            self._resolve_architecture(), self.get_config()
+        )
+
+        async def prepare(spec):
+            if limit is None:
+                return await self._prepare_deploy(defaults=defaults, **spec)
+            async with limit:
+                return await self._prepare_deploy(defaults=defaults, **spec)
+
+        results = await jasyncio.gather(
+            *[prepare(spec) for spec in specs], return_exceptions=True
+        )
+
+        indexes, args = [], []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                continue
+            try:
+                args.append(self._deploy_arg(**result))
+            except Exception as e:
+                results[i] = e
+                continue
+            indexes.append(i)
+
+        new_apps = []
+        if args:
+            for i, errors in zip(indexes, await self._submit_deploys(args)):
+                if errors:
+                    results[i] = JujuError("\n".join(errors))
+                else:
+                    new_apps.append(i)
+
+        applications = await jasyncio.gather(*[
+            self._wait_for_new("application", results[i]["application"])
+            for i in new_apps
+        ])
+        for i, app in zip(new_apps, applications):
+            results[i] = app
+        return results
+
+    async def _prepare_deploy(
+        self,
+        entity_url,
+        application_name=None,
+        bind=None,
+        channel=None,
+        config=None,
+        constraints=None,
+        force=False,
+        num_units=1,
+        base=None,
+        resources=None,
+        series=None,
+        revision=None,
+        storage=None,
+        to=None,
+        devices=None,
+        trust=False,
+        attach_storage=[],
+        defaults=None,
+    ):
+        """Resolve a charm, and add it and its resources to the model, as
+        :meth:`deploy` does, and return the keyword arguments of
+        :meth:`_deploy_arg` for its application.
+        """
+        entity, schema, res = await self._resolve_deploy(
+            entity_url,
+            application_name=application_name,
+            channel=channel,
+            force=force,
+            base=base,
+            series=series,
+            revision=revision,
+            trust=trust,
+            attach_storage=attach_storage,
+            defaults=defaults,
+        )
+        if res.is_bundle:
+            raise JujuError(f"{entity_url} is a bundle, which can't be deployed here")
+        return await self._prepare_charm_deploy(
+            entity,
+            schema,
+            res,
+            application_name=application_name,
+            bind=bind,
+            channel=channel,
+            config=config,
+            constraints=constraints,
+            force=force,
+            num_units=num_units,
+            resources=resources,
+            series=series,
+            storage=storage,
+            to=to,
+            devices=devices,
+            trust=trust,
+            attach_storage=attach_storage,
+        )
+
+    async def _resolve_deploy(
+        self,
+        entity_url,
+        application_name,
+        channel,
+        force,
+        base,
+        series,
+        revision,
+        trust,
+        attach_storage,
+        defaults=None,
+    ):
+        """Validate the arguments of :meth:`deploy`, and resolve the charm
+        or bundle to deploy.
+
+        :param defaults: Optional (architecture, config) of the model, to
+            use instead of looking them up.
+        :returns: (entity, schema, DeployTypeResult), where the entity is
+            the normalised url or path to deploy.
         """
         if trust and (self.info.agent_version < client.Number.from_json("2.4.0")):
             raise NotImplementedError(
@@ -1847,10 +3090,10 @@ class Model:
 
         # Ensure what we pass in, is a string.
         entity = str(entity_url)
+        url = None
         if is_local_charm(entity):
             if entity.startswith("local:"):
                 entity = entity[6:]
-            architecture = await self._resolve_architecture()
             schema = Schema.LOCAL
 
         else:
@@ -1860,14 +3103,21 @@ class Model:
                 url = URL.parse(entity)
             entity = str(url)
 
-            architecture = await self._resolve_architecture(url)
             schema = url.schema
-            name = url.name
 
         if schema not in self.deploy_types:
             raise JujuError(f"unknown deploy type {schema}, expected charmhub or local")
 
-        model_conf = await self.get_config()
+        if defaults is None:
+            # The model constraints and config don't depend on each other, so
+            # they are looked up at the same time
+            architecture, model_conf = await jasyncio.gather(
+                self._resolve_architecture(url), self.get_config()
+            )
+        else:
+            architecture, model_conf = defaults
+            if url is not None and url.architecture:
+                architecture = url.architecture
         res = await self.deploy_types[schema].resolve(
             entity,
             architecture,
@@ -1882,42 +3132,53 @@ class Model:
 
         if res.identifier is None:
             raise JujuError(f"unknown charm or bundle {entity_url}")
-        identifier = res.identifier
 
-        charm_series = series
-        charm_origin = res.origin
         if base:
-            charm_origin.base = utils.parse_base_arg(base)
+            res.origin.base = utils.parse_base_arg(base)
+        return entity, schema, res
 
+    async def _prepare_charm_deploy(
+        self,
+        entity,
+        schema,
+        res,
+        application_name,
+        bind,
+        channel,
+        config,
+        constraints,
+        force,
+        num_units,
+        resources,
+        series,
+        storage,
+        to,
+        devices,
+        trust,
+        attach_storage,
+    ):
+        """Add the charm resolved by :meth:`_resolve_deploy`, and its
+        resources, to the model, and return the keyword arguments of
+        :meth:`_deploy` for its application.
+        """
+        identifier = res.identifier
+        charm_series = series
+        charm_origin = res.origin
         server_side_deploy = False
 
-        if res.is_bundle:
-            handler = BundleHandler(self, trusted=trust, forced=force)
-            await handler.fetch_plan(entity, charm_origin, overlays=overlays)
-            await handler.execute_plan()
-            extant_apps = {app for app in self.applications}
-            pending_apps = handler.applications - extant_apps
-            if pending_apps:
-                # new apps will usually be in the model by now, but if some
-                # haven't made it yet we'll need to wait on them to be added
-                await jasyncio.gather(*[
-                    jasyncio.ensure_future(self._wait_for_new("application", app_name))
-                    for app_name in pending_apps
-                ])
-            return [
-                app
-                for name, app in self.applications.items()
-                if name in handler.applications
-            ]
-        else:
-            if overlays:
-                raise JujuError(
-                    "options provided but not supported when deploying a charm: overlays=%s"
-                    % overlays
+        # XXX: we're dropping local resources here, but we don't
+        # actually support them yet anyway
+        if not res.is_local:
+            is_charmhub = Schema.CHARM_HUB.matches(schema)
+            # Whether the charm is a subordinate doesn't depend on the
+            # charm being added, so it is asked to charmhub meanwhile
+            is_sub = None
+            if is_charmhub:
+                is_sub = jasyncio.ensure_future(
+                    self.charmhub.is_subordinate(URL.parse(entity).name)
                 )
-            # XXX: we're dropping local resources here, but we don't
-            # actually support them yet anyway
-            if not res.is_local:
+                is_sub.add_done_callback(lambda f: f.cancelled() or f.exception())
+            try:
                 add_charm_res = await self._add_charm(identifier, charm_origin)
                 if isinstance(add_charm_res, dict):
                     # This is for backwards compatibility for older
@@ -1925,7 +3186,7 @@ class Model:
                     charm_origin = add_charm_res.get("charm_origin", charm_origin)
                 else:
                     charm_origin = add_charm_res.charm_origin
-                if Schema.CHARM_HUB.matches(schema):
+                if is_charmhub:
                     if (
                         client.ApplicationFacade.best_facade_version(self.connection())
                         >= 19
@@ -1942,62 +3203,64 @@ class Model:
                             res.app_name, identifier, add_charm_res.charm_origin
                         )
 
-                    is_sub = await self.charmhub.is_subordinate(name)
-                    if is_sub:
+                    if await is_sub:
                         if num_units > 1:
                             raise JujuError(
                                 "cannot use num_units with subordinate application"
                             )
                         num_units = 0
+            finally:
+                if is_sub is not None and not is_sub.done():
+                    is_sub.cancel()
 
-            else:
-                # We have a local charm dir that needs to be uploaded
-                charm_dir = os.path.abspath(os.path.expanduser(identifier))
-                metadata = utils.get_local_charm_metadata(charm_dir)
-                charm_series = charm_series or await get_charm_series(metadata, self)
-
-                base = utils.get_local_charm_base(charm_series, charm_dir, client.Base)
-                charm_origin.base = base
-
-                if not application_name:
-                    application_name = metadata["name"]
-                if not application_name:
-                    application_name = metadata["name"]
-                if base is None and charm_series is None:
-                    raise JujuError(
-                        "Either series or base is needed to deploy the "
-                        f"charm at {charm_dir}. "
-                    )
-
-                identifier = await self.add_local_charm_dir(charm_dir, charm_series)
-                resources = await self.add_local_resources(
-                    application_name, identifier, metadata, resources=resources
+        else:
+            # We have a local charm dir that needs to be uploaded
+            charm_dir = os.path.abspath(os.path.expanduser(identifier))
+            metadata = utils.get_local_charm_metadata(charm_dir)
+            charm_series = charm_series or await get_charm_series(metadata, self)
+
+            base = utils.get_local_charm_base(charm_series, charm_dir, client.Base)
+            charm_origin.base = base
+
+            if not application_name:
+                application_name = metadata["name"]
+            if not application_name:
+                application_name = metadata["name"]
+            if base is None and charm_series is None:
+                raise JujuError(
+                    "Either series or base is needed to deploy the "
+                    f"charm at {charm_dir}. "
                 )
 
-            if config is None:
-                config = {}
-            if trust:
-                config["trust"] = True
-
-            return await self._deploy(
-                charm_url=identifier,
-                application=res.app_name,
-                series=charm_series,
-                config=config,
-                constraints=constraints,
-                endpoint_bindings=bind,
-                resources=resources,
-                storage=storage,
-                channel=channel,
-                num_units=num_units,
-                placement=parse_placement(to),
-                devices=devices,
-                charm_origin=charm_origin,
-                attach_storage=attach_storage,
-                force=force,
-                server_side_deploy=server_side_deploy,
+            identifier = await self.add_local_charm_dir(charm_dir, charm_series)
+            resources = await self.add_local_resources(
+                application_name, identifier, metadata, resources=resources
             )
 
+        if config is None:
+            config = {}
+        if trust:
+            config["trust"] = True
+
+        return dict(
+            charm_url=identifier,
+            application=res.app_name,
+            series=charm_series,
+            config=config,
+            constraints=constraints,
+            endpoint_bindings=bind,
+            resources=resources,
+            storage=storage,
+            channel=channel,
+            num_units=num_units,
+            placement=parse_placement(to),
+            devices=devices,
+            charm_origin=charm_origin,
+            attach_storage=attach_storage,
+            force=force,
+            server_side_deploy=server_side_deploy,
+        )
+
     async def _add_charm(self, charm_url, origin):
         """_add_charm sends the given origin and the url to the Juju API too add the charm to the
         state. Either calls the CharmsFacade.AddCharm for (> version 2), or the
@@ -2037,6 +3300,21 @@ class Model:
 
         :returns url.URL, client.CharmOrigin, [str]
         """
+        resolved = await self._resolve_charms(
+            [(url, origin)], force=force, series=series, model_config=model_config
+        )
+        return resolved[0]
+
+    async def _resolve_charms(
+        self, charms, force=False, series=None, model_config=None
+    ):
+        """Resolve several charms with a single Charms.ResolveCharms call,
+        as :meth:`_resolve_charm` does for one.
+
+        :param charms: list of (url, client.CharmOrigin) pairs.
+
+        :returns [(url.URL, client.CharmOrigin)], in the order of ``charms``
+        """
         charms_cls = client.CharmsFacade
         if charms_cls.best_facade_version(self.connection()) < 3:
             raise JujuError("resolve charm")
@@ -2049,42 +3327,124 @@ class Model:
         #  committing to make sure there's no regression
         source = Source.CHARM_HUB.value
 
-        resolve_origin = {
-            "source": source,
-            "architecture": origin.architecture,
-            "track": origin.track,
-            "risk": origin.risk,
-            "base": origin.base,
-            "revision": origin.revision,
-        }
+        resolve = [
+            {
+                "reference": str(url),
+                "charm-origin": {
+                    "source": source,
+                    "architecture": origin.architecture,
+                    "track": origin.track,
+                    "risk": origin.risk,
+                    "base": origin.base,
+                    "revision": origin.revision,
+                },
+            }
+            for url, origin in charms
+        ]
+        results = await self._resolve_charm_results(resolve, charms_facade)
 
-        resp = await charms_facade.ResolveCharms(
-            resolve=[{"reference": str(url), "charm-origin": resolve_origin}]
-        )
-        if len(resp.results) != 1:
-            raise JujuError(f"expected one result, received {resp.results}")
+        resolved = []
+        for (url, _), result in zip(charms, results):
+            if result.error:
+                raise JujuError(f"resolving {url} : {result.error.message}")
+
+            # TODO (cderici) : supported_bases
+            supported_series = result.get(
+                "supported_series", result.unknown_fields["supported-series"]
+            )
+            resolved_origin = result.charm_origin
+            charm_url = URL.parse(result.url)
 
-        result = resp.results[0]
-        if result.error:
-            raise JujuError(f"resolving {url} : {result.error.message}")
+            # run the series selector to get a series for the base
+            selected_series = utils.series_selector(
+                series, charm_url, model_config, supported_series, force
+            )
+            result.charm_origin.base = utils.get_base_from_origin_or_channel(
+                resolved_origin, selected_series
+            )
+            charm_url.series = selected_series
+            resolved.append((charm_url, resolved_origin))
 
-        # TODO (cderici) : supported_bases
-        supported_series = result.get(
-            "supported_series", result.unknown_fields["supported-series"]
-        )
-        resolved_origin = result.charm_origin
-        charm_url = URL.parse(result.url)
+        return resolved
 
-        # run the series selector to get a series for the base
-        selected_series = utils.series_selector(
-            series, charm_url, model_config, supported_series, force
-        )
-        result.charm_origin.base = utils.get_base_from_origin_or_channel(
-            resolved_origin, selected_series
-        )
-        charm_url.series = selected_series
+    def _controller_uuid(self):
+        controller_tag = (self.connection().info or {}).get("controller-tag")
+        return tag.untag("controller-", controller_tag) or "unknown"
+
+    async def _resolve_charm_results(self, resolve, charms_facade=None):
+        """Calls Charms.ResolveCharms for the given resolve requests, which
+        are served from the :attr:`charm_cache` when possible.
+
+        :param resolve: list of client.ResolveCharmWithChannel, or dicts of
+            their JSON fields.
+        :returns [client.ResolveCharmWithChannelResult], in order
+        """
+        if charms_facade is None:
+            charms_facade = client.CharmsFacade.from_connection(self.connection())
+        cache = self._charm_cache
+        if cache is None:
+            resp = await charms_facade.ResolveCharms(resolve=resolve)
+            if len(resp.results) != len(resolve):
+                raise JujuError(
+                    f"expected {len(resolve)} results, received {resp.results}"
+                )
+            return resp.results
+
+        controller_uuid = self._controller_uuid()
+        keys = [
+            json.loads(json.dumps(request, cls=TypeEncoder, sort_keys=True))
+            for request in resolve
+        ]
+        results = [cache.get(controller_uuid, RESOLVE, key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            resp = await charms_facade.ResolveCharms(
+                resolve=[resolve[i] for i in missing]
+            )
+            if len(resp.results) != len(missing):
+                raise JujuError(
+                    f"expected {len(missing)} results, received {resp.results}"
+                )
+            for i, result in zip(missing, resp.results):
+                results[i] = result
+                if not result.error:
+                    cache.put(
+                        controller_uuid,
+                        RESOLVE,
+                        keys[i],
+                        dump_result(result),
+                        charm=URL.parse(result.url).name,
+                    )
+        return [
+            client.ResolveCharmWithChannelResult.from_json(result)
+            if isinstance(result, dict)
+            else result
+            for result in results
+        ]
+
+    async def _charm_info(self, url):
+        """Calls Charms.CharmInfo for the charm at ``url``, whose result is
+        served from the :attr:`charm_cache` when possible.
 
-        return charm_url, resolved_origin
+        :returns client.Charm
+        """
+        cache = self._charm_cache
+        if cache is not None:
+            controller_uuid = self._controller_uuid()
+            cached = cache.get(controller_uuid, CHARM_INFO, str(url))
+            if cached is not None:
+                return client.Charm.from_json(cached)
+        charm_facade = client.CharmsFacade.from_connection(self.connection())
+        res = await charm_facade.CharmInfo(url)
+        if cache is not None:
+            cache.put(
+                controller_uuid,
+                CHARM_INFO,
+                str(url),
+                dump_result(res),
+                charm=URL.parse(str(url)).name,
+            )
+        return res
 
     async def _resolve_architecture(self, url=None):
         """_resolve_architecture returns the architecture for a given charm url.
@@ -2117,8 +3477,7 @@ class Model:
         :returns [string]string resource_map that is a map of resources to their assigned
         pendingIDs.
         """
-        charm_facade = client.CharmsFacade.from_connection(self.connection())
-        res = await charm_facade.CharmInfo(entity_url)
+        res = await self._charm_info(entity_url)
 
         resources = [
             {
@@ -2168,6 +3527,9 @@ class Model:
         the pending IDs from the controller it sends an HTTP PUT request to actually upload local
         resources.
 
+        All the resources are added with a single AddPendingResources call, and uploaded
+        concurrently, in threads, up to the ``resource_uploads`` limit of the model.
+
         :param str application: the name of the application
         :param client.CharmURL entity_url: url for the charm that we add resources for
         :param [string]string metadata: metadata for the charm that we add resources for
@@ -2180,50 +3542,71 @@ class Model:
         if not resources:
             return None
 
-        resource_map = dict()
-
+        uploads = []
         for name, path in resources.items():
             resource_type = metadata["resources"][name]["type"]
             if resource_type not in {"oci-image", "file"}:
                 log.info(f"Resource {name} of type {resource_type} is not supported")
                 continue
+            uploads.append((name, path, resource_type))
+        if not uploads:
+            return {}
 
-            charmresource = {
-                "description": "",
-                "fingerprint": "",
-                "name": name,
-                "path": Path(path).name,
-                "revision": 0,
-                "size": 0,
-                "type_": resource_type,
-                "origin": "upload",
-            }
-
-            resources_facade = client.ResourcesFacade.from_connection(self.connection())
-            response = await resources_facade.AddPendingResources(
-                application_tag=tag.application(application),
-                charm_url=entity_url,
-                resources=[client.CharmResource(**charmresource)],
-            )
-            pending_id = response.pending_ids[0]
-            resource_map[name] = pending_id
-
-            if resource_type == "oci-image":
-                # TODO Docker Image validation and support for local images.
-                docker_image_details = {
-                    "registrypath": path,
-                    "username": "",
-                    "password": "",
-                }
-                data = yaml.dump(docker_image_details).encode("utf-8")
-            else:
-                p = Path(path)
-                data = p.read_bytes() if p.exists() else b""
+        resources_facade = client.ResourcesFacade.from_connection(self.connection())
+        response = await resources_facade.AddPendingResources(
+            application_tag=tag.application(application),
+            charm_url=entity_url,
+            resources=[
+                client.CharmResource(
+                    description="",
+                    fingerprint="",
+                    name=name,
+                    path=Path(path).name,
+                    revision=0,
+                    size=0,
+                    type_=resource_type,
+                    origin="upload",
+                )
+                for name, path, resource_type in uploads
+            ],
+        )
+        resource_map = {
+            name: pending_id
+            for (name, _, _), pending_id in zip(uploads, response.pending_ids)
+        }
 
-            self._upload(data, path, application, name, resource_type, pending_id)
+        loop = jasyncio.get_running_loop()
+
+        async def upload(name, path, resource_type):
+            async with self._resource_uploads:
+                await loop.run_in_executor(
+                    None,
+                    self._upload_resource,
+                    path,
+                    application,
+                    name,
+                    resource_type,
+                    resource_map[name],
+                )
 
+        await jasyncio.gather(*[upload(*resource) for resource in uploads])
         return resource_map
 
+    def _upload_resource(self, path, app_name, res_name, res_type, pending_id):
+        if res_type == "oci-image":
+            # TODO Docker Image validation and support for local images.
+            docker_image_details = {
+                "registrypath": path,
+                "username": "",
+                "password": "",
+            }
+            data = utils.yaml_dump(docker_image_details).encode("utf-8")
+        else:
+            p = Path(path)
+            data = p.read_bytes() if p.exists() else b""
+
+        self._upload(data, path, app_name, res_name, res_type, pending_id)
+
     def _upload(
         self,
         data: bytes,
@@ -2283,18 +3666,62 @@ class Model:
         """
         log.info("Deploying %s", charm_url)
 
+        app = self._deploy_arg(
+            charm_url,
+            application,
+            series,
+            config,
+            constraints,
+            endpoint_bindings,
+            resources,
+            storage,
+            channel=channel,
+            num_units=num_units,
+            placement=placement,
+            devices=devices,
+            charm_origin=charm_origin,
+            attach_storage=attach_storage,
+            force=force,
+            server_side_deploy=server_side_deploy,
+        )
+        [errors] = await self._submit_deploys([app])
+        if errors:
+            raise JujuError("\n".join(errors))
+
+        return await self._wait_for_new("application", application)
+
+    def _deploy_arg(
+        self,
+        charm_url,
+        application,
+        series,
+        config,
+        constraints,
+        endpoint_bindings,
+        resources,
+        storage: Mapping[str, str | StorageConstraintDict] | None,
+        channel=None,
+        num_units=None,
+        placement=None,
+        devices=None,
+        charm_origin=None,
+        attach_storage=[],
+        force=False,
+        server_side_deploy=False,
+    ):
+        """Return the argument of the deploy call of an application: a
+        client.DeployFromRepositoryArg for a server side deploy, or a
+        client.ApplicationDeploy. See :meth:`_deploy`.
+        """
         storage = parse_storage_constraints(storage)
 
         trust = config.get("trust", False)
         # stringify all config values for API, and convert to YAML
         config = {k: str(v) for k, v in config.items()}
-        config = yaml.dump({application: config}, default_flow_style=False)
-
-        app_facade = client.ApplicationFacade.from_connection(self.connection())
+        config = utils.yaml_dump({application: config}, default_flow_style=False)
 
         if server_side_deploy:
-            # Call DeployFromRepository
-            app = client.DeployFromRepositoryArg(
+            return client.DeployFromRepositoryArg(
                 applicationname=application,
                 attachstorage=attach_storage,
                 charmname=charm_url,
@@ -2313,52 +3740,83 @@ class Model:
                 resources=resources,
                 revision=charm_origin.revision,
             )
-            result = await app_facade.DeployFromRepository([app])
-            # Collect the errors
-            errors = []
-            for r in result.results:
+        return client.ApplicationDeploy(
+            charm_url=charm_url,
+            application=application,
+            series=series,
+            channel=channel,
+            charm_origin=charm_origin,
+            config_yaml=config,
+            constraints=parse_constraints(constraints),
+            endpoint_bindings=endpoint_bindings,
+            num_units=num_units,
+            resources=resources,
+            storage=storage,
+            placement=placement,
+            devices=devices,
+            attach_storage=attach_storage,
+            force=force,
+        )
+
+    async def _submit_deploys(self, apps):
+        """Deploy applications in bulk, with one DeployFromRepository call
+        for the server side deploys and one Deploy call for the others.
+
+        :param apps: list of the arguments returned by :meth:`_deploy_arg`.
+        :returns: the list of the error messages of each application, in
+            the order of ``apps``.
+        """
+        app_facade = client.ApplicationFacade.from_connection(self.connection())
+        errors = [[] for _ in apps]
+
+        async def deploy_from_repository(indexes):
+            result = await app_facade.DeployFromRepository([apps[i] for i in indexes])
+            loop = jasyncio.get_running_loop()
+            for i, r in zip(indexes, result.results):
                 if r.errors:
-                    errors.extend([e.message for e in r.errors])
-            # Upload pending local resources if any
-            for _result in result.results:
-                for pending_upload_resource in getattr(
-                    _result, "pendingresourceuploads", []
-                ):
+                    errors[i].extend(e.message for e in r.errors)
+                # Upload pending local resources if any. The application
+                # exists by now, so a failed upload is one of its errors
+                # rather than a failure of the whole call
+                for pending_upload_resource in getattr(r, "pendingresourceuploads", []):
                     _path = pending_upload_resource.filename
-                    p = Path(_path)
-                    data = p.read_text() if p.exists() else ""
-                    self._upload(
-                        data,
-                        _path,
-                        application,
-                        pending_upload_resource.name,
-                        "file",
-                        "",
-                    )
-        else:
-            app = client.ApplicationDeploy(
-                charm_url=charm_url,
-                application=application,
-                series=series,
-                channel=channel,
-                charm_origin=charm_origin,
-                config_yaml=config,
-                constraints=parse_constraints(constraints),
-                endpoint_bindings=endpoint_bindings,
-                num_units=num_units,
-                resources=resources,
-                storage=storage,
-                placement=placement,
-                devices=devices,
-                attach_storage=attach_storage,
-                force=force,
-            )
-            result = await app_facade.Deploy(applications=[app])
-            errors = [r.error.message for r in result.results if r.error]
-        if errors:
-            raise JujuError("\n".join(errors))
+                    try:
+                        p = Path(_path)
+                        data = p.read_bytes() if p.exists() else b""
+                        await loop.run_in_executor(
+                            None,
+                            self._upload,
+                            data,
+                            _path,
+                            apps[i].applicationname,
+                            pending_upload_resource.name,
+                            "file",
+                            "",
+                        )
+                    except Exception as e:
+                        errors[i].append(
+                            f"uploading resource {pending_upload_resource.name}: {e}"
+                        )
 
-        return await self._wait_for_new("application", application)
+        async def deploy(indexes):
+            result = await app_facade.Deploy(applications=[apps[i] for i in indexes])
+            for i, r in zip(indexes, result.results):
+                if r.error:
+                    errors[i].append(r.error.message)
+
+        from_repository, others = [], []
+        for i, app in enumerate(apps):
+            if isinstance(app, client.DeployFromRepositoryArg):
+                from_repository.append(i)
+            else:
+                others.append(i)
+        calls = []
+        if from_repository:
+            calls.append(deploy_from_repository(from_repository))
+        if others:
+            calls.append(deploy(others))
+        await jasyncio.gather(*calls)
+        return errors
 
     async def destroy_unit(
         self, unit_id, destroy_storage=False, dry_run=False, force=False, max_wait=None
@@ -2442,12 +3900,19 @@ class Model:
         log.info("Backup archive downloaded in : %s" % file_name)
         return file_name
 
-    async def get_config(self):
+    async def get_config(self, max_age=None):
         """Return the configuration settings for this model.
 
+        :param float max_age: Maximum age, in seconds, of a cached config
+            that may be returned. Defaults to the ``config_ttl`` of the model.
         :returns: A ``dict`` mapping keys to `ConfigValue` instances,
             which have `source` and `value` attributes.
         """
+        config = await self._settings_cache.get("config", self._get_config, max_age)
+        # the cached values are shared, so callers get their own copy
+        return copy.deepcopy(config)
+
+    async def _get_config(self):
         config_facade = client.ModelConfigFacade.from_connection(self.connection())
         result = await config_facade.ModelGet()
         config = result.config
@@ -2455,11 +3920,19 @@ class Model:
             config[key] = client.ConfigValue.from_json(value)
         return config
 
-    async def get_constraints(self):
+    async def get_constraints(self, max_age=None):
         """Return the machine constraints for this model.
 
+        :param float max_age: Maximum age, in seconds, of cached constraints
+            that may be returned. Defaults to the ``config_ttl`` of the model.
         :returns: A ``dict`` of constraints.
         """
+        constraints = await self._settings_cache.get(
+            "constraints", self._get_constraints, max_age
+        )
+        return copy.deepcopy(constraints)
+
+    async def _get_constraints(self):
         constraints = {}
         facade_cls = client.ModelConfigFacade
 
@@ -2583,6 +4056,7 @@ class Model:
                     % (value, type(value))
                 )
         await config_facade.ModelSet(config=new_conf)
+        self._settings_cache.invalidate()
 
     async def set_constraints(self, constraints):
         """Set machine constraints on this model.
@@ -2594,6 +4068,7 @@ class Model:
         facade = facade_cls.from_connection(self.connection())
 
         await facade.SetModelConstraints(application="", constraints=constraints)
+        self._settings_cache.invalidate()
 
     async def get_action_output(self, action_uuid, wait=None):
         """Get the results of an action by ID.
@@ -2663,16 +4138,20 @@ class Model:
             results[tag.untag("action-", a.action.tag)] = a.status
         return results
 
-    async def get_status(self, filters=None, utc=False) -> FullStatus:
+    async def get_status(self, filters=None, utc=False, max_age=None) -> FullStatus:
         """Return the status of the model.
 
+        Concurrent calls share a single FullStatus request, see
+        :attr:`status_cache`.
+
         :param str filters: Optional list of applications, units, or machines
             to include, which can use wildcards ('*').
         :param bool utc: Display time as UTC in RFC3339 format
+        :param float max_age: Maximum age, in seconds, of a cached status
+            that may be returned. Defaults to the ``status_ttl`` of the model.
 
         """
-        client_facade = client.ClientFacade.from_connection(self.connection())
-        return await client_facade.FullStatus(patterns=filters)
+        return await self._status_cache.get(filters, max_age=max_age)
 
     async def get_metrics(self, *tags):
         """Retrieve metrics.
@@ -3007,6 +4486,7 @@ class Model:
         status: str | None = None,
         wait_for_at_least_units: int | None = None,
         wait_for_exact_units: int | None = None,
+        status_refresh_interval: float | None = 10,
     ) -> None:
         """Wait for applications in the model to settle into an idle state.
 
@@ -3037,8 +4517,11 @@ class Model:
             any pending hooks have a chance to start to avoid false positives.
             The default is 15 seconds.
 
-        :param float check_freq: How frequently, in seconds, to check the model.
-            The default is every half-second.
+        :param float check_freq: The minimum time, in seconds, between two
+            checks of the model. The model is checked again when a relevant
+            unit, application or machine change arrives from the watcher, or
+            when a unit's idle period elapses, rather than on a fixed
+            schedule. The default is half a second.
 
         :param str status: The status to wait for. If None, not waiting.
             The default is None (not waiting for any status).
@@ -3051,6 +4534,13 @@ class Model:
         :param int wait_for_exact_units: The exact number of units to be expected before
             going into the idle state. (e.g. useful for scaling down).
             When set, takes precedence over the `wait_for_units` parameter.
+
+        :param float status_refresh_interval: Application statuses are derived
+            from the watched model state. While waiting for a ``status`` that
+            an application has not reached yet, a single FullStatus covering
+            all applications is requested at most once per this many seconds,
+            as it may be more up to date than the model. If None, FullStatus is
+            never requested. The default is 10 seconds.
         """
         if wait_for_active:
             warnings.warn(
@@ -3105,112 +4595,498 @@ class Model:
                 isinstance(wait_for_exact_units, int) and wait_for_exact_units >= 0
             ), "Invalid value for wait_for_exact_units : %s" % wait_for_exact_units
 
-        while True:
-            # The list 'busy' is what keeps this loop going,
-            # i.e. it'll stop when busy is empty after all the
-            # units are scanned
-            busy = []
-            errors = {}
-            blocks = {}
-            for app_name in apps:
-                if app_name not in self.applications:
-                    busy.append(app_name + " (missing)")
-                    continue
-                app = self.applications[app_name]
-                app_status = await app.get_status()
-                if raise_on_error and app_status == "error":
-                    errors.setdefault("App", []).append(app.name)
-                if raise_on_blocked and app_status == "blocked":
-                    blocks.setdefault("App", []).append(app.name)
-
-                # Check if wait_for_exact_units flag is used
-                if wait_for_exact_units is not None:
-                    if len(app.units) != wait_for_exact_units:
+        async def _remote_app_status(app_name):
+            # One FullStatus serves every app, at most once per interval
+            if status_refresh_interval is None or not self.is_connected():
+                return None
+            full_status = await self._status_cache.get(max_age=status_refresh_interval)
+            remote_app = full_status.applications.get(app_name)
+            return remote_app.status.status if remote_app else None
+
+        # Only re-check when something relevant to the awaited apps changes,
+        # a unit's idle period elapses, or the timeout expires.
+        changed = jasyncio.Event()
+        app_names = set(apps)
+
+        def _is_relevant(delta):
+            if delta.entity == "machine":
+                return True
+            if delta.entity == "application":
+                return delta.get_id() in app_names
+            if delta.entity == "unit":
+                return delta.data.get("application") in app_names
+            return False
+
+        async def _on_change(delta, old, new, model):  # noqa: RUF029
+            changed.set()
+
+        # The model state stops changing when the watcher stops, so waiting
+        # would never end; raise instead, as the status RPCs would have
+        watching = not self._watch_stopped.is_set()
+
+        def _raise_if_watcher_stopped():
+            if not watching or (
+                not self._watch_stopped.is_set() and self.is_connected()
+            ):
+                return
+            task = getattr(self, "_watcher_task", None)
+            if (
+                task is not None
+                and task.done()
+                and not task.cancelled()
+                and task.exception() is not None
+            ):
+                raise task.exception()
+            raise JujuConnectionError("Model disconnected while waiting for idle")
+
+        async def _wait_for_change():
+            now = datetime.now()
+            wakeups = [
+                idle_start + idle_period
+                for idle_start in idle_times.values()
+                if idle_start + idle_period > now
+            ]
+            if timeout is not None:
+                wakeups.append(start_time + timeout)
+            delay = (min(wakeups) - now).total_seconds() if wakeups else None
+            # Don't check more often than check_freq, however busy the model is
+            await jasyncio.sleep(check_freq)
+            if changed.is_set() or (delay is not None and delay <= check_freq):
+                return
+            try:
+                await jasyncio.wait_for(
+                    changed.wait(), None if delay is None else delay - check_freq
+                )
+            except jasyncio.TimeoutError:
+                pass
+
+        observer = self.add_observer(_on_change, predicate=_is_relevant)
+        stopped = jasyncio.ensure_future(self._watch_stopped.wait())
+        stopped.add_done_callback(lambda _: changed.set())
+        try:
+            while True:
+                changed.clear()
+                _raise_if_watcher_stopped()
+                units_ready_before = len(units_ready)
+                # The list 'busy' is what keeps this loop going,
+                # i.e. it'll stop when busy is empty after all the
+                # units are scanned
+                busy = []
+                errors = {}
+                blocks = {}
+                for app_name in apps:
+                    if app_name not in self.applications:
+                        busy.append(app_name + " (missing)")
+                        continue
+                    app = self.applications[app_name]
+                    app_status = app.status
+                    if status and app_status != status:
+                        remote_status = await _remote_app_status(app_name)
+                        if remote_status is not None:
+                            app_status = derive_status([app_status, remote_status])
+                    if raise_on_error and app_status == "error":
+                        errors.setdefault("App", []).append(app.name)
+                    if raise_on_blocked and app_status == "blocked":
+                        blocks.setdefault("App", []).append(app.name)
+
+                    # Check if wait_for_exact_units flag is used
+                    if wait_for_exact_units is not None:
+                        if len(app.units) != wait_for_exact_units:
+                            busy.append(
+                                app.name
+                                + " (waiting for exactly %s units, current : %s)"
+                                % (wait_for_exact_units, len(app.units))
+                            )
+                            continue
+                    # If we have less # of units then required, then wait a bit more
+                    elif len(app.units) < _wait_for_units:
                         busy.append(
                             app.name
-                            + " (waiting for exactly %s units, current : %s)"
-                            % (wait_for_exact_units, len(app.units))
+                            + " (not enough units yet - %s/%s)"
+                            % (len(app.units), _wait_for_units)
                         )
                         continue
-                # If we have less # of units then required, then wait a bit more
-                elif len(app.units) < _wait_for_units:
-                    busy.append(
-                        app.name
-                        + " (not enough units yet - %s/%s)"
-                        % (len(app.units), _wait_for_units)
-                    )
-                    continue
-                # User is waiting for at least a certain # of units, and we have enough
-                elif wait_for_at_least_units and len(units_ready) >= _wait_for_units:
-                    # So no need to keep looking, we have the desired number of units ready to go,
-                    # exit the loop. Don't just return here, though, we might still have some
-                    # errors to raise at the end
-                    break
-                for unit in app.units:
-                    if (
-                        raise_on_error
-                        and unit.machine is not None
-                        and unit.machine.status == "error"
+                    # User is waiting for at least a certain # of units, and we have enough
+                    elif (
+                        wait_for_at_least_units and len(units_ready) >= _wait_for_units
                     ):
-                        errors.setdefault("Machine", []).append(unit.machine.id)
-                        continue
-                    if raise_on_error and unit.agent_status == "error":
-                        errors.setdefault("Agent", []).append(unit.name)
-                        continue
-                    if raise_on_error and unit.workload_status == "error":
-                        errors.setdefault("Unit", []).append(unit.name)
-                        continue
-                    if raise_on_blocked and unit.workload_status == "blocked":
-                        blocks.setdefault("Unit", []).append(unit.name)
-                        continue
-                    # TODO (cderici): we need two versions of wait_for_idle, one for waiting on
-                    #  individual units, another one for waiting for an application.
-                    #  The convoluted logic below is the result of trying to do both at the same
-                    #  time
-                    need_to_wait_more_for_a_particular_status = status and (
-                        unit.workload_status != status
-                    )
-                    app_is_in_desired_status = (not status) or (app_status == status)
-                    if (
-                        not need_to_wait_more_for_a_particular_status
-                        and unit.agent_status == "idle"
-                        and (wait_for_at_least_units or app_is_in_desired_status)
-                    ):
-                        # A unit is ready if either:
-                        # 1) Don't need to wait more for a particular status and the agent is "idle"
-                        # 2) We're looking for a particular status and the unit's workload,
-                        # as well as the application, is in that status. If the user wants to
-                        # see only a particular number of units in that state -- i.e. a subset of
-                        # the units is needed, then we don't care about the application status
-                        # (because e.g. app can be in 'waiting' while unit.0 is 'active' and unit.1
-                        # is 'waiting')
-
-                        # Either way, the unit is ready, start measuring the time period that
-                        # it needs to stay in that state (i.e. idle_period)
-                        units_ready.add(unit.name)
-                        now = datetime.now()
-                        idle_start = idle_times.setdefault(unit.name, now)
-
-                        if now - idle_start < idle_period:
+                        # So no need to keep looking, we have the desired number of units ready to go,
+                        # exit the loop. Don't just return here, though, we might still have some
+                        # errors to raise at the end
+                        break
+                    for unit in app.units:
+                        if (
+                            raise_on_error
+                            and unit.machine is not None
+                            and unit.machine.status == "error"
+                        ):
+                            errors.setdefault("Machine", []).append(unit.machine.id)
+                            continue
+                        if raise_on_error and unit.agent_status == "error":
+                            errors.setdefault("Agent", []).append(unit.name)
+                            continue
+                        if raise_on_error and unit.workload_status == "error":
+                            errors.setdefault("Unit", []).append(unit.name)
+                            continue
+                        if raise_on_blocked and unit.workload_status == "blocked":
+                            blocks.setdefault("Unit", []).append(unit.name)
+                            continue
+                        # TODO (cderici): we need two versions of wait_for_idle, one for waiting on
+                        #  individual units, another one for waiting for an application.
+                        #  The convoluted logic below is the result of trying to do both at the same
+                        #  time
+                        need_to_wait_more_for_a_particular_status = status and (
+                            unit.workload_status != status
+                        )
+                        app_is_in_desired_status = (not status) or (
+                            app_status == status
+                        )
+                        if (
+                            not need_to_wait_more_for_a_particular_status
+                            and unit.agent_status == "idle"
+                            and (wait_for_at_least_units or app_is_in_desired_status)
+                        ):
+                            # A unit is ready if either:
+                            # 1) Don't need to wait more for a particular status and the agent is "idle"
+                            # 2) We're looking for a particular status and the unit's workload,
+                            # as well as the application, is in that status. If the user wants to
+                            # see only a particular number of units in that state -- i.e. a subset of
+                            # the units is needed, then we don't care about the application status
+                            # (because e.g. app can be in 'waiting' while unit.0 is 'active' and unit.1
+                            # is 'waiting')
+
+                            # Either way, the unit is ready, start measuring the time period that
+                            # it needs to stay in that state (i.e. idle_period)
+                            units_ready.add(unit.name)
+                            now = datetime.now()
+                            idle_start = idle_times.setdefault(unit.name, now)
+
+                            if now - idle_start < idle_period:
+                                busy.append(
+                                    f"{unit.name} [{unit.agent_status}] {unit.workload_status}: {unit.workload_status_message}"
+                                )
+                        else:
+                            idle_times.pop(unit.name, None)
                             busy.append(
                                 f"{unit.name} [{unit.agent_status}] {unit.workload_status}: {unit.workload_status_message}"
                             )
+                _raise_for_status(errors, "error")
+                _raise_for_status(blocks, "blocked")
+                if not busy:
+                    break
+                if len(units_ready) != units_ready_before:
+                    # The outcome of the next check depends on the units that
+                    # just became ready, so don't wait for a change to happen
+                    changed.set()
+                busy = "\n  ".join(busy)
+                if timeout is not None and datetime.now() - start_time > timeout:
+                    raise jasyncio.TimeoutError("Timed out waiting for model:\n" + busy)
+                if (
+                    last_log_time is None
+                    or datetime.now() - last_log_time > log_interval
+                ):
+                    log.info("Waiting for model:\n  " + busy)
+                    last_log_time = datetime.now()
+                await _wait_for_change()
+        finally:
+            stopped.cancel()
+            self.remove_observer(observer)
+
+
+class _ControllerObserver:
+    """Handle for an observer registered with
+    :meth:`ControllerWatcher.add_observer`.
+
+    The registration is repeated on the model of every watched model that
+    matches ``model_uuid``, including models which appear later on.
+
+    """
+
+    def __init__(self, callable_, model_uuid, kwargs):
+        self.callable_ = callable_
+        self.model_uuid = model_uuid
+        self.kwargs = kwargs
+        self.handles = {}
+
+    def wants(self, model_uuid):
+        return self.model_uuid is None or self.model_uuid == model_uuid
+
+
+class ControllerWatcher:
+    """Watches the state of every model of a controller over the controller
+    connection.
+
+    A single AllModelWatcher feeds one :class:`Model` per watched model,
+    whose state is kept up to date as it would be for a connected model, so
+    monitoring many models takes one connection and one watcher instead of
+    one of each per model. The deltas of a model are dropped once the model
+    is removed.
+
+    The models are not connected themselves: they hold the state and the
+    observers of the model, but can't make any API calls. Use
+    :meth:`Controller.get_model` to act on a model.
+
+    Watching all models requires controller superuser access.
+
+    """
+
+    def __init__(self, controller, model_uuids=None, watch_filter=None):
+        """:param controller: The connected :class:`Controller` to watch.
+        :param model_uuids: Optional list of the uuids of the models to
+            watch. Defaults to all models.
+        :param watch_filter: Optional :class:`WatchFilter`, or dict of its
+            arguments, applied to the deltas of every model.
+        """
+        self.controller = controller
+        self.model_uuids = set(model_uuids) if model_uuids is not None else None
+        if isinstance(watch_filter, dict):
+            watch_filter = WatchFilter(**watch_filter)
+        self.watch_filter = watch_filter
+        self.models = {}
+        self._observers = []
+        self._watcher_task = None
+        self._watch_received = jasyncio.Event()
+        self._watch_stopping = jasyncio.Event()
+        self._watch_stopped = jasyncio.Event()
+        self._watch_stopped.set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    def get_model(self, model_uuid):
+        """Return the (unconnected) model for ``model_uuid``, or None if the
+        model hasn't been seen by the watcher.
+        """
+        return self.models.get(model_uuid)
+
+    def get_state(self, model_uuid):
+        """Return the :class:`ModelState` of the model with ``model_uuid``,
+        or None if the model hasn't been seen by the watcher.
+        """
+        model = self.models.get(model_uuid)
+        return model.state if model is not None else None
+
+    def add_observer(
+        self,
+        callable_,
+        entity_type=None,
+        action=None,
+        entity_id=None,
+        predicate=None,
+        model_uuid=None,
+        queue_size=None,
+        overflow=OverflowPolicy.BLOCK,
+    ):
+        """Register an "on-model-change" callback for the watched models.
+
+        This takes the same arguments as :meth:`Model.add_observer`, and the
+        callable is called with the model of the change as its last
+        argument.
+
+        :param model_uuid: Only call the callable for changes to the model
+            with this uuid. Defaults to all models.
+
+        Queued observers get one queue per model.
+
+        Returns a handle which can be passed to :meth:`remove_observer`.
+
+        """
+        observer = _ControllerObserver(
+            callable_,
+            model_uuid,
+            dict(
+                entity_type=entity_type,
+                action=action,
+                entity_id=entity_id,
+                predicate=predicate,
+                queue_size=queue_size,
+                overflow=overflow,
+            ),
+        )
+        self._observers.append(observer)
+        for uuid, model in self.models.items():
+            if observer.wants(uuid):
+                observer.handles[uuid] = model.add_observer(
+                    callable_, **observer.kwargs
+                )
+        return observer
+
+    def remove_observer(self, observer):
+        """Unregister an observer added by :meth:`add_observer`, from all
+        models.
+
+        :param observer: The handle returned by :meth:`add_observer`.
+        :return bool: True if the observer was registered.
+
+        """
+        if observer not in self._observers:
+            return False
+        self._observers.remove(observer)
+        for uuid, handle in observer.handles.items():
+            model = self.models.get(uuid)
+            if model is not None:
+                model.remove_observer(handle)
+        observer.handles.clear()
+        return True
+
+    def _get_or_create_model(self, model_uuid):
+        model = self.models.get(model_uuid)
+        if model is None:
+            model = Model(jujudata=self.controller._connector.jujudata)
+            model.uuid = model_uuid
+            model._watch_filter = self.watch_filter
+            self.models[model_uuid] = model
+            for observer in self._observers:
+                if observer.wants(model_uuid):
+                    observer.handles[model_uuid] = model.add_observer(
+                        observer.callable_, **observer.kwargs
+                    )
+        return model
+
+    async def _apply_deltas(self, deltas):
+        """Apply one batch of raw deltas from the AllModelWatcher to the
+        models they belong to.
+
+        :return dict: The applied changes of each model, by model uuid.
+
+        """
+        by_model = {}
+        for delta in deltas:
+            model_uuid = delta.data.get("model-uuid")
+            if self.model_uuids is not None and model_uuid not in self.model_uuids:
+                continue
+            by_model.setdefault(model_uuid, []).append(delta)
+
+        applied = {}
+        for model_uuid, model_deltas in by_model.items():
+            model = self._get_or_create_model(model_uuid)
+            applied[model_uuid] = await model._apply_deltas(model_deltas)
+            if any(
+                delta.entity == "model" and delta.type == "remove"
+                for delta in model_deltas
+            ):
+                self._forget_model(model_uuid)
+        return applied
+
+    def _forget_model(self, model_uuid):
+        model = self.models.pop(model_uuid, None)
+        for observer in self._observers:
+            observer.handles.pop(model_uuid, None)
+        if model is None:
+            return
+        # the queued deltas, up to the removal of the model, are still
+        # delivered, then the queue workers and change streams end
+        for o in list(model._observers):
+            model._observers.pop(o, None)
+            if o.queue is not None:
+                o.queue.end()
+
+    async def start(self):
+        """Start watching, and wait until the state of all watched models
+        has been received.
+
+        :raises: :class:`JujuError` if the controller doesn't support
+            watching all models.
+
+        """
+        if not self._watch_stopped.is_set():
+            return
+        conn = self.controller.connection()
+        if client.AllModelWatcherFacade.best_facade_version(conn) is None:
+            raise JujuError(
+                "controller does not support watching all models; "
+                "the AllModelWatcher facade requires superuser access"
+            )
+        log.debug("Starting all-model watcher task")
+        self._watch_received.clear()
+        self._watch_stopping.clear()
+        self._watch_stopped.clear()
+        self._watcher_task = jasyncio.create_task(self._all_model_watcher())
+
+        waiter = jasyncio.create_task(self._watch_received.wait())
+        done, _ = await jasyncio.wait(
+            [waiter, self._watcher_task], return_when=jasyncio.FIRST_COMPLETED
+        )
+        if self._watcher_task in done:
+            waiter.cancel()
+            if not self._watcher_task.exception():
+                raise JujuError(
+                    "AllModelWatcher task is finished abruptly without an exception."
+                )
+            raise self._watcher_task.exception()
+
+    async def stop(self):
+        """Stop watching. The models keep their last known state."""
+        if not self._watch_stopped.is_set():
+            log.debug("Stopping all-model watcher task")
+            self._watch_stopping.set()
+            if self._watcher_task.done() and self._watcher_task.exception():
+                raise self._watcher_task.exception()
+            await self._watch_stopped.wait()
+            self._watch_stopping.clear()
+
+        for model in self.models.values():
+            for o in list(model._observers):
+                if o.queue is not None and o.queue.deliver:
+                    o.queue.stop()
+            model._end_change_streams()
+
+    async def _all_model_watcher(self):
+        try:
+            conn = self.controller.connection()
+            watcher = client.AllModelWatcherFacade.from_connection(conn)
+            while not self._watch_stopping.is_set():
+                try:
+                    results = await utils.run_with_interrupt(
+                        watcher.Next(), self._watch_stopping, log=log
+                    )
+                except JujuAPIError as e:
+                    if "watcher was stopped" not in str(e):
+                        raise
+                    if self._watch_stopping.is_set():
+                        break
+                    log.warning("AllModelWatcher: watcher stopped, restarting")
+                    del watcher.Id
+                    continue
+                except websockets.ConnectionClosed:
+                    if conn.monitor.reconnecting.locked():
+                        log.warning("AllModelWatcher: connection closed, waiting")
+                        async with conn.monitor.reconnecting:
+                            pass
+                    elif conn.monitor.status == connection.Monitor.ERROR:
+                        log.warning("AllModelWatcher: connection closed, reopening")
+                        await conn.reconnect()
                     else:
-                        idle_times.pop(unit.name, None)
-                        busy.append(
-                            f"{unit.name} [{unit.agent_status}] {unit.workload_status}: {unit.workload_status_message}"
+                        break
+                    if conn.monitor.status != connection.Monitor.CONNECTED:
+                        log.error(
+                            "AllModelWatcher: automatic reconnect "
+                            "failed; stopping watcher"
                         )
-            _raise_for_status(errors, "error")
-            _raise_for_status(blocks, "blocked")
-            if not busy:
-                break
-            busy = "\n  ".join(busy)
-            if timeout is not None and datetime.now() - start_time > timeout:
-                raise jasyncio.TimeoutError("Timed out waiting for model:\n" + busy)
-            if last_log_time is None or datetime.now() - last_log_time > log_interval:
-                log.info("Waiting for model:\n  " + busy)
-                last_log_time = datetime.now()
-            await jasyncio.sleep(check_freq)
+                        break
+                    del watcher.Id
+                    continue
+                if self._watch_stopping.is_set():
+                    try:
+                        await watcher.Stop()
+                    except websockets.ConnectionClosed:
+                        pass  # can't stop on a closed conn
+                    break
+                await self._apply_deltas(results.deltas)
+                self._watch_received.set()
+        except CancelledError:
+            pass
+        except Exception:
+            log.exception("Error in all-model watcher")
+            raise
+        finally:
+            for model in self.models.values():
+                model._end_change_streams()
+            self._watch_stopped.set()
 
 
 def _create_consume_args(offer, macaroon, controller_info):
@@ -3268,15 +5144,20 @@ class CharmArchiveGenerator:
 
     This is used automatically by
     `Model.add_local_charm_dir <#juju.model.Model.add_local_charm_dir>`_.
+
+    Members are compressed in parallel by a pool of threads, and members
+    which are already compressed, like wheels, are stored as is.
     """
 
     def __init__(self, path):
         self.path = os.path.abspath(os.path.expanduser(path))
 
-    def make_archive(self, path):
+    def make_archive(self, path, workers=None):
         """Create archive of directory and write to ``path``.
 
         :param path: Path to archive
+        :param int workers: Number of threads compressing the members. See
+            :meth:`iter_archive`.
 
         Ignored::
 
@@ -3287,17 +5168,40 @@ class CharmArchiveGenerator:
                           (.bzr, etc)
 
         """
-        zf = zipfile.ZipFile(str(path), "w", zipfile.ZIP_DEFLATED)
+        with open(str(path), "wb") as f:
+            for chunk in self.iter_archive(workers=workers):
+                f.write(chunk)
+        return path
+
+    def iter_archive(self, workers=None):
+        """Yield the archive of the directory as chunks of bytes, e.g. to
+        stream it without writing it to disk. See :meth:`make_archive`.
+
+        Members are compressed ahead, in order, by ``workers`` threads. A
+        deflated member, i.e. a file without an already compressed suffix
+        like ``.whl``, is held whole in memory until it is written, and up
+        to 2 * ``workers`` members are in flight at a time. See
+        :func:`juju._zipstream.iter_zip`.
+
+        :param int workers: Number of threads compressing the members.
+            Defaults to the number of CPUs.
+        """
+        return _zipstream.iter_zip(self._walk(), workers=workers)
+
+    def _walk(self):
+        """Yield the ("dir" | "link" | "file", real path, archive name) of
+        each entry of the archive, in archive order.
+        """
         for dirpath, dirnames, filenames in os.walk(self.path):
             relative_path = dirpath[len(self.path) + 1 :]
             if relative_path and not self._ignore(relative_path):
-                zf.write(dirpath, relative_path)
+                yield "dir", dirpath, relative_path
             for dirname in dirnames:
                 archive_name = os.path.join(relative_path, dirname)
                 real_path = os.path.join(dirpath, dirname)
                 if os.path.islink(real_path):
                     self._check_link(real_path)
-                    self._write_symlink(zf, os.readlink(real_path), archive_name)
+                    yield "link", real_path, archive_name
             for name in filenames:
                 archive_name = os.path.join(relative_path, name)
                 if not self._ignore(archive_name):
@@ -3305,11 +5209,40 @@ class CharmArchiveGenerator:
                     self._check_type(real_path)
                     if os.path.islink(real_path):
                         self._check_link(real_path)
-                        self._write_symlink(zf, os.readlink(real_path), archive_name)
+                        yield "link", real_path, archive_name
                     else:
-                        zf.write(real_path, archive_name)
-        zf.close()
-        return path
+                        yield "file", real_path, archive_name
+
+    def stat_signature(self):
+        """Return a digest of the names, types, sizes, modes and modification
+        times of the entries of the archive, which changes whenever their
+        content is likely to have changed.
+        """
+        digest = hashlib.sha256()
+        for kind, real_path, archive_name in self._walk():
+            s = os.lstat(real_path)
+            digest.update(
+                f"{kind}\0{archive_name}\0{s.st_mode}\0{s.st_size}\0"
+                f"{s.st_mtime_ns}\0".encode()
+            )
+        return digest.hexdigest()
+
+    def content_hash(self):
+        """Return a digest of the names, types, modes and contents of the
+        entries of the archive, which identifies the charm it packs.
+        """
+        digest = hashlib.sha256()
+        for kind, real_path, archive_name in self._walk():
+            mode = os.lstat(real_path).st_mode
+            digest.update(f"{kind}\0{archive_name}\0{mode}\0".encode())
+            if kind == "link":
+                digest.update(os.readlink(real_path).encode())
+            elif kind == "file":
+                with open(real_path, "rb") as f:
+                    for chunk in iter(partial(f.read, 1 << 20), b""):
+                        digest.update(chunk)
+            digest.update(b"\0")
+        return digest.hexdigest()
 
     def _check_type(self, path: str) -> str:
         """Check the path"""
@@ -3333,18 +5266,6 @@ class CharmArchiveGenerator:
                 "Invalid charm at %s %s" % (path, "Only internal symlinks are allowed")
             )
 
-    def _write_symlink(
-        self, zf: zipfile.ZipFile, link_target: str, link_path: str
-    ) -> None:
-        """Package symlinks with appropriate zipfile metadata."""
-        info = zipfile.ZipInfo()
-        info.filename = link_path
-        info.create_system = 3
-        # Magic code for symlinks / py2/3 compat
-        # 27166663808 = (stat.S_IFLNK | 0755) << 16
-        info.external_attr = 2716663808
-        zf.writestr(info, link_target)
-
     def _ignore(self, path: str) -> bool:
         return path == "build" or path.startswith("build/") or path.startswith(".")
 
@@ -0,0 +1,204 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""Declarative queries over the raw data of a :class:`juju.model.ModelState`.
+
+Queries work on the delta data held by the model state and return plain
+dicts, without building any :class:`juju.model.ModelEntity` objects. The
+status fields most often filtered on are indexed, and the index is kept up
+to date as deltas are applied.
+
+Field names are the keys of the delta data, with dots to reach into nested
+dicts, e.g. ``workload-status.current`` for the workload status of a unit.
+"""
+
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+
+# Fields indexed by value, per entity type
+INDEXED_FIELDS = {
+    "application": ("status.current",),
+    "machine": ("agent-status.current", "instance-status.current"),
+    "unit": (
+        "application",
+        "machine-id",
+        "workload-status.current",
+        "agent-status.current",
+    ),
+}
+
+# The field holding the application and the machine of an entity, if any,
+# used by the ``application`` and ``machine`` filters
+_APPLICATION_FIELDS = {"application": "name", "unit": "application"}
+_MACHINE_FIELDS = {"machine": "id", "unit": "machine-id"}
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+def get_field(data, field):
+    """Return the value of a dotted ``field`` of the delta data, or None if
+    it isn't set.
+    """
+    value = data
+    for key in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _is_pattern(value):
+    return isinstance(value, str) and not _GLOB_CHARS.isdisjoint(value)
+
+
+def _matches(value, wanted):
+    """Report whether ``value`` matches ``wanted``, which is a value, a
+    glob pattern, or a list, tuple or set of either.
+    """
+    if isinstance(wanted, (list, tuple, set, frozenset)):
+        return any(_matches(value, w) for w in wanted)
+    if _is_pattern(wanted):
+        return isinstance(value, str) and fnmatchcase(value, wanted)
+    return value == wanted
+
+
+class StateIndex:
+    """Maps the values of the :data:`INDEXED_FIELDS` to the ids of the live
+    entities which have them.
+    """
+
+    def __init__(self):
+        self._index = {}
+
+    def clear(self):
+        self._index.clear()
+
+    def rebuild(self, state):
+        """Rebuild the index from the ``state`` dict of a model state."""
+        self.clear()
+        for entity_type, entities in state.items():
+            for entity_id, history in entities.items():
+                self.update(entity_type, entity_id, None, history[-1])
+
+    def update(self, entity_type, entity_id, old_data, new_data):
+        """Move an entity from the index entries of its old data to those
+        of its new data. Either may be None.
+        """
+        fields = INDEXED_FIELDS.get(entity_type)
+        if not fields:
+            return
+        by_field = self._index.setdefault(entity_type, {})
+        for field in fields:
+            by_value = by_field.setdefault(field, {})
+            old = get_field(old_data, field) if old_data is not None else None
+            new = get_field(new_data, field) if new_data is not None else None
+            if old_data is not None and (new_data is None or old != new):
+                ids = by_value.get(old)
+                if ids is not None:
+                    ids.discard(entity_id)
+                    if not ids:
+                        del by_value[old]
+            if new_data is not None:
+                by_value.setdefault(new, set()).add(entity_id)
+
+    def lookup(self, entity_type, field, wanted):
+        """Return the set of ids of the entities whose ``field`` matches
+        ``wanted``, or None if the field isn't indexed.
+        """
+        by_value = self._index.get(entity_type, {}).get(field)
+        if by_value is None:
+            if field in INDEXED_FIELDS.get(entity_type, ()):
+                return set()
+            return None
+        if isinstance(wanted, (list, tuple, set, frozenset)):
+            wanted_values = wanted
+        else:
+            wanted_values = (wanted,)
+        ids = set()
+        for value in wanted_values:
+            if _is_pattern(value):
+                for indexed, indexed_ids in by_value.items():
+                    if isinstance(indexed, str) and fnmatchcase(indexed, value):
+                        ids |= indexed_ids
+            else:
+                ids |= by_value.get(value, set())
+        return ids
+
+
+def query(
+    model_state,
+    entity_type,
+    name=None,
+    application=None,
+    machine=None,
+    where=None,
+    fields=None,
+):
+    """Return the data of the live entities of ``entity_type`` which match
+    all of the given filters, sorted by entity id.
+
+    :param model_state: The :class:`juju.model.ModelState` to query.
+    :param str entity_type: The entity type, e.g. 'unit'.
+    :param name: Id, glob pattern, or list of either, that the entity id
+        must match.
+    :param application: Name, glob pattern, or list of either, that the
+        application of the entity must match. Applies to applications and
+        units.
+    :param machine: Id, glob pattern, or list of either, that the machine
+        of the entity must match. Applies to machines and units.
+    :param dict where: Map of dotted field names to the value, glob pattern,
+        or list of either, that the field must match, e.g.
+        ``{"workload-status.current": "error"}``.
+    :param fields: Optional list of dotted field names to return for each
+        entity. Each result is then a dict of these fields, plus the entity
+        id under "id". By default, the full data dicts of the entities are
+        returned; they are shared with the model state, so they must not be
+        modified.
+    :return list: The matching entities, as dicts.
+
+    """
+    where = dict(where or {})
+    if application is not None:
+        field = _APPLICATION_FIELDS.get(entity_type)
+        if field is None:
+            return []
+        where[field] = application
+    if machine is not None:
+        field = _MACHINE_FIELDS.get(entity_type)
+        if field is None:
+            return []
+        where[field] = machine
+
+    entities = model_state.state.get(entity_type, {})
+    candidates = None
+    scan = {}
+    for field, wanted in where.items():
+        ids = model_state.index.lookup(entity_type, field, wanted)
+        if ids is None:
+            scan[field] = wanted
+        elif candidates is None:
+            candidates = set(ids)
+        else:
+            candidates &= ids
+    if candidates is None:
+        candidates = entities.keys()
+
+    results = []
+    for entity_id in sorted(candidates):
+        history = entities.get(entity_id)
+        if not history or history[-1] is None:
+            continue
+        if name is not None and not _matches(entity_id, name):
+            continue
+        data = history[-1]
+        if not all(_matches(get_field(data, f), w) for f, w in scan.items()):
+            continue
+        if fields is None:
+            results.append(data)
+        else:
+            result = {"id": entity_id}
+            for field in fields:
+                result[field] = get_field(data, field)
+            results.append(result)
+    return results
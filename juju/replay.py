@@ -0,0 +1,185 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""Recording and replay of the AllWatcher deltas of a model.
+
+A recording is a JSONL file with one record per line. Each record has a
+"type" and a "time", in seconds since the recording started:
+
+- "next" records hold the raw "deltas" of one ``AllWatcher.Next`` result,
+  as [entity, type, data] lists.
+- "rpc" records hold the "request" and "response" of one RPC, if RPC
+  traffic was recorded too. The params and response of ``Admin`` calls,
+  e.g. the credentials and macaroons of ``Admin.Login``, are redacted.
+
+Replaying a recording applies the deltas to a model without a controller,
+exactly as the watcher of a connected model would, which makes production
+sized watcher loads reproducible in tests and benchmarks.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from . import jasyncio
+from .client import client
+
+log = logging.getLogger(__name__)
+
+
+_REDACTED = "<redacted>"
+
+
+def _dumps(record):
+    return json.dumps(record, separators=(",", ":"))
+
+
+class DeltaRecorder:
+    """Records the raw AllWatcher results received by a connected model,
+    and optionally all of its RPC traffic, to a JSONL file.
+
+    Use it as a context manager, or call :meth:`start` and :meth:`stop`::
+
+        with DeltaRecorder(model, "deltas.jsonl"):
+            await model.wait_for_idle()
+
+    """
+
+    def __init__(self, model, path, rpc=False):
+        """:param model: The :class:`juju.model.Model` to record.
+        :param path: The file to write the recording to. It is overwritten.
+        :param bool rpc: Whether to record all RPC traffic of the model
+            connection as well. Requires the model to be connected.
+        """
+        self.model = model
+        self.path = Path(path)
+        self.rpc = rpc
+        self.batches = 0
+        self.rpcs = 0
+        self._file = None
+        self._started = None
+        self._connection = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        if self._file is not None:
+            return
+        self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+        self._started = time.monotonic()
+        self.model._delta_recorder = self
+        if self.rpc:
+            self._connection = self.model.connection()
+            self._connection.recorder = self
+
+    def stop(self):
+        if self._file is None:
+            return
+        if self.model._delta_recorder is self:
+            self.model._delta_recorder = None
+        if self._connection is not None and self._connection.recorder is self:
+            self._connection.recorder = None
+        self._connection = None
+        self._file.close()
+        self._file = None
+
+    def _write(self, record):
+        record["time"] = round(time.monotonic() - self._started, 6)
+        self._file.write(_dumps(record))
+        self._file.write("\n")
+
+    def record_deltas(self, deltas):
+        """Record the deltas of one ``AllWatcher.Next`` result."""
+        if self._file is None:
+            return
+        self._write({"type": "next", "deltas": [d.deltas for d in deltas]})
+        self.batches += 1
+
+    def record_rpc(self, request, response):
+        """Record one RPC. The params and response of ``Admin`` calls,
+        which hold credentials and macaroons, are redacted.
+
+        :param str request: The request, as sent over the websocket.
+        :param dict response: The decoded response.
+        """
+        if self._file is None:
+            return
+        request = json.loads(request)
+        if request.get("type") == "Admin":
+            request["params"] = _REDACTED
+            if response and "response" in response:
+                response = {**response, "response": _REDACTED}
+        self._write({
+            "type": "rpc",
+            "request": request,
+            "response": response,
+        })
+        self.rpcs += 1
+
+
+def write_recording(path, batches):
+    """Write a recording of the given batches of raw deltas, e.g. to save a
+    synthetic stream.
+
+    :param path: The file to write.
+    :param batches: Iterable of lists of [entity, type, data] deltas.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for batch in batches:
+            f.write(_dumps({"type": "next", "time": 0, "deltas": batch}))
+            f.write("\n")
+
+
+class DeltaReplay:
+    """Replays a recording made by :class:`DeltaRecorder` into a model."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def records(self, record_type=None):
+        """Yield the records of the recording, optionally only those of
+        ``record_type``.
+        """
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record_type is None or record["type"] == record_type:
+                    yield record
+
+    def batches(self):
+        """Yield each recorded ``AllWatcher.Next`` result as a list of
+        :class:`juju.client.overrides.Delta`, with its time.
+        """
+        for record in self.records("next"):
+            yield record["time"], [client.Delta(d) for d in record["deltas"]]
+
+    async def replay(self, model, speed=None):
+        """Apply the recorded deltas to ``model``, which doesn't need to be
+        connected, as its watcher would.
+
+        :param model: The :class:`juju.model.Model` to feed.
+        :param float speed: Replay the batches at ``speed`` times the
+            recorded pace. By default, batches are applied back to back.
+        :return int: The number of batches applied.
+
+        """
+        count = 0
+        previous = None
+        for at, deltas in self.batches():
+            if speed and previous is not None and at > previous:
+                await jasyncio.sleep((at - previous) / speed)
+            previous = at
+            await model._apply_deltas(deltas)
+            model._watch_received.set()
+            count += 1
+        return count
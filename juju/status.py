@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
 import warnings
 
 if sys.version_info >= (3, 11):
@@ -11,6 +12,7 @@ if sys.version_info >= (3, 11):
 else:
     from backports.strenum import StrEnum
 
+from . import jasyncio
 from .client import client
 
 log = logging.getLogger(__name__)
@@ -67,6 +69,100 @@ def derive_status(statuses: list[str | StatusStr]) -> StatusStr:
     return current
 
 
+class StatusCache:
+    """Shares FullStatus results between the callers of a model.
+
+    Concurrent requests for the same patterns are served by a single
+    in-flight FullStatus call, and results are reused for ``ttl`` seconds.
+    With the default ``ttl`` of 0, results are never reused once the call
+    has completed, but concurrent callers still share one call.
+
+    A result is only kept for as long as it may be reused, i.e. ``ttl``
+    seconds, or the ``max_age`` of the call which fetched it if that is
+    longer, and expired results are dropped on the next lookup.
+
+    The returned FullStatus objects are shared, so callers must not modify
+    them.
+    """
+
+    def __init__(self, model, ttl: float = 0):
+        self.model = model
+        self.ttl = ttl
+        self._results = {}
+        self._in_flight = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _key(patterns):
+        if patterns is None:
+            return None
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        return tuple(sorted(patterns))
+
+    async def get(self, patterns=None, max_age: float | None = None):
+        """Return the FullStatus of the model.
+
+        :param patterns: Optional list of applications, units, or machines
+            to include, which can use wildcards ('*').
+        :param float max_age: Maximum age, in seconds, of a cached result
+            that may be returned. Defaults to the ``ttl`` of the cache.
+        """
+        key = self._key(patterns)
+        max_age = self.ttl if max_age is None else max_age
+        now = time.monotonic()
+        for k, (stored, _, keep) in list(self._results.items()):
+            if now - stored >= keep:
+                del self._results[k]
+        cached = self._results.get(key)
+        if cached is not None and now - cached[0] < max_age:
+            self.hits += 1
+            return cached[1]
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            keep = max(self.ttl, max_age)
+            in_flight = jasyncio.ensure_future(
+                self._fetch(key, patterns, keep, self._generation)
+            )
+            # Don't let an error go unretrieved if every caller has gone away
+            in_flight.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._in_flight[key] = in_flight
+        # Shielded so that a cancelled caller doesn't fail the other callers
+        return await jasyncio.shield(in_flight)
+
+    async def _fetch(self, key, patterns, keep, generation):
+        started = time.monotonic()
+        try:
+            client_facade = client.ClientFacade.from_connection(self.model.connection())
+            result = await client_facade.FullStatus(patterns=patterns)
+            # a result fetched before an invalidation may be stale already
+            if keep > 0 and generation == self._generation:
+                self._results[key] = (started, result, keep)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    def invalidate(self):
+        """Discard all cached results, and those of the calls in flight."""
+        self._generation += 1
+        self._results.clear()
+
+    def stats(self):
+        """Return a dict of the cache metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
 async def formatted_status(model, target=None, raw=False, filters=None):
     """Returns a string that mimics the content of the information
     returned in the juju status command. If the raw parameter is
@@ -88,8 +184,7 @@ async def formatted_status(model, target=None, raw=False, filters=None):
         DeprecationWarning,
         stacklevel=2,
     )
-    client_facade = client.ClientFacade.from_connection(model.connection())
-    result_status = await client_facade.FullStatus(patterns=filters)
+    result_status = await model.get_status(filters=filters)
 
     if raw:
         result_str = str(result_status)
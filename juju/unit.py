@@ -376,9 +376,7 @@ class Unit(model.ModelEntity):
         unit_parts = self.name.split("/")
         app = unit_parts[0]
 
-        client_facade = client.ClientFacade.from_connection(self.connection)
-
-        status = await client_facade.FullStatus(patterns=None)
+        status = await self.model.get_status()
         # FullStatus may be more up to date than our model, and the
         # unit may have gone away, or we may be doing something silly,
         # like trying to fetch leadership for a subordinate, which
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import copy
+import functools
 import os
 import textwrap
 import zipfile
@@ -138,6 +140,31 @@ async def block_until(*conditions, timeout=None, wait_period=0.5):
     await asyncio.shield(asyncio.wait_for(_block(), timeout))
 
 
+async def block_until_notified(*conditions, event, timeout=None, recheck_period=None):
+    """Return only after all conditions are true.
+
+    Unlike :func:`block_until`, the conditions are not polled: they are
+    checked once, and then again each time ``event`` is set (the event is
+    cleared before each check). If ``recheck_period`` is given, they are
+    also checked at least that often, as a safety net.
+
+    If a timeout occurs, it cancels the task and raises
+    asyncio.TimeoutError.
+    """
+
+    async def _block():
+        while True:
+            event.clear()
+            if all(c() for c in conditions):
+                return
+            try:
+                await asyncio.wait_for(event.wait(), recheck_period)
+            except asyncio.TimeoutError:
+                pass
+
+    await asyncio.shield(asyncio.wait_for(_block(), timeout))
+
+
 async def block_until_with_coroutine(
     condition_coroutine, timeout=None, wait_period=0.5
 ):
@@ -161,15 +188,17 @@ async def wait_for_bundle(model, bundle: str | Path, **kwargs) -> None:
 
         await model.wait_for_idle(app_names, **kwargs)
     """
+    content: dict[str, Any] | None = None
     try:
         bundle_path = Path(bundle)
         if bundle_path.is_file():
-            bundle = bundle_path.read_text()
+            content = load_yaml_file(bundle_path)
         elif (bundle_path / "bundle.yaml").is_file():
-            bundle = bundle_path / "bundle.yaml"
+            content = load_yaml_file(bundle_path / "bundle.yaml")
     except OSError:
         pass
-    content: dict[str, Any] = yaml.safe_load(textwrap.dedent(bundle).strip())
+    if content is None:
+        content = yaml_load(textwrap.dedent(bundle).strip())
     apps = list(content.get("applications", content.get("services")).keys())
     await model.wait_for_idle(apps, **kwargs)
 
@@ -258,6 +287,69 @@ def generate_user_controller_access_token(
     return base64.urlsafe_b64encode(registration_string)
 
 
+# The libyaml based loaders and dumper, much faster than the pure Python
+# ones, if PyYAML was built with libyaml
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_FullLoader = getattr(yaml, "CFullLoader", yaml.FullLoader)
+_Dumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def yaml_load(stream, full=False):
+    """Parse the first YAML document of ``stream``, with the libyaml loader
+    if available.
+
+    :param stream: A string, bytes, or file object.
+    :param bool full: Use the full loader instead of the safe one.
+    """
+    return yaml.load(stream, Loader=_FullLoader if full else _SafeLoader)
+
+
+def yaml_load_all(stream):
+    """Parse all the YAML documents of ``stream`` into a list, with the
+    libyaml safe loader if available.
+    """
+    return list(yaml.load_all(stream, Loader=_SafeLoader))
+
+
+def yaml_dump(data, **kwargs):
+    """Serialize ``data`` as ``yaml.dump`` does, with the libyaml dumper if
+    available.
+    """
+    return yaml.dump(data, Dumper=_Dumper, **kwargs)
+
+
+@functools.lru_cache(maxsize=256)
+def _load_yaml_file(path, member, all_documents, full, mtime_ns, size):
+    if member is not None:
+        with zipfile.ZipFile(path, "r") as charm_file:
+            content = charm_file.read(member)
+    else:
+        content = Path(path).read_bytes()
+    if all_documents:
+        return yaml_load_all(content)
+    return yaml_load(content, full=full)
+
+
+def load_yaml_file(path, member=None, all_documents=False, full=False):
+    """Parse a YAML file, or a member of a zip archive, like a charm.
+
+    Parsed files are remembered by path, modification time and size, so
+    files which haven't changed aren't parsed again. A copy of the data is
+    returned each time, so callers are free to modify it.
+
+    :param path: Path of the file.
+    :param str member: Name of the YAML file in the zip archive at ``path``.
+    :param bool all_documents: Return the list of all the documents of the
+        file, instead of the first one.
+    :param bool full: Use the full loader instead of the safe one.
+    :raises: OSError if the file can't be read.
+    """
+    path = os.path.abspath(path)
+    s = os.stat(path)
+    data = _load_yaml_file(path, member, all_documents, full, s.st_mtime_ns, s.st_size)
+    return copy.deepcopy(data)
+
+
 def get_local_charm_data(path, yaml_file):
     """Retrieve Metadata of a Charm from its path.
 
@@ -270,16 +362,12 @@ def get_local_charm_data(path, yaml_file):
     :return: Object of charm metadata
     """
     if str(path).endswith(".charm"):
-        with zipfile.ZipFile(str(path), "r") as charm_file:
-            metadata = yaml.load(charm_file.read(yaml_file), Loader=yaml.FullLoader)
-    else:
-        entity_path = Path(path)
-        metadata_path = entity_path / yaml_file
-        if not metadata_path.exists():
-            return {}
-        metadata = yaml.load(metadata_path.read_text(), Loader=yaml.FullLoader)
+        return load_yaml_file(path, member=yaml_file, full=True)
 
-    return metadata
+    metadata_path = Path(path) / yaml_file
+    if not metadata_path.exists():
+        return {}
+    return load_yaml_file(metadata_path, full=True)
 
 
 def get_local_charm_metadata(path):
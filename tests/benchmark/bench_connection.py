@@ -0,0 +1,104 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""End-to-end benchmarks of Connection and Model against the fake
+controller in tests/fake_controller.py, with no network needed.
+
+Run from the root of the repository with e.g.::
+
+    python -m tests.benchmark.bench_connection --models 20 --latency 0.005
+"""
+
+import argparse
+import time
+
+from juju import jasyncio, utils
+from juju.client import client
+from juju.model import Model
+from tests.benchmark.bench_watcher import synthetic_batches
+from tests.fake_controller import FakeController
+
+
+async def bench_connect(fake, models):
+    start = time.perf_counter()
+    connected = await jasyncio.gather(*(_connect(fake) for _ in range(models)))
+    elapsed = time.perf_counter() - start
+    return connected, f"connect: {models} models in {elapsed:.3f}s"
+
+
+async def _connect(fake):
+    model = Model()
+    await model.connect(**fake.connect_params())
+    return model
+
+
+async def bench_rpc(model, calls):
+    pinger = client.PingerFacade.from_connection(model.connection())
+    start = time.perf_counter()
+    await jasyncio.gather(*(pinger.Ping() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    return f"rpc: {calls} concurrent pings in {elapsed:.3f}s ({calls / elapsed:.0f}/s)"
+
+
+async def bench_deltas(fake, models, batches):
+    expected = {d[2]["name"] for d in batches[0] if d[0] == "unit"}
+    start = time.perf_counter()
+    for batch in batches:
+        fake.push(batch)
+    await jasyncio.gather(
+        *(
+            utils.block_until(
+                lambda m=m: len(m.state.state.get("unit", {})) == len(expected)
+            )
+            for m in models
+        )
+    )
+    elapsed = time.perf_counter() - start
+    n = sum(len(b) for b in batches)
+    return f"deltas: {n} deltas to {len(models)} models in {elapsed:.3f}s"
+
+
+async def bench_reconnect_storm(fake, models, storms):
+    start = time.perf_counter()
+    for _ in range(storms):
+        watch_alls = fake.requests["Client.WatchAll"]
+        await fake.drop_connections()
+        await utils.block_until(
+            lambda w=watch_alls: fake.requests["Client.WatchAll"] >= w + len(models),
+            timeout=60,
+        )
+    elapsed = time.perf_counter() - start
+    return (
+        f"reconnect: {storms} storms of {len(models)} connections "
+        f"in {elapsed:.3f}s ({fake.logins} logins in total)"
+    )
+
+
+async def main(args):
+    fake = FakeController(
+        latency=args.latency, jitter=args.jitter, drop_rate=args.drop_rate, seed=0
+    )
+    async with fake:
+        models, result = await bench_connect(fake, args.models)
+        print(result)
+        print(await bench_rpc(models[0], args.calls))
+        print(
+            await bench_deltas(
+                fake, models, synthetic_batches(units=args.units, changes=10)
+            )
+        )
+        print(await bench_reconnect_storm(fake, models, args.storms))
+        for model in models:
+            await model.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--units", type=int, default=1000)
+    parser.add_argument("--storms", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--drop-rate", type=float, default=0)
+    jasyncio.run(main(parser.parse_args()))
@@ -0,0 +1,164 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""End-to-end latency of Model.deploy of a charmhub charm, and of
+Model.deploy_many of several, against the fake controller in
+tests/fake_controller.py and a fake charmhub, both with the same injected
+round trip time.
+
+Run from the root of the repository with e.g.::
+
+    python -m tests.benchmark.bench_deploy --deploys 10 --latency 0.02
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from juju import jasyncio
+from juju.model import Model
+from tests.benchmark.bench_watcher import _status
+from tests.fake_controller import FakeController
+
+
+def _charmhub(latency):
+    """Start a fake charmhub answering every charm info request after
+    ``latency`` seconds, and return its server.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def get(self):
+            time.sleep(latency)
+            body = json.dumps({
+                "id": "charm-id",
+                "name": "charm",
+                "default-release": {"revision": {"subordinate": False}},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = get
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _serve_deploys(fake, charmhub_url):
+    fake.handle(
+        "ModelConfig",
+        "ModelGet",
+        lambda params: {
+            "config": {
+                "default-base": {"source": "default", "value": ""},
+                "charmhub-url": {"source": "default", "value": charmhub_url},
+            }
+        },
+    )
+    fake.handle("ModelConfig", "GetModelConstraints", lambda params: {})
+
+    def origin(name):
+        return {
+            "source": "charm-hub",
+            "type": "charm",
+            "id": f"{name}-id",
+            "risk": "stable",
+            "track": "latest",
+            "revision": 1,
+            "architecture": "amd64",
+            "base": {"name": "ubuntu", "channel": "22.04"},
+        }
+
+    def resolve(params):
+        return {
+            "results": [
+                {
+                    "url": f"ch:amd64/jammy/{r['reference'][3:]}-1",
+                    "charm-origin": origin(r["reference"][3:]),
+                    "supported-series": ["jammy"],
+                }
+                for r in params["resolve"]
+            ]
+        }
+
+    def add_charm(params):
+        return {"charm-origin": params["charm-origin"]}
+
+    def deploy(params):
+        for arg in params["Args"]:
+            fake.push([
+                [
+                    "application",
+                    "change",
+                    {
+                        "name": arg["ApplicationName"],
+                        "model-uuid": fake.model_uuid,
+                        "life": "alive",
+                        "status": _status("waiting"),
+                    },
+                ]
+            ])
+        return {"results": [{} for _ in params["Args"]]}
+
+    fake.handle("Charms", "ResolveCharms", resolve)
+    fake.handle("Charms", "AddCharm", add_charm)
+    fake.handle("Application", "DeployFromRepository", deploy)
+
+
+async def bench_deploy(model, deploys):
+    latencies = []
+    for i in range(deploys):
+        start = time.perf_counter()
+        await model.deploy(f"ch:charm-{i}")
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return (
+        f"deploy: {deploys} charms, "
+        f"median {latencies[len(latencies) // 2] * 1e3:.1f}ms, "
+        f"max {latencies[-1] * 1e3:.1f}ms"
+    )
+
+
+async def bench_deploy_many(model, deploys):
+    start = time.perf_counter()
+    results = await model.deploy_many([
+        {"entity_url": f"ch:many-{i}"} for i in range(deploys)
+    ])
+    elapsed = time.perf_counter() - start
+    errors = [r for r in results if isinstance(r, Exception)]
+    return (
+        f"deploy_many: {deploys} charms in {elapsed * 1e3:.1f}ms, {len(errors)} errors"
+    )
+
+
+async def main(args):
+    charmhub = _charmhub(args.latency)
+    try:
+        async with FakeController(latency=args.latency) as fake:
+            _serve_deploys(fake, f"http://127.0.0.1:{charmhub.server_port}")
+            model = Model(config_ttl=args.config_ttl)
+            await model.connect(**fake.connect_params())
+            try:
+                print(await bench_deploy(model, args.deploys))
+                print(await bench_deploy_many(model, args.deploys))
+                print(f"requests: {dict(fake.requests)}")
+            finally:
+                await model.disconnect()
+    finally:
+        charmhub.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deploys", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--config-ttl", type=float, default=0)
+    jasyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""Microbenchmark of ModelEntity attribute access.
+
+Run from the root of the repository with::
+
+    python -m tests.benchmark.bench_entity
+"""
+
+import argparse
+import timeit
+
+from juju import jasyncio
+from juju.client.client import Delta
+from juju.model import Model
+from tests.benchmark.bench_watcher import synthetic_batches
+
+CASES = {
+    "data key (unit.name)": lambda unit, app: unit.name,
+    "dashed key (unit.machine_id)": lambda unit, app: unit.machine_id,
+    "property (unit.workload_status)": lambda unit, app: unit.workload_status,
+    "property (unit.agent_status)": lambda unit, app: unit.agent_status,
+    "entity_type": lambda unit, app: unit.entity_type,
+    "dead": lambda unit, app: unit.dead,
+    "app.status": lambda unit, app: app.status,
+}
+
+
+async def _model(units):
+    model = Model()
+    for batch in synthetic_batches(units=units, applications=1, changes=0):
+        await model._apply_deltas([Delta(d) for d in batch])
+    return model
+
+
+def main(args):
+    model = jasyncio.run(_model(args.units))
+    unit = model.units["app-0/0"]
+    app = model.applications["app-0"]
+    for name, case in CASES.items():
+        seconds = min(
+            timeit.repeat(lambda c=case: c(unit, app), number=args.number, repeat=5)
+        )
+        print(f"{name}: {seconds / args.number * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=100)
+    parser.add_argument("--number", type=int, default=100000)
+    main(parser.parse_args())
@@ -0,0 +1,165 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""Benchmarks of the model watcher, over a synthetic stream or a recording
+made with :class:`juju.replay.DeltaRecorder`. No controller is needed.
+
+Run from the root of the repository with e.g.::
+
+    python -m tests.benchmark.bench_watcher --units 10000
+    python -m tests.benchmark.bench_watcher --recording deltas.jsonl
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from juju import jasyncio
+from juju.client.client import Delta
+from juju.model import Model
+from juju.replay import DeltaReplay
+
+
+def _status(current):
+    return {"current": current, "message": "", "since": "2023-01-01T00:00:00Z"}
+
+
+def synthetic_batches(units=10000, applications=100, changes=100, batch_size=100):
+    """Return the batches of a synthetic stream: one batch adding
+    ``units`` units spread over ``applications`` applications and one
+    machine each, followed by ``changes`` batches of unit status changes.
+    """
+    initial = [
+        ["model", "change", {"model-uuid": "uuid", "name": "bench", "config": {}}]
+    ]
+    for a in range(applications):
+        initial.append([
+            "application",
+            "change",
+            {"name": f"app-{a}", "life": "alive", "status": _status("active")},
+        ])
+    for u in range(units):
+        app = f"app-{u % applications}"
+        initial.append(["machine", "change", {"id": str(u), **_machine()}])
+        initial.append(["unit", "change", _unit(app, u, "active")])
+    batches = [initial]
+    for c in range(changes):
+        batch = []
+        for i in range(batch_size):
+            u = (c * batch_size + i) % units
+            current = "maintenance" if c % 2 == 0 else "active"
+            batch.append([
+                "unit",
+                "change",
+                _unit(f"app-{u % applications}", u, current),
+            ])
+        batches.append(batch)
+    return batches
+
+
+def _machine():
+    return {"agent-status": _status("started"), "instance-status": _status("running")}
+
+
+def _unit(app, u, workload):
+    return {
+        "name": f"{app}/{u}",
+        "application": app,
+        "machine-id": str(u),
+        "subordinate": False,
+        "workload-status": _status(workload),
+        "agent-status": _status("idle"),
+    }
+
+
+def _deltas(batches):
+    return [[Delta(d) for d in batch] for batch in batches]
+
+
+async def _apply(model, batches):
+    for deltas in batches:
+        await model._apply_deltas(deltas)
+
+
+async def bench_apply(batches):
+    model = Model()
+    n = sum(len(b) for b in batches)
+    batches = _deltas(batches)
+    start = time.perf_counter()
+    await _apply(model, batches)
+    elapsed = time.perf_counter() - start
+    return f"apply: {n} deltas in {elapsed:.3f}s ({n / elapsed:.0f} deltas/s)"
+
+
+async def bench_dispatch(batches, observers=10):
+    model = Model()
+    await _apply(model, _deltas(batches[:1]))
+    calls = 0
+
+    async def on_change(delta, old, new, model):
+        nonlocal calls
+        calls += 1
+
+    for i in range(observers):
+        queue_size = 1000 if i % 2 else None
+        model.add_observer(on_change, entity_type="unit", queue_size=queue_size)
+    changes = _deltas(batches[1:])
+    expected = sum(len(b) for b in changes) * observers
+    start = time.perf_counter()
+    await _apply(model, changes)
+    while calls < expected:
+        await jasyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    await model.disconnect()
+    return (
+        f"dispatch: {calls} calls to {observers} observers in {elapsed:.3f}s "
+        f"({calls / elapsed:.0f} calls/s)"
+    )
+
+
+async def bench_wait_for_idle(batches):
+    model = Model()
+    await _apply(model, _deltas(batches))
+    start = time.perf_counter()
+    await model.wait_for_idle(idle_period=0, check_freq=0, raise_on_error=False)
+    elapsed = time.perf_counter() - start
+    return f"wait_for_idle: one evaluation in {elapsed:.3f}s"
+
+
+async def bench_memory(batches):
+    tracemalloc.start()
+    model = Model()
+    await _apply(model, _deltas(batches))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    entities = sum(len(e) for e in model.state.state.values())
+    return (
+        f"memory: {current / 2**20:.1f} MiB for {entities} entities "
+        f"(peak {peak / 2**20:.1f} MiB)"
+    )
+
+
+async def main(args):
+    if args.recording:
+        batches = [
+            record["deltas"] for record in DeltaReplay(args.recording).records("next")
+        ]
+    else:
+        batches = synthetic_batches(
+            units=args.units,
+            applications=args.applications,
+            changes=args.changes,
+            batch_size=args.batch_size,
+        )
+    for bench in (bench_apply, bench_dispatch, bench_wait_for_idle, bench_memory):
+        print(await bench(batches))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recording", help="JSONL recording to replay")
+    parser.add_argument("--units", type=int, default=10000)
+    parser.add_argument("--applications", type=int, default=100)
+    parser.add_argument("--changes", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=100)
+    jasyncio.run(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""Benchmark of the YAML handling of a large bundle.
+
+Compares the pure Python loader and dumper of PyYAML with the helpers of
+:mod:`juju.utils`, which use libyaml when available and remember parsed
+files. Run from the root of the repository with::
+
+    python -m tests.benchmark.bench_yaml --applications 200
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+
+import yaml
+
+from juju import utils
+
+
+def synthetic_bundle(applications):
+    """Return a bundle of ``applications`` applications, related in pairs."""
+    return {
+        "series": "jammy",
+        "applications": {
+            f"app-{i}": {
+                "charm": f"ch:charm-{i % 20}",
+                "channel": "latest/stable",
+                "num_units": 3,
+                "to": [str(i), str(i + 1), str(i + 2)],
+                "constraints": "arch=amd64 mem=4G cores=2",
+                "options": {f"option-{j}": f"value-{j}" for j in range(10)},
+                "annotations": {"gui-x": str(i * 10), "gui-y": "0"},
+            }
+            for i in range(applications)
+        },
+        "machines": {str(i): {"series": "jammy"} for i in range(applications + 2)},
+        "relations": [
+            [f"app-{i}:db", f"app-{i + 1}:db"] for i in range(0, applications - 1, 2)
+        ],
+    }
+
+
+def _time(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def main(args):
+    bundle = synthetic_bundle(args.applications)
+    text = yaml.dump(bundle)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "bundle.yaml")
+        path.write_text(text)
+        cases = {
+            "yaml.safe_load": lambda: yaml.safe_load(text),
+            "utils.yaml_load": lambda: utils.yaml_load(text),
+            "utils.load_yaml_file (unchanged file)": lambda: utils.load_yaml_file(path),
+            "yaml.dump": lambda: yaml.dump(bundle),
+            "utils.yaml_dump": lambda: utils.yaml_dump(bundle),
+        }
+        print(f"{args.applications} applications, {len(text)} bytes of YAML")
+        print(f"libyaml: {yaml.__with_libyaml__}")
+        for name, case in cases.items():
+            print(f"{name}: {_time(case, args.number) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, default=200)
+    parser.add_argument("--number", type=int, default=5)
+    main(parser.parse_args())
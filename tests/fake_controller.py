@@ -0,0 +1,358 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""An in-process stand-in for a Juju controller, for tests and benchmarks
+which need a real websocket connection but no real controller.
+
+It speaks the Juju RPC framing over TLS with a self-signed certificate, and
+serves a single model:
+
+- Admin.Login accepts any credentials and advertises every facade the
+  client knows.
+- Pinger.Ping, ModelConfig.ModelGet and ModelManager.ModelInfo answer
+  from fixed data.
+- Client.WatchAll, AllWatcher.Next and AllWatcher.Stop serve the deltas
+  pushed with :meth:`FakeController.push`. The first Next of a watcher
+  returns the whole current state, as with a real controller.
+- Client.FullStatus returns the ``full_status`` fixture.
+
+Any other request can be served by registering a handler with
+:meth:`FakeController.handle`. Latency, jitter and dropped connections can
+be injected to exercise the client under adverse conditions::
+
+    async with FakeController(latency=0.01, drop_rate=0.001) as fake:
+        model = Model()
+        await model.connect(**fake.connect_params())
+        fake.push([["application", "change", {"name": "app", ...}]])
+"""
+
+import collections
+import datetime
+import inspect
+import json
+import random
+import ssl
+import tempfile
+import uuid
+from pathlib import Path
+
+import websockets
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from juju import jasyncio
+from juju.client.facade_versions import client_facade_versions
+from juju.client.overrides import Delta
+
+SERVER_VERSION = "3.6.0"
+
+
+class FakeAPIError(Exception):
+    """Raised by a handler to answer a request with an error."""
+
+    def __init__(self, message, code=""):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def _self_signed_cert(directory):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "juju-apiserver")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_pem = cert.public_bytes(serialization.Encoding.PEM)
+    cert_path = Path(directory, "cert.pem")
+    key_path = Path(directory, "key.pem")
+    cert_path.write_bytes(cert_pem)
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return cert_pem.decode(), cert_path, key_path
+
+
+class _Watcher:
+    def __init__(self, position):
+        self.position = position
+        self.initial = True
+        self.stopped = False
+
+
+class FakeController:
+    """A fake Juju controller serving one model over a local websocket.
+
+    :param deltas: Optional batches of raw [entity, type, data] deltas which
+        make up the initial state of the model.
+    :param full_status: The raw FullStatus returned by Client.FullStatus.
+    :param float latency: Seconds to wait before answering each request.
+    :param float jitter: Up to this many extra seconds, at random, to wait
+        before answering each request.
+    :param float drop_rate: Probability of dropping the connection instead
+        of answering a request, other than Admin.Login.
+    :param seed: Seed of the random numbers used for jitter and drops.
+    """
+
+    def __init__(
+        self,
+        deltas=None,
+        full_status=None,
+        latency=0,
+        jitter=0,
+        drop_rate=0,
+        seed=None,
+        model_name="fake",
+    ):
+        self.model_uuid = str(uuid.uuid4())
+        self.controller_uuid = str(uuid.uuid4())
+        self.model_name = model_name
+        self.full_status = full_status or self._default_full_status()
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.requests = collections.Counter()
+        self.logins = 0
+        self.drops = 0
+        self.cacert = None
+        self.port = None
+        self._server = None
+        self._tmpdir = None
+        self._connections = set()
+        self._state = {}
+        self._log = []
+        self._changed = jasyncio.Event()
+        self._watchers = {}
+        self._watcher_ids = iter(range(1, 2**31))
+        self._handlers = {
+            ("Admin", "Login"): self._login,
+            ("Pinger", "Ping"): lambda params: {},
+            ("ModelConfig", "ModelGet"): lambda params: {"config": {}},
+            ("ModelManager", "ModelInfo"): self._model_info,
+            ("Client", "WatchAll"): self._watch_all,
+            ("Client", "FullStatus"): lambda params: self.full_status,
+        }
+        for batch in deltas or []:
+            self.push(batch)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.cacert, cert_path, key_path = _self_signed_cert(self._tmpdir.name)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        self._server = await websockets.serve(self._serve, "127.0.0.1", 0, ssl=context)
+        self.port = list(self._server.sockets)[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    @property
+    def endpoint(self):
+        return f"127.0.0.1:{self.port}"
+
+    def connect_params(self):
+        """Return the keyword arguments for :meth:`juju.model.Model.connect`."""
+        return {
+            "endpoint": self.endpoint,
+            "uuid": self.model_uuid,
+            "username": "admin",
+            "password": "password",
+            "cacert": self.cacert,
+            "retry_backoff": 0.1,
+        }
+
+    def handle(self, facade, request, handler):
+        """Serve ``facade.request`` with ``handler``, which takes the params
+        of the request and returns the response, or raises
+        :class:`FakeAPIError`. It may be a coroutine function.
+        """
+        self._handlers[facade, request] = handler
+
+    def push(self, batch):
+        """Apply a batch of raw [entity, type, data] deltas to the model,
+        and send it to the watchers.
+        """
+        from juju.delta import get_entity_delta
+
+        batch = [list(delta) for delta in batch]
+        for entity, type_, data in batch:
+            key = (entity, get_entity_delta(Delta([entity, type_, data])).get_id())
+            if type_ == "remove":
+                self._state.pop(key, None)
+            else:
+                self._state[key] = data
+        self._log.append(batch)
+        self._changed.set()
+
+    async def drop_connections(self):
+        """Drop every open connection, e.g. to cause a reconnect storm."""
+        for ws in list(self._connections):
+            self.drops += 1
+            await ws.close()
+
+    def _default_full_status(self):
+        return {
+            "model": {
+                "name": self.model_name,
+                "type": "iaas",
+                "cloud-tag": "cloud-fake",
+                "region": "fake",
+                "version": SERVER_VERSION,
+                "available-version": "",
+                "model-status": {"status": "available"},
+            },
+            "machines": {},
+            "applications": {},
+            "remote-applications": {},
+            "offers": {},
+            "relations": [],
+            "controller-timestamp": "2023-01-01T00:00:00Z",
+            "branches": {},
+        }
+
+    def _login(self, params):
+        self.logins += 1
+        return {
+            "facades": [
+                {"name": name, "versions": list(versions)}
+                for name, versions in client_facade_versions.items()
+            ],
+            "server-version": SERVER_VERSION,
+            "controller-tag": f"controller-{self.controller_uuid}",
+            "model-tag": f"model-{self.model_uuid}",
+            "user-info": {
+                "identity": "user-admin",
+                "controller-access": "superuser",
+                "model-access": "admin",
+            },
+            "servers": [],
+        }
+
+    def _model_info(self, params):
+        return {
+            "results": [
+                {
+                    "result": {
+                        "name": self.model_name,
+                        "uuid": self.model_uuid,
+                        "type": "iaas",
+                        "controller-uuid": self.controller_uuid,
+                        "cloud-tag": "cloud-fake",
+                        "owner-tag": "user-admin",
+                        "life": "alive",
+                        "agent-version": SERVER_VERSION,
+                    }
+                }
+            ]
+        }
+
+    def _watch_all(self, params):
+        watcher_id = str(next(self._watcher_ids))
+        self._watchers[watcher_id] = _Watcher(len(self._log))
+        return {"watcher-id": watcher_id}
+
+    async def _next(self, watcher_id):
+        watcher = self._watchers.get(watcher_id)
+        if watcher is None:
+            raise FakeAPIError(f'unknown watcher id "{watcher_id}"', "not found")
+        if watcher.initial:
+            watcher.initial = False
+            return {
+                "deltas": [
+                    [entity, "change", data]
+                    for (entity, _), data in self._state.items()
+                ]
+            }
+        while watcher.position == len(self._log):
+            if watcher.stopped:
+                raise FakeAPIError("watcher was stopped")
+            self._changed.clear()
+            await self._changed.wait()
+        deltas = [d for batch in self._log[watcher.position :] for d in batch]
+        watcher.position = len(self._log)
+        return {"deltas": deltas}
+
+    def _stop_watcher(self, watcher_id):
+        watcher = self._watchers.pop(watcher_id, None)
+        if watcher is not None:
+            watcher.stopped = True
+            self._changed.set()
+        return {}
+
+    async def _respond(self, ws, msg):
+        key = (msg.get("type"), msg.get("request"))
+        self.requests["{}.{}".format(*key)] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await jasyncio.sleep(delay)
+        if key != ("Admin", "Login") and self.random.random() < self.drop_rate:
+            self.drops += 1
+            await ws.close()
+            return
+
+        reply = {"request-id": msg["request-id"], "response": {}}
+        try:
+            if key == ("AllWatcher", "Next"):
+                response = await self._next(msg.get("Id"))
+            elif key == ("AllWatcher", "Stop"):
+                response = self._stop_watcher(msg.get("Id"))
+            elif key in self._handlers:
+                response = self._handlers[key](msg.get("params", {}))
+                if inspect.isawaitable(response):
+                    response = await response
+            else:
+                raise FakeAPIError(
+                    "no such request - method {}.{} is not implemented".format(*key),
+                    "not implemented",
+                )
+            reply["response"] = response
+        except FakeAPIError as e:
+            reply["error"] = e.message
+            reply["error-code"] = e.code
+        try:
+            await ws.send(json.dumps(reply))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _serve(self, ws, *args):
+        self._connections.add(ws)
+        tasks = set()
+        try:
+            async for message in ws:
+                task = jasyncio.ensure_future(self._respond(ws, json.loads(message)))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(ws)
+            for task in tasks:
+                task.cancel()
@@ -6,10 +6,11 @@ from pathlib import Path
 from unittest import mock
 from unittest.mock import ANY, Mock, patch
 
+import pytest
 import yaml
 from toposort import CircularDependencyError
 
-from juju import charmhub
+from juju import charmhub, jasyncio
 from juju.bundle import (
     AddApplicationChange,
     AddCharmChange,
@@ -17,14 +18,18 @@ from juju.bundle import (
     AddRelationChange,
     AddUnitChange,
     BundleHandler,
+    ChangeInfo,
     ChangeSet,
     ConsumeOfferChange,
     CreateOfferChange,
     ExposeChange,
+    PlanCache,
     ScaleChange,
     SetAnnotationsChange,
 )
 from juju.client import client
+from juju.errors import JujuError
+from juju.url import URL
 
 
 class TestChangeSet(unittest.TestCase):
@@ -418,14 +423,14 @@ class TestAddCharmChangeRun:
 
         model = mock.Mock()
         model._add_charm = mock.AsyncMock(return_value=None)
-        model._resolve_architecture = mock.AsyncMock(return_value=None)
-        model._resolve_charm = mock.AsyncMock(return_value=("entity_id", None))
 
         context = mock.Mock()
 
         context.charms_facade = charms_facade
         context.origins = {}
         context.model = model
+        context._architecture = mock.AsyncMock(return_value=None)
+        context._resolve_charm = mock.AsyncMock(return_value=("entity_id", None))
 
         result = await change.run(context)
         assert result == "entity_id"
@@ -521,6 +526,30 @@ class TestAddMachineChangeRun:
             ]
         )
 
+    async def test_run_batch(self):
+        changes = [
+            AddMachineChange(1, [], params={"series": "jammy"}),
+            AddMachineChange(2, [], params={"series": "jammy"}),
+        ]
+
+        machines = [
+            client.AddMachinesResult(machine="0"),
+            client.AddMachinesResult(error=client.Error(message="no capacity")),
+        ]
+        context = mock.Mock()
+        context.machine_manager_facade.AddMachines = mock.AsyncMock(
+            return_value=client.AddMachinesResults(machines)
+        )
+
+        results = await AddMachineChange.run_batch(changes, context)
+
+        assert results[0] == "0"
+        assert isinstance(results[1], ValueError)
+        assert "no capacity" in str(results[1])
+        context.machine_manager_facade.AddMachines.assert_called_once()
+        params = context.machine_manager_facade.AddMachines.call_args.kwargs["params"]
+        assert len(params) == 2
+
 
 class TestAddRelationChange(unittest.TestCase):
     def test_method(self):
@@ -636,6 +665,38 @@ class TestAddUnitChangeRun:
             count=1, to="to1"
         )
 
+    async def test_run_batch(self):
+        changes = [
+            AddUnitChange(1, [], params={"application": "$deploy-1"}),
+            AddUnitChange(2, [], params={"application": "$deploy-1", "to": "$m"}),
+            AddUnitChange(3, [], params={"application": "$deploy-1"}),
+        ]
+
+        app = mock.Mock()
+        app._facade.return_value.AddUnits = mock.AsyncMock(
+            return_value=client.AddApplicationUnitsResults(units=["app/1", "app/2"])
+        )
+        model = mock.Mock()
+        model.applications = {"app": app}
+        model.units = {"app/0": "unit0"}
+        model._wait_for_new = mock.AsyncMock(side_effect=lambda _, unit: unit)
+
+        context = mock.Mock()
+        context.resolve = {"$deploy-1": "app", "$m": "3", None: None}.get
+        context._units_by_app = {"app": ["app/0"]}
+        context.model = model
+
+        results = await AddUnitChange.run_batch(changes, context)
+
+        # the existing unit is reused, then the placed unit is added first
+        assert results == ["unit0", ["app/1"], ["app/2"]]
+        app._facade.return_value.AddUnits.assert_called_once_with(
+            application="app",
+            placement=[client.Placement(scope="#", directive="3")],
+            num_units=2,
+            attach_storage=[],
+        )
+
 
 class TestCreateOfferChange(unittest.TestCase):
     def test_method(self):
@@ -956,6 +1017,34 @@ class TestSetAnnotationsChangeRun:
         entity.set_annotations.assert_called_once()
         entity.set_annotations.assert_called_with("annotations")
 
+    async def test_run_batch(self):
+        changes = [
+            SetAnnotationsChange(
+                1,
+                [],
+                params={"id": id_, "entity-type": "application", "annotations": {}},
+            )
+            for id_ in ("app1", "app2")
+        ]
+
+        model = mock.Mock()
+        model.state.get_entity = lambda _, id_: mock.Mock(tag=f"application-{id_}")
+
+        context = mock.Mock()
+        context.resolve = lambda ref: ref
+        context.model = model
+        context.ann_facade.Set = mock.AsyncMock(return_value="results")
+
+        results = await SetAnnotationsChange.run_batch(changes, context)
+
+        assert results == ["results", "results"]
+        context.ann_facade.Set.assert_called_once_with(
+            annotations=[
+                client.EntityAnnotations(entity="application-app1", annotations={}),
+                client.EntityAnnotations(entity="application-app2", annotations={}),
+            ]
+        )
+
 
 class TestBundleHandler:
     async def test_fetch_plan_local_k8s_bundle(self):
@@ -1068,3 +1157,321 @@ class TestBundleHandler:
         assert (
             bundle["applications"]["oci-image-charm"]["resources"]["oci-image"] == "id"
         )
+
+
+class _RecordingChange(ChangeInfo):
+    """A change which records when it runs, for the execute_plan tests."""
+
+    _toPy = {"delay": "delay", "fail": "fail"}
+    log = None
+
+    @staticmethod
+    def method():
+        return "record"
+
+    async def run(self, context):
+        self.log.append(("start", self.change_id))
+        context.running += 1
+        context.max_running = max(context.max_running, context.running)
+        try:
+            for r in self.requires:
+                assert r in context.references
+            await jasyncio.sleep(self.delay or 0)
+            if self.fail:
+                raise JujuError(f"{self.change_id} failed")
+        finally:
+            context.running -= 1
+        self.log.append(("end", self.change_id))
+        return f"ref-{self.change_id}"
+
+
+def _mock_model(facades=None):
+    connection = mock.Mock()
+    connection.facades = {
+        "Bundle": 17,
+        "Client": 17,
+        "Application": 17,
+        "Annotations": 17,
+        "MachineManager": 17,
+        **(facades or {}),
+    }
+    model = mock.Mock()
+    model.units = {}
+    model.applications = {}
+    model.connection.return_value = connection
+    return model
+
+
+class TestBundleHandlerExecutePlan:
+    def _handler(self, changes, concurrency=None):
+        handler = BundleHandler(_mock_model(), concurrency=concurrency)
+        handler._resolve_charms = mock.AsyncMock()
+        handler.plan = mock.Mock(changes=changes)
+        handler.change_types = {"record": _RecordingChange}
+        handler.running = handler.max_running = 0
+        _RecordingChange.log = []
+        return handler
+
+    def _change(self, id_, requires=(), **args):
+        return client.BundleChangesMapArgs(
+            id_=id_, requires=list(requires), method="record", args=args
+        )
+
+    async def test_independent_changes_run_concurrently(self):
+        changes = [self._change(c, delay=0.01) for c in "abcd"]
+        changes.append(self._change("e", requires="abcd"))
+        handler = self._handler(changes)
+
+        await handler.execute_plan()
+
+        assert handler.max_running == 4
+        assert _RecordingChange.log[-2:] == [("start", "e"), ("end", "e")]
+        assert handler.references == {c: f"ref-{c}" for c in "abcde"}
+
+    async def test_concurrency_limit(self):
+        changes = [self._change(c, delay=0.01) for c in "abcdef"]
+        handler = self._handler(changes, concurrency=2)
+
+        await handler.execute_plan()
+
+        assert handler.max_running == 2
+        assert len(handler.references) == 6
+
+    async def test_concurrency_one_follows_sorted_order(self):
+        changes = [
+            self._change("a"),
+            self._change("b"),
+            self._change("c", requires=["a", "d"]),
+            self._change("d", requires=["a"]),
+            self._change("e", requires=["a", "d", "c", "b"]),
+        ]
+        handler = self._handler(changes, concurrency=1)
+
+        await handler.execute_plan()
+
+        started = [c for event, c in _RecordingChange.log if event == "start"]
+        assert started == [c.id_ for c in ChangeSet(changes).sorted()]
+
+    async def test_failure_skips_dependents(self):
+        changes = [
+            self._change("a", fail=True),
+            self._change("b", delay=0.02),
+            self._change("c", requires=["a"]),
+            self._change("d", requires=["b"]),
+        ]
+        handler = self._handler(changes)
+
+        with pytest.raises(JujuError, match="a failed"):
+            await handler.execute_plan()
+
+        # b was in flight and finishes; nothing is started after the failure
+        assert ("end", "b") in _RecordingChange.log
+        assert ("start", "c") not in _RecordingChange.log
+        assert ("start", "d") not in _RecordingChange.log
+
+    async def test_first_failure_in_plan_order_is_raised(self):
+        changes = [
+            self._change("a", delay=0.02, fail=True),
+            self._change("b", fail=True),
+        ]
+        handler = self._handler(changes)
+
+        with pytest.raises(JujuError, match="a failed"):
+            await handler.execute_plan()
+
+    async def test_ready_changes_are_batched(self):
+        class BatchedChange(_RecordingChange):
+            batches = []
+
+            def batch_key(self, context):
+                return "batched"
+
+            @classmethod
+            async def run_batch(cls, changes, context):
+                cls.batches.append([c.change_id for c in changes])
+                return [
+                    JujuError("b failed") if c.change_id == "b" else c.change_id
+                    for c in changes
+                ]
+
+        changes = [
+            self._change("a"),
+            self._change("b"),
+            self._change("c"),
+            self._change("d", requires=["a"]),
+            self._change("e", requires=["b"]),
+        ]
+        for change in changes:
+            change.method = "batched"
+        handler = self._handler(changes)
+        handler.change_types["batched"] = BatchedChange
+
+        with pytest.raises(JujuError, match="b failed"):
+            await handler.execute_plan()
+
+        # d is ready once a is applied, e depends on the failed b
+        assert BatchedChange.batches == [["a", "b", "c"]]
+        assert handler.references == {"a": "a", "c": "c"}
+
+
+class TestBundleHandlerResolveCharms:
+    def _handler(self, applications):
+        model = _mock_model({"Charms": 7})
+        model._resolve_architecture = mock.AsyncMock(return_value="amd64")
+
+        async def resolve_charms(charms):
+            return [(URL.parse(f"{url}-resolved"), origin) for url, origin in charms]
+
+        model._resolve_charms = mock.AsyncMock(side_effect=resolve_charms)
+        handler = BundleHandler(model)
+        handler.bundle = {"series": "jammy", "applications": applications}
+        return handler
+
+    async def test_resolves_all_charms_at_once(self):
+        handler = self._handler({
+            "app1": {"charm": "ch:one"},
+            "app2": {"charm": "ch:two", "channel": "edge"},
+            "app3": {"charm": "ch:one"},
+        })
+        existing = mock.Mock(charm_url="ch:old")
+        existing.get_constraints = mock.AsyncMock(return_value={"arch": "arm64"})
+        handler.model.applications = {"app3": existing}
+
+        await handler._resolve_charms()
+
+        handler.model._resolve_architecture.assert_called_once_with()
+        handler.model._resolve_charms.assert_called_once()
+        charms = handler.model._resolve_charms.call_args.args[0]
+        assert [(str(url), origin.architecture) for url, origin in charms] == [
+            ("ch:one", "amd64"),
+            ("ch:two", "amd64"),
+            ("ch:one", "arm64"),
+        ]
+        specs = handler.applications_specs
+        assert specs["app1"]["charm"] == "ch:one-resolved"
+        assert specs["app2"]["charm"] == "ch:two-resolved"
+
+    async def test_add_charm_reuses_resolution(self):
+        handler = self._handler({"app1": {"charm": "ch:one"}})
+        handler.model._add_charm = mock.AsyncMock()
+        await handler._resolve_charms()
+
+        change = AddCharmChange(
+            "addCharm-0", [], params={"charm": "ch:one", "series": "jammy"}
+        )
+        result = await change.run(handler)
+
+        assert result == "ch:one-resolved"
+        handler.model._resolve_architecture.assert_called_once_with()
+        handler.model._resolve_charms.assert_called_once()
+
+
+class TestBundleHandlerPlanCache:
+    def _handler(self, cache, default_series="jammy"):
+        model = _mock_model()
+        model.machines = {}
+        model.info = mock.Mock(
+            agent_version="3.6.0", default_series=default_series, default_base=""
+        )
+        model.connection.return_value.info = {"server-version": "3.6.0"}
+        handler = BundleHandler(model, plan_cache=cache)
+        handler.bundle_facade = mock.Mock()
+        handler.bundle_facade.GetChangesMapArgs = mock.AsyncMock(
+            return_value=client.BundleChangesMapArgsResults.from_json({
+                "changes": [
+                    {
+                        "id": "addCharm-0",
+                        "method": "addCharm",
+                        "args": {"charm": "ch:one"},
+                        "requires": [],
+                    }
+                ]
+            })
+        )
+        return handler
+
+    async def test_plan_is_reused(self, tmp_path):
+        bundle = tmp_path / "bundle.yaml"
+        bundle.write_text("applications:\n  app:\n    charm: ch:one\n")
+        cache = PlanCache()
+
+        first = self._handler(cache)
+        await first.fetch_plan(str(bundle), None)
+        second = self._handler(cache)
+        await second.fetch_plan(str(bundle), None)
+
+        first.bundle_facade.GetChangesMapArgs.assert_awaited_once()
+        second.bundle_facade.GetChangesMapArgs.assert_not_awaited()
+        assert second.plan.changes[0].id_ == "addCharm-0"
+        assert second.plan.changes[0].args == {"charm": "ch:one"}
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+        # a different model default, or bundle, gets its own plan
+        other = self._handler(cache, default_series="focal")
+        await other.fetch_plan(str(bundle), None)
+        other.bundle_facade.GetChangesMapArgs.assert_awaited_once()
+
+        bundle.write_text("applications:\n  app:\n    charm: ch:two\n")
+        changed = self._handler(cache)
+        await changed.fetch_plan(str(bundle), None)
+        changed.bundle_facade.GetChangesMapArgs.assert_awaited_once()
+        assert cache.stats()["entries"] == 3
+
+    async def test_cached_plan_is_not_changed_by_a_trusted_deploy(self, tmp_path):
+        bundle = tmp_path / "bundle.yaml"
+        bundle.write_text("applications:\n  app:\n    charm: ch:x\n")
+        cache = PlanCache()
+        configs = []
+
+        # the first plan comes from the controller, the others from the cache
+        for trusted in (False, True, False):
+            handler = self._handler(cache)
+            handler.bundle_facade.GetChangesMapArgs.return_value = (
+                client.BundleChangesMapArgsResults.from_json({
+                    "changes": [
+                        {
+                            "id": "addApplication-0",
+                            "method": "deploy",
+                            "args": {
+                                "charm": "ch:x",
+                                "application": "app",
+                                "options": {"a": "1"},
+                            },
+                            "requires": [],
+                        }
+                    ]
+                })
+            )
+            await handler.fetch_plan(str(bundle), None)
+            change = handler._make_change(handler.plan.changes[0])
+
+            model = Mock()
+            model.applications = {}
+            model.info.agent_version = client.Number.from_json("3.6.0")
+            model._deploy = mock.AsyncMock(return_value=None)
+            model._add_charmhub_resources = mock.AsyncMock(return_value=[])
+            context = Mock()
+            context.resolve.return_value = "ch:x"
+            context.origins = {"ch:x": Mock()}
+            context.trusted = trusted
+            context.model = model
+            with patch.object(
+                charmhub.CharmHub,
+                "get_charm_id",
+                mock.AsyncMock(return_value=["12345", "x"]),
+            ):
+                await change.run(context)
+            configs.append(model._deploy.call_args.kwargs["config"])
+
+        assert configs == [{"a": "1"}, {"a": "1", "trust": "true"}, {"a": "1"}]
+        assert cache.stats()["hits"] == 2
+
+    def test_lru(self):
+        cache = PlanCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert PlanCache.key("path", {1: "a", "b": 2}, [], {}) is None
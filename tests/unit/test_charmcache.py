@@ -0,0 +1,292 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from juju import jasyncio
+from juju.charmcache import CHARM_INFO, RESOLVE, CharmCache, LocalCharmCache
+from juju.client import client
+from juju.errors import JujuAPIError
+from juju.model import CharmArchiveGenerator, Model
+
+
+class TestCharmCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = CharmCache()
+        self.assertIsNone(cache.get("ctrl", RESOLVE, {"reference": "ch:app"}))
+
+        cache.put("ctrl", RESOLVE, {"reference": "ch:app"}, {"url": "ch:app-1"})
+        value = cache.get("ctrl", RESOLVE, {"reference": "ch:app"})
+        self.assertEqual(value, {"url": "ch:app-1"})
+
+        # values are copies, and entries are per controller and kind
+        value["url"] = "changed"
+        self.assertEqual(
+            cache.get("ctrl", RESOLVE, {"reference": "ch:app"}), {"url": "ch:app-1"}
+        )
+        self.assertIsNone(cache.get("other", RESOLVE, {"reference": "ch:app"}))
+        self.assertIsNone(cache.get("ctrl", CHARM_INFO, {"reference": "ch:app"}))
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 3, "entries": 1})
+
+    def test_lru_and_ttl(self):
+        cache = CharmCache(maxsize=2, ttl=60)
+        cache.put("ctrl", CHARM_INFO, "a", 1)
+        cache.put("ctrl", CHARM_INFO, "b", 2)
+        cache.get("ctrl", CHARM_INFO, "a")
+        cache.put("ctrl", CHARM_INFO, "c", 3)
+        self.assertIsNone(cache.get("ctrl", CHARM_INFO, "b"))
+        self.assertEqual(cache.get("ctrl", CHARM_INFO, "a"), 1)
+
+        with mock.patch("juju.charmcache.time.time", return_value=1e12):
+            self.assertIsNone(cache.get("ctrl", CHARM_INFO, "a"))
+
+    def test_invalidate(self):
+        cache = CharmCache()
+        cache.put("ctrl", CHARM_INFO, "ch:a-1", 1, charm="a")
+        cache.put("ctrl", CHARM_INFO, "ch:b-1", 2, charm="b")
+
+        cache.invalidate(charm="a")
+        self.assertIsNone(cache.get("ctrl", CHARM_INFO, "ch:a-1"))
+        self.assertEqual(cache.get("ctrl", CHARM_INFO, "ch:b-1"), 2)
+
+        cache.invalidate()
+        self.assertIsNone(cache.get("ctrl", CHARM_INFO, "ch:b-1"))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = CharmCache(directory=directory)
+            cache.put("ctrl", CHARM_INFO, "ch:a-1", {"meta": {}}, charm="a")
+
+            restored = CharmCache(directory=directory)
+            self.assertEqual(restored.get("ctrl", CHARM_INFO, "ch:a-1"), {"meta": {}})
+
+            restored.invalidate(charm="a")
+            self.assertIsNone(
+                CharmCache(directory=directory).get("ctrl", CHARM_INFO, "ch:a-1")
+            )
+
+            cache.put("ctrl", CHARM_INFO, "ch:b-1", 2)
+            cache.clear()
+            self.assertIsNone(
+                CharmCache(directory=directory).get("ctrl", CHARM_INFO, "ch:b-1")
+            )
+
+
+class TestCharmCacheSaves(unittest.IsolatedAsyncioTestCase):
+    def _cache(self, **kwargs):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        return CharmCache(directory=self.directory, **kwargs)
+
+    async def _wait_writing(self, cache):
+        while cache._writing is None:
+            await jasyncio.sleep(0)
+        writing, cache._writing = cache._writing, None
+        return writing
+
+    def _restored(self, key):
+        return CharmCache(directory=self.directory).get("ctrl", CHARM_INFO, key)
+
+    async def test_puts_are_written_together(self):
+        cache = self._cache(save_delay=0)
+        with mock.patch("juju.charmcache.os.replace", wraps=os.replace) as replace:
+            for i in range(3):
+                cache.put("ctrl", CHARM_INFO, f"ch:a-{i}", i)
+            self.assertIsNone(self._restored("ch:a-0"))
+
+            writing = await jasyncio.wait_for(self._wait_writing(cache), 1)
+            await writing
+        replace.assert_called_once()
+        self.assertEqual(self._restored("ch:a-2"), 2)
+
+    async def test_flush(self):
+        cache = self._cache()
+        cache.put("ctrl", CHARM_INFO, "ch:a-1", 1)
+        self.assertIsNone(self._restored("ch:a-1"))
+
+        cache.flush()
+        self.assertEqual(self._restored("ch:a-1"), 1)
+        self.assertIsNone(cache._save_handle)
+
+    async def test_clear_drops_pending_writes(self):
+        cache = self._cache(save_delay=0)
+        cache.put("ctrl", CHARM_INFO, "ch:a-1", 1)
+        writing = await jasyncio.wait_for(self._wait_writing(cache), 1)
+        cache.put("ctrl", CHARM_INFO, "ch:a-2", 2)
+        cache.clear()
+        await writing
+
+        self.assertIsNone(self._restored("ch:a-1"))
+        self.assertEqual(list(Path(self.directory).glob("*.json")), [])
+
+
+@mock.patch("juju.client.client.CharmsFacade")
+class TestModelCharmCache(unittest.IsolatedAsyncioTestCase):
+    def _model(self, cache):
+        model = Model(charm_cache=cache)
+        connection = mock.MagicMock()
+        connection.info = {"controller-tag": "controller-ctrl"}
+        model.connection = mock.MagicMock(return_value=connection)
+        return model
+
+    async def test_resolutions_are_shared_between_models(self, mock_cf):
+        facade = mock_cf.from_connection.return_value
+        facade.ResolveCharms = mock.AsyncMock(
+            return_value=client.ResolveCharmWithChannelResults(
+                results=[
+                    client.ResolveCharmWithChannelResult.from_json({
+                        "url": "ch:amd64/app-3",
+                        "charm-origin": {"source": "charm-hub", "revision": 3},
+                        "supported-series": ["jammy"],
+                    })
+                ]
+            )
+        )
+        cache = CharmCache()
+        request = {"reference": "ch:app", "charm-origin": {"source": "charm-hub"}}
+
+        for _ in range(2):
+            model = self._model(cache)
+            results = await model._resolve_charm_results([request])
+            self.assertEqual(results[0].url, "ch:amd64/app-3")
+            self.assertEqual(results[0].charm_origin.revision, 3)
+            self.assertEqual(results[0].unknown_fields["supported-series"], ["jammy"])
+
+        facade.ResolveCharms.assert_awaited_once()
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 1})
+
+    async def test_charm_info(self, mock_cf):
+        facade = mock_cf.from_connection.return_value
+        facade.CharmInfo = mock.AsyncMock(
+            return_value=client.Charm.from_json({
+                "url": "ch:amd64/app-3",
+                "revision": 3,
+                "meta": {"name": "app", "resources": {}},
+            })
+        )
+        model = self._model(CharmCache())
+
+        for _ in range(2):
+            info = await model._charm_info("ch:amd64/app-3")
+            self.assertEqual(info.meta.name, "app")
+
+        facade.CharmInfo.assert_awaited_once_with("ch:amd64/app-3")
+
+
+class TestLocalCharmCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.charm_dir = Path(tmp.name, "charm")
+        (self.charm_dir / "src").mkdir(parents=True)
+        (self.charm_dir / "metadata.yaml").write_text("name: charm\n")
+        (self.charm_dir / "src" / "charm.py").write_text("print('v1')\n")
+        (self.charm_dir / ".git").mkdir()
+        self.cache_dir = Path(tmp.name, "cache")
+
+    def test_archive_is_built_once(self):
+        cache = LocalCharmCache(self.cache_dir)
+        with mock.patch.object(
+            CharmArchiveGenerator,
+            "make_archive",
+            autospec=True,
+            side_effect=CharmArchiveGenerator.make_archive,
+        ) as make_archive:
+            path, content_hash = cache.archive(self.charm_dir)
+            self.assertEqual(cache.archive(self.charm_dir), (path, content_hash))
+            self.assertEqual(
+                LocalCharmCache(self.cache_dir).archive(self.charm_dir),
+                (path, content_hash),
+            )
+        make_archive.assert_called_once()
+        self.assertEqual(path, self.cache_dir / f"{content_hash}.charm")
+        self.assertTrue(path.exists())
+
+    def test_content_hash(self):
+        cache = LocalCharmCache(self.cache_dir)
+        _, first = cache.archive(self.charm_dir)
+
+        # touching a file doesn't change the hash, nor do ignored files
+        os.utime(self.charm_dir / "metadata.yaml", ns=(10**18, 10**18))
+        (self.charm_dir / ".git" / "HEAD").write_text("ref\n")
+        self.assertEqual(cache.archive(self.charm_dir)[1], first)
+
+        (self.charm_dir / "src" / "charm.py").write_text("print('v2')\n")
+        self.assertNotEqual(cache.archive(self.charm_dir)[1], first)
+
+    def test_uploads(self):
+        cache = LocalCharmCache(self.cache_dir)
+        self.assertIsNone(cache.uploaded("model", "hash", "jammy"))
+
+        cache.record_upload("model", "hash", "jammy", "local:jammy/charm-0", 2.5)
+        record = LocalCharmCache(self.cache_dir).uploaded("model", "hash", "jammy")
+        self.assertEqual(record, {"charm-url": "local:jammy/charm-0", "seconds": 2.5})
+        self.assertIsNone(cache.uploaded("other", "hash", "jammy"))
+
+        self.assertEqual(cache.record_reuse(record), 2.5)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "time_saved": 2.5})
+
+        cache.forget_upload("model", "hash", "jammy")
+        self.assertIsNone(cache.uploaded("model", "hash", "jammy"))
+
+
+@mock.patch("juju.client.client.CharmsFacade")
+class TestModelLocalCharmCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.charm_dir = Path(tmp.name, "charm")
+        self.charm_dir.mkdir()
+        (self.charm_dir / "metadata.yaml").write_text("name: charm\n")
+        self.cache_dir = Path(tmp.name, "cache")
+
+    def _model(self, cache=None):
+        model = Model(local_charm_cache=cache)
+        model._info = mock.MagicMock(uuid="model-uuid")
+        model.is_connected = mock.MagicMock(return_value=True)
+        model.connection = mock.MagicMock()
+        uploaded = []
+
+        def add_local_charm(fh, series, size):
+            uploaded.append(fh.name)
+            return f"local:{series}/charm-{len(uploaded) - 1}"
+
+        model.add_local_charm = add_local_charm
+        return model, uploaded
+
+    async def test_temporary_archive_is_removed(self, mock_cf):
+        model, uploaded = self._model()
+
+        charm_url = await model.add_local_charm_dir(self.charm_dir, "jammy")
+
+        self.assertEqual(charm_url, "local:jammy/charm-0")
+        self.assertFalse(os.path.exists(uploaded[0]))
+
+    async def test_unchanged_charm_is_not_uploaded_again(self, mock_cf):
+        facade = mock_cf.from_connection.return_value
+        facade.CharmInfo = mock.AsyncMock()
+        cache = LocalCharmCache(self.cache_dir)
+        model, uploaded = self._model(cache)
+
+        first = await model.add_local_charm_dir(self.charm_dir, "jammy")
+        second = await model.add_local_charm_dir(self.charm_dir, "jammy")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(uploaded), 1)
+        facade.CharmInfo.assert_awaited_once_with(first)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        # the model lost the charm, so it is uploaded again
+        facade.CharmInfo.side_effect = JujuAPIError({
+            "error": "not found",
+            "response": {},
+            "request-id": 1,
+        })
+        third = await model.add_local_charm_dir(self.charm_dir, "jammy")
+        self.assertEqual(third, "local:jammy/charm-1")
+        self.assertEqual(len(uploaded), 2)
@@ -172,3 +172,135 @@ class TestControllerConnect(unittest.IsolatedAsyncioTestCase):
             new_cred = up_creds.call_args[1]["credentials"][0].credential
             assert cred.attrs["file"] == tempfile.name
             assert new_cred.attrs["file"] == "cred-test"
+
+
+def _model_delta(model_uuid, entity, type_, **data):
+    return client.Delta([entity, type_, dict(data, **{"model-uuid": model_uuid})])
+
+
+class TestControllerWatcher(unittest.IsolatedAsyncioTestCase):
+    def _watcher(self, **kwargs):
+        from juju.model import ControllerWatcher
+
+        controller = Controller()
+        controller._connector = mock.MagicMock()
+        return ControllerWatcher(controller, **kwargs)
+
+    async def test_deltas_feed_per_model_state(self):
+        watcher = self._watcher()
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+            _model_delta("uuid-b", "application", "change", name="app"),
+            _model_delta("uuid-b", "unit", "change", name="app/0", application="app"),
+        ])
+        self.assertEqual(set(watcher.models), {"uuid-a", "uuid-b"})
+        self.assertEqual(list(watcher.get_model("uuid-a").units), [])
+        self.assertEqual(list(watcher.get_model("uuid-b").units), ["app/0"])
+        self.assertEqual(watcher.get_model("uuid-b").uuid, "uuid-b")
+        self.assertIsNone(watcher.get_state("uuid-c"))
+
+    async def test_observers_by_model(self):
+        from juju import jasyncio
+
+        watcher = self._watcher()
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+        ])
+        seen_all, seen_b = [], []
+
+        async def on_all(delta, old, new, model):
+            seen_all.append((model.uuid, delta.get_id()))
+
+        async def on_b(delta, old, new, model):
+            seen_b.append((model.uuid, delta.get_id()))
+
+        handle = watcher.add_observer(on_all, "application")
+        watcher.add_observer(on_b, "application", model_uuid="uuid-b")
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+            _model_delta("uuid-b", "application", "change", name="other"),
+        ])
+        await jasyncio.sleep(0)
+        self.assertEqual(sorted(seen_all), [("uuid-a", "app"), ("uuid-b", "other")])
+        self.assertEqual(seen_b, [("uuid-b", "other")])
+
+        self.assertTrue(watcher.remove_observer(handle))
+        self.assertFalse(watcher.remove_observer(handle))
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+        ])
+        await jasyncio.sleep(0)
+        self.assertEqual(len(seen_all), 2)
+
+    async def test_model_uuids_and_removal(self):
+        watcher = self._watcher(model_uuids=["uuid-a"])
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+            _model_delta("uuid-b", "application", "change", name="app"),
+        ])
+        self.assertEqual(list(watcher.models), ["uuid-a"])
+
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "model", "remove", name="m"),
+        ])
+        self.assertEqual(watcher.models, {})
+
+    async def test_removal_ends_queued_observers(self):
+        from juju import jasyncio
+
+        watcher = self._watcher()
+        seen = []
+
+        async def on_change(delta, old, new, model):
+            seen.append((delta.entity, delta.type))
+
+        watcher.add_observer(on_change, queue_size=10)
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "application", "change", name="app"),
+        ])
+        model = watcher.get_model("uuid-a")
+        (queue,) = [o.queue for o in model._observers]
+        stream = model.changes()
+        await watcher._apply_deltas([
+            _model_delta("uuid-a", "model", "remove", name="m"),
+        ])
+        await jasyncio.wait_for(queue._worker, 1)
+
+        self.assertEqual(seen, [("application", "add"), ("model", "remove")])
+        self.assertEqual(len(model._observers), 0)
+        changes = [(delta.entity, delta.type) async for delta in stream]
+        self.assertEqual(changes, [("model", "remove")])
+
+    async def test_start_without_facade(self):
+        from juju.errors import JujuError
+
+        watcher = self._watcher()
+        watcher.controller.connection().facades = {}
+        with self.assertRaises(JujuError):
+            await watcher.start()
+
+    @mock.patch("juju.client.client.AllModelWatcherFacade")
+    async def test_start_and_stop(self, mock_facade):
+        from juju import jasyncio
+
+        watcher = self._watcher()
+        blocked = jasyncio.Event()
+        batches = [
+            mock.Mock(
+                deltas=[_model_delta("uuid-a", "application", "change", name="app")]
+            )
+        ]
+
+        async def next_():
+            if batches:
+                return batches.pop()
+            await blocked.wait()
+
+        all_model_watcher = mock_facade.from_connection.return_value
+        all_model_watcher.Next = next_
+        all_model_watcher.Stop = mock.AsyncMock()
+        mock_facade.best_facade_version.return_value = 4
+
+        async with watcher:
+            self.assertEqual(list(watcher.get_model("uuid-a").applications), ["app"])
+        self.assertTrue(watcher._watch_stopped.is_set())
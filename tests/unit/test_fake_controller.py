@@ -0,0 +1,79 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+"""End-to-end tests of Model over a real websocket, against the fake
+controller in tests/fake_controller.py.
+"""
+
+import unittest
+
+from juju import jasyncio, utils
+from juju.client import client
+from juju.errors import JujuAPIError
+from juju.model import Model
+from tests.fake_controller import FakeAPIError, FakeController
+
+APP = ["application", "change", {"name": "app", "status": {"current": "active"}}]
+
+
+def _unit(name):
+    return ["unit", "change", {"name": name, "application": "app"}]
+
+
+class TestFakeController(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake = FakeController(deltas=[[APP]], seed=0)
+        await self.fake.start()
+        self.model = Model()
+        await self.model.connect(**self.fake.connect_params())
+
+    async def asyncTearDown(self):
+        await self.model.disconnect()
+        await self.fake.stop()
+
+    async def _wait_for_unit(self, name):
+        await self.model.block_until_changed(
+            lambda: name in self.model.units, entity_types=["unit"], timeout=5
+        )
+
+    async def test_connect_and_watch(self):
+        self.assertEqual(list(self.model.applications), ["app"])
+        self.assertEqual(self.model.info.name, "fake")
+        self.fake.push([_unit("app/0")])
+        await self._wait_for_unit("app/0")
+
+        status = await self.model.get_status()
+        self.assertEqual(status.model.name, "fake")
+        self.assertEqual(self.fake.requests["Client.FullStatus"], 1)
+
+    async def test_watcher_survives_dropped_connection(self):
+        logins = self.fake.logins
+        await self.fake.drop_connections()
+        # The watcher restarts once the connection has been reopened
+        await utils.block_until(
+            lambda: self.fake.requests["Client.WatchAll"] == 2, timeout=5
+        )
+        self.assertGreater(self.fake.logins, logins)
+        self.fake.push([_unit("app/1")])
+        await self._wait_for_unit("app/1")
+
+    async def test_errors(self):
+        def fail(params):
+            raise FakeAPIError("boom", "not supported")
+
+        self.fake.handle("Client", "FullStatus", fail)
+        facade = client.ClientFacade.from_connection(self.model.connection())
+        with self.assertRaises(JujuAPIError) as cm:
+            await facade.FullStatus()
+        self.assertEqual(cm.exception.error_code, "not supported")
+
+        facade = client.SpacesFacade.from_connection(self.model.connection())
+        with self.assertRaises(JujuAPIError) as cm:
+            await facade.ListSpaces()
+        self.assertEqual(cm.exception.error_code, "not implemented")
+
+    async def test_latency(self):
+        self.fake.latency = 0.05
+        start = jasyncio.get_running_loop().time()
+        await client.PingerFacade.from_connection(self.model.connection()).Ping()
+        self.assertGreaterEqual(jasyncio.get_running_loop().time() - start, 0.05)
@@ -9,19 +9,28 @@ from juju.model import Model
 
 @mock.patch("juju.client.client.ClientFacade")
 async def test_hostname(mock_cf):
+    from juju.client.client import Delta
+    from juju.delta import get_entity_delta
+
     model = Model()
     model._connector = mock.MagicMock()
-    model.state = mock.MagicMock()
 
     # Calling hostname() when no information is available (e.g. targeting
     # an older controller, agent not started yet etc.) should return None
-    model.state.entity_data = mock.MagicMock(return_value={})
+    model.state.apply_delta(get_entity_delta(Delta(["machine", "add", {"id": "test"}])))
     mach = Machine("test", model)
     assert mach.hostname is None
 
-    model.state.entity_data = mock.MagicMock(
-        return_value={
-            "hostname": "thundering-herds",
-        }
+    model.state.apply_delta(
+        get_entity_delta(
+            Delta([
+                "machine",
+                "change",
+                {
+                    "id": "test",
+                    "hostname": "thundering-herds",
+                },
+            ])
+        )
     )
     assert mach.hostname == "thundering-herds"
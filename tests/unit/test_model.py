@@ -2,6 +2,7 @@
 # Licensed under the Apache V2, see LICENCE file for details.
 
 import datetime
+import time
 import unittest
 from unittest import mock
 from unittest.mock import PropertyMock, patch
@@ -67,6 +68,286 @@ class TestObserver(unittest.TestCase):
         self.assertTrue(o.cares_about(delta))
 
 
+class TestObserverRegistration(unittest.IsolatedAsyncioTestCase):
+    async def test_remove_observer_by_handle(self):
+        model = Model()
+
+        async def callback(delta, old, new, model):
+            pass
+
+        handle = model.add_observer(callback, "application")
+        self.assertEqual(len(model._observers), 1)
+        self.assertTrue(model.remove_observer(handle))
+        self.assertEqual(len(model._observers), 0)
+        self.assertFalse(model.remove_observer(handle))
+
+    async def test_remove_observer_by_callable(self):
+        model = Model()
+
+        async def callback(delta, old, new, model):
+            pass
+
+        model.add_observer(callback, "application")
+        model.add_observer(callback, "unit")
+        self.assertTrue(model.remove_observer(callback))
+        self.assertEqual(len(model._observers), 0)
+
+    async def test_once_observer_removed_after_first_call(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+        callback = mock.AsyncMock()
+
+        model.add_observer(callback, "application", once=True)
+        delta = _make_delta("application", "change", dict(name="foo"))
+        old, new = model.state.apply_delta(delta)
+        await model._notify_observers(delta, old, new)
+        await model._notify_observers(delta, old, new)
+        await jasyncio.sleep(0)
+
+        callback.assert_awaited_once()
+        self.assertEqual(len(model._observers), 0)
+
+    async def test_wait_removes_observer(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+
+        waiter = jasyncio.create_task(model._wait_for_new("application", "foo"))
+        await jasyncio.sleep(0)
+        self.assertEqual(len(model._observers), 1)
+
+        delta = _make_delta("application", "add", dict(name="foo"))
+        old, new = model.state.apply_delta(delta)
+        await model._notify_observers(delta, old, new)
+
+        app = await waiter
+        self.assertEqual(app.entity_id, "foo")
+        self.assertEqual(len(model._observers), 0)
+
+    async def test_wait_timeout_removes_observer(self):
+        model = Model()
+
+        with self.assertRaises(jasyncio.TimeoutError):
+            await model.wait_for_action("action-1", timeout=0.01)
+        self.assertEqual(len(model._observers), 0)
+
+
+class TestQueuedObserver(unittest.IsolatedAsyncioTestCase):
+    async def _notify(self, model, *deltas):
+        for delta in deltas:
+            old, new = model.state.apply_delta(delta)
+            await model._notify_observers(delta, old, new)
+
+    def _model(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+        return model
+
+    async def test_ordered_delivery(self):
+        model = self._model()
+        seen = []
+
+        async def callback(delta, old, new, model):
+            # yield so that unordered delivery would interleave
+            await jasyncio.sleep(0.01 if delta.data["n"] == 0 else 0)
+            seen.append(delta.data["n"])
+
+        model.add_observer(callback, "application", queue_size=10)
+        await self._notify(
+            model,
+            *[
+                _make_delta("application", "change", dict(name="foo", n=n))
+                for n in range(5)
+            ],
+        )
+        await jasyncio.sleep(0.05)
+
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+        (stats,) = model.observer_queue_stats()
+        self.assertEqual(stats["delivered"], 5)
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["callable"], callback)
+
+    async def test_drop_oldest(self):
+        from juju.model import OverflowPolicy
+
+        model = self._model()
+        seen = []
+
+        async def callback(delta, old, new, model):
+            seen.append(delta.data["n"])
+
+        model.add_observer(
+            callback, "application", queue_size=2, overflow=OverflowPolicy.DROP_OLDEST
+        )
+        # nothing is delivered until the event loop gets to run the worker
+        await self._notify(
+            model,
+            *[
+                _make_delta("application", "change", dict(name="foo", n=n))
+                for n in range(4)
+            ],
+        )
+        await jasyncio.sleep(0)
+
+        self.assertEqual(seen, [2, 3])
+        (stats,) = model.observer_queue_stats()
+        self.assertEqual(stats["dropped"], 2)
+        self.assertEqual(stats["max-depth"], 2)
+
+    async def test_coalesce_by_entity(self):
+        from juju.model import OverflowPolicy
+
+        model = self._model()
+        seen = []
+
+        async def callback(delta, old, new, model):
+            seen.append((delta.get_id(), delta.type, delta.data["n"], old))
+
+        model.add_observer(
+            callback, "application", queue_size=10, overflow=OverflowPolicy.COALESCE
+        )
+        await self._notify(
+            model,
+            _make_delta("application", "change", dict(name="foo", n=0)),
+            _make_delta("application", "change", dict(name="bar", n=1)),
+            _make_delta("application", "change", dict(name="foo", n=2)),
+        )
+        await jasyncio.sleep(0)
+
+        # foo keeps its queue position, the 'add' type and its first old
+        # object, but carries the latest data
+        self.assertEqual(seen, [("foo", "add", 2, None), ("bar", "add", 1, None)])
+        (stats,) = model.observer_queue_stats()
+        self.assertEqual(stats["coalesced"], 1)
+
+    async def test_coalesce_keeps_shared_delta(self):
+        from juju.model import OverflowPolicy
+
+        model = self._model()
+        coalesced = []
+        changes = []
+
+        async def on_coalesced(delta, old, new, model):
+            coalesced.append((delta.type, delta.data["n"]))
+
+        async def on_change(delta, old, new, model):
+            changes.append((delta.type, delta.data["n"]))
+
+        model.add_observer(
+            on_coalesced, "application", queue_size=10, overflow=OverflowPolicy.COALESCE
+        )
+        model.add_observer(on_change, "application", "change", "foo")
+        await self._notify(
+            model,
+            _make_delta("application", "change", dict(name="foo", n=0)),
+            _make_delta("application", "change", dict(name="foo", n=1)),
+        )
+        await jasyncio.sleep(0)
+
+        self.assertEqual(coalesced, [("add", 1)])
+        self.assertEqual(changes, [("change", 1)])
+
+    async def test_block_applies_backpressure(self):
+        model = self._model()
+        release = jasyncio.Event()
+
+        async def callback(delta, old, new, model):
+            await release.wait()
+
+        model.add_observer(callback, "application", queue_size=1)
+        notify = jasyncio.create_task(
+            self._notify(
+                model,
+                *[
+                    _make_delta("application", "change", dict(name="foo", n=n))
+                    for n in range(3)
+                ],
+            )
+        )
+        await jasyncio.sleep(0.01)
+        self.assertFalse(notify.done())
+
+        release.set()
+        await jasyncio.wait_for(notify, 1)
+
+    async def test_remove_observer_stops_worker(self):
+        model = self._model()
+        callback = mock.AsyncMock()
+
+        handle = model.add_observer(callback, "application", queue_size=1)
+        await self._notify(
+            model, _make_delta("application", "change", dict(name="foo", n=0))
+        )
+        worker = handle.queue._worker
+        model.remove_observer(handle)
+        await jasyncio.sleep(0)
+
+        self.assertTrue(worker.cancelled())
+        self.assertEqual(model.observer_queue_stats(), [])
+
+
+class TestDeltaBatches(unittest.IsolatedAsyncioTestCase):
+    def _raw(self, entity, type_, data):
+        from juju.client.client import Delta
+
+        return Delta([entity, type_, data])
+
+    def test_coalesce_deltas(self):
+        from juju.model import _coalesce_deltas
+
+        deltas = [
+            _make_delta("unit", "change", {"name": "u/0", "n": 0}),
+            _make_delta("application", "change", {"name": "u", "n": 1}),
+            _make_delta("unit", "change", {"name": "u/0", "n": 2}),
+            _make_delta("unit", "remove", {"name": "u/1", "n": 3}),
+            _make_delta("unit", "change", {"name": "u/1", "n": 4}),
+            _make_delta("unit", "change", {"name": "u/1", "n": 5}),
+        ]
+        coalesced = _coalesce_deltas(deltas)
+        self.assertEqual([d.data["n"] for d in coalesced], [1, 2, 3, 5])
+
+    async def test_apply_deltas_coalesced(self):
+        model = Model(coalesce_deltas=True)
+        model._connector = mock.MagicMock()
+        observer = mock.AsyncMock()
+        model.add_observer(observer, "unit")
+
+        applied = await model._apply_deltas([
+            self._raw("unit", "change", {"name": "u/0", "n": 0}),
+            self._raw("unit", "change", {"name": "u/0", "n": 1}),
+        ])
+        await jasyncio.sleep(0)
+
+        self.assertEqual(len(applied), 1)
+        delta, old, new = applied[0]
+        self.assertEqual(delta.type, "add")
+        self.assertIsNone(old)
+        self.assertEqual(new.n, 1)
+        observer.assert_awaited_once()
+
+    async def test_batch_observer(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+        batch_observer = mock.AsyncMock()
+        handle = model.add_batch_observer(batch_observer)
+
+        await model._apply_deltas([
+            self._raw("unit", "change", {"name": "u/0"}),
+            self._raw("application", "change", {"name": "u"}),
+        ])
+        await jasyncio.sleep(0)
+
+        batch_observer.assert_awaited_once()
+        changes, passed_model = batch_observer.await_args.args
+        self.assertIs(passed_model, model)
+        self.assertEqual([d.entity for d, _, _ in changes], ["unit", "application"])
+
+        self.assertTrue(model.remove_observer(handle))
+        await model._apply_deltas([self._raw("unit", "change", {"name": "u/0"})])
+        await jasyncio.sleep(0)
+        batch_observer.assert_awaited_once()
+
+
 class TestModelState(unittest.TestCase):
     def test_apply_delta(self):
         model = Model()
@@ -241,6 +522,36 @@ class TestModelConnect(unittest.IsolatedAsyncioTestCase):
         )
 
 
+class TestModelCachesOnReconnect(unittest.IsolatedAsyncioTestCase):
+    def _model(self):
+        m = Model(status_ttl=60, config_ttl=60)
+        m._connector = mock.MagicMock()
+        m._connector.disconnect = mock.AsyncMock()
+        m._status_cache._results[None] = (0, mock.sentinel.status, 1e12)
+        m.settings_cache._results["config"] = (time.monotonic(), {})
+        return m
+
+    async def test_disconnect_invalidates_caches(self):
+        m = self._model()
+
+        await m.disconnect()
+
+        self.assertEqual(m._status_cache._results, {})
+        self.assertEqual(m.settings_cache._results, {})
+
+    async def test_connect_invalidates_caches(self):
+        m = self._model()
+        m._info = mock.MagicMock(uuid="model-uuid")
+
+        with mock.patch.object(Model, "_watch"), mock.patch.object(
+            Model, "_wait_for_watch_received", mock.AsyncMock()
+        ):
+            await m._after_connect(model_uuid="model-uuid")
+
+        self.assertEqual(m._status_cache._results, {})
+        self.assertEqual(m.settings_cache._results, {})
+
+
 # Patch timedelta to immediately force a timeout to avoid introducing an unnecessary delay in the test failing.
 # It should be safe to always set it up to lead to a timeout.
 @patch("juju.model.timedelta", new=lambda *a, **kw: datetime.timedelta(0))
@@ -401,3 +712,777 @@ class TestModelWaitForIdle(unittest.IsolatedAsyncioTestCase):
             )
 
         mock_apps.assert_called_with()
+
+
+class TestModelWaitForIdleEvents(unittest.IsolatedAsyncioTestCase):
+    def _unit_delta(self, agent_status):
+        from juju.client.client import Delta
+
+        return Delta([
+            "unit",
+            "change",
+            {
+                "name": "app/0",
+                "application": "app",
+                "machine-id": "",
+                "agent-status": {"current": agent_status},
+                "workload-status": {"current": "active", "message": ""},
+            },
+        ])
+
+    async def test_rechecks_on_relevant_delta(self):
+        from juju.client.client import Delta
+
+        m = Model()
+        m._connector = mock.MagicMock()
+        m._connector.is_connected.return_value = False
+        await m._apply_deltas([
+            Delta([
+                "application",
+                "change",
+                {"name": "app", "status": {"current": "active", "message": ""}},
+            ]),
+            self._unit_delta("executing"),
+        ])
+
+        waiter = jasyncio.create_task(
+            m.wait_for_idle(apps=["app"], idle_period=0, check_freq=0.01, timeout=None)
+        )
+        await jasyncio.sleep(0.05)
+        self.assertFalse(waiter.done())
+        self.assertEqual(len(m._observers), 1)
+
+        await m._apply_deltas([self._unit_delta("idle")])
+        await jasyncio.wait_for(waiter, 1)
+        self.assertEqual(len(m._observers), 0)
+
+    async def test_raises_when_watcher_stops(self):
+        m = Model()
+        m._connector = mock.MagicMock()
+        m._watch_stopped.clear()
+        waiter = jasyncio.create_task(
+            m.wait_for_idle(apps=["app"], check_freq=0.01, timeout=None)
+        )
+        await jasyncio.sleep(0.05)
+        self.assertFalse(waiter.done())
+
+        m._connector.is_connected.return_value = False
+        m._watch_stopped.set()
+        with self.assertRaises(JujuConnectionError):
+            await jasyncio.wait_for(waiter, 1)
+        self.assertEqual(len(m._observers), 0)
+
+    async def test_raises_watcher_exception(self):
+        async def fail():
+            raise JujuError("watcher failed")
+
+        m = Model()
+        m._connector = mock.MagicMock()
+        m._watch_stopped.clear()
+        waiter = jasyncio.create_task(
+            m.wait_for_idle(apps=["app"], check_freq=0.01, timeout=None)
+        )
+        await jasyncio.sleep(0.05)
+
+        m._watcher_task = jasyncio.ensure_future(fail())
+        await jasyncio.sleep(0)
+        m._watch_stopped.set()
+        with self.assertRaisesRegex(JujuError, "watcher failed"):
+            await jasyncio.wait_for(waiter, 1)
+
+    async def test_no_full_status_when_status_reached(self):
+        app = mock.MagicMock(status="active", units=[])
+        app.name = "app"
+        with patch.object(Model, "applications", new_callable=PropertyMock) as apps:
+            apps.return_value = {"app": app}
+            m = Model()
+            await m.wait_for_idle(
+                apps=["app"], status="active", wait_for_at_least_units=0
+            )
+        app.get_status.assert_not_called()
+
+
+class TestModelBlockUntilChanged(unittest.IsolatedAsyncioTestCase):
+    def _model(self):
+        m = Model()
+        m._connector = mock.MagicMock()
+        m._connector.is_connected.return_value = True
+        m._watch_stopped.clear()
+        return m
+
+    async def test_wakes_on_relevant_delta(self):
+        from juju.client.client import Delta
+
+        m = self._model()
+        waiter = jasyncio.ensure_future(
+            m.block_until_changed(
+                lambda: "app" in m.applications, entity_types=["application"]
+            )
+        )
+        await jasyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        await m._apply_deltas([Delta(["unit", "change", {"name": "app/0"}])])
+        await jasyncio.sleep(0.01)
+        self.assertFalse(waiter.done())
+
+        await m._apply_deltas([Delta(["application", "change", {"name": "app"}])])
+        await jasyncio.wait_for(waiter, 1)
+        self.assertEqual(len(m._observers), 0)
+
+    async def test_raises_when_watcher_stops(self):
+        import websockets
+
+        m = self._model()
+        waiter = jasyncio.ensure_future(m.block_until_changed(lambda: False))
+        await jasyncio.sleep(0.01)
+
+        m._connector.is_connected.return_value = False
+        m._watch_stopped.set()
+        with self.assertRaises(websockets.ConnectionClosed):
+            await jasyncio.wait_for(waiter, 1)
+
+
+class TestModelChanges(unittest.IsolatedAsyncioTestCase):
+    def _raw(self, entity, data):
+        from juju.client.client import Delta
+
+        return Delta([entity, "change", data])
+
+    def _model(self):
+        m = Model()
+        m._connector = mock.MagicMock()
+        return m
+
+    async def test_since_snapshot_then_live(self):
+        m = self._model()
+        await m._apply_deltas([
+            self._raw("application", {"name": "app"}),
+            self._raw("unit", {"name": "app/0"}),
+        ])
+
+        async with m.changes(entity_type="unit", since_snapshot=True) as changes:
+            await m._apply_deltas([
+                self._raw("application", {"name": "app"}),
+                self._raw("unit", {"name": "app/1"}),
+                self._raw("unit", {"name": "app/0"}),
+            ])
+            seen = []
+            async for delta in changes:
+                seen.append((delta.type, delta.get_id()))
+                if len(seen) == 3:
+                    break
+
+        self.assertEqual(
+            seen, [("add", "app/0"), ("add", "app/1"), ("change", "app/0")]
+        )
+        self.assertEqual(len(m._observers), 0)
+
+    async def test_ids_and_close_ends_iteration(self):
+        m = self._model()
+        changes = m.changes(ids=["app/1"])
+
+        async def consume():
+            return [delta.get_id() async for delta in changes]
+
+        consumer = jasyncio.ensure_future(consume())
+        await m._apply_deltas([
+            self._raw("unit", {"name": "app/0"}),
+            self._raw("unit", {"name": "app/1"}),
+        ])
+        await jasyncio.sleep(0)
+        changes.close()
+
+        self.assertEqual(await jasyncio.wait_for(consumer, 1), ["app/1"])
+
+    async def test_disconnect_ends_iteration(self):
+        m = self._model()
+        m._connector.is_connected.return_value = False
+        changes = m.changes()
+
+        async def consume():
+            return [delta.get_id() async for delta in changes]
+
+        consumer = jasyncio.ensure_future(consume())
+        await m._apply_deltas([self._raw("unit", {"name": "app/0"})])
+        await m.disconnect()
+
+        self.assertEqual(await jasyncio.wait_for(consumer, 1), ["app/0"])
+
+    async def test_bounded_buffer_drop_oldest(self):
+        from juju.model import OverflowPolicy
+
+        m = self._model()
+        changes = m.changes(buffer_size=2, overflow=OverflowPolicy.DROP_OLDEST)
+        await m._apply_deltas([
+            self._raw("unit", {"name": f"app/{n}"}) for n in range(5)
+        ])
+
+        self.assertEqual(changes.queue.stats()["dropped"], 3)
+        self.assertEqual((await changes.__anext__()).get_id(), "app/3")
+        self.assertEqual((await changes.__anext__()).get_id(), "app/4")
+        changes.close()
+
+
+class TestModelStateSnapshot(unittest.IsolatedAsyncioTestCase):
+    def _raw(self, entity, data):
+        from juju.client.client import Delta
+
+        return Delta([entity, "change", data])
+
+    def _model(self):
+        m = Model()
+        m._connector = mock.MagicMock()
+        return m
+
+    async def test_save_and_warm_start(self):
+        import tempfile
+        from pathlib import Path
+
+        m = self._model()
+        m.uuid = "model-uuid"
+        await m._apply_deltas([
+            self._raw("application", {"name": "app", "n": 0}),
+            self._raw("unit", {"name": "app/0"}),
+            self._raw("unit", {"name": "app/1"}),
+        ])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.json.gz"
+            m.save_state(path)
+
+            warm = self._model()
+            self.assertFalse(warm.state.load(path, model_uuid="other-uuid"))
+            with mock.patch.object(Model, "_watch") as watch:
+                warm._info = mock.MagicMock(uuid="model-uuid")
+                await warm._after_connect(model_uuid="model-uuid", warm_start=str(path))
+            watch.assert_called_once_with()
+
+        self.assertTrue(warm.state.stale)
+        self.assertEqual(warm.applications["app"].n, 0)
+        self.assertEqual(sorted(warm.units), ["app/0", "app/1"])
+
+        # The first batch from the watcher reconciles the snapshot
+        removed = mock.AsyncMock()
+        warm.add_observer(removed, action="remove")
+        await warm._apply_deltas([
+            self._raw("application", {"name": "app", "n": 1}),
+            self._raw("unit", {"name": "app/0"}),
+        ])
+        await jasyncio.sleep(0)
+
+        self.assertFalse(warm.state.stale)
+        self.assertEqual(warm.applications["app"].n, 1)
+        self.assertEqual(sorted(warm.units), ["app/0"])
+        removed.assert_awaited_once()
+        await warm.wait_for_fresh_state()
+
+    async def test_warm_start_with_relations(self):
+        import tempfile
+        from pathlib import Path
+
+        relation = {
+            "id": 5,
+            "key": "a:db b:db",
+            "endpoints": [
+                {"application-name": "a", "relation": {"name": "db"}},
+                {"application-name": "b", "relation": {"name": "db"}},
+            ],
+        }
+        m = self._model()
+        await m._apply_deltas([self._raw("relation", relation)])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.json.gz"
+            m.save_state(path)
+            warm = self._model()
+            self.assertTrue(warm.state.load(path))
+
+        self.assertEqual(list(warm.state.state["relation"]), [5])
+        seen = []
+
+        async def observe(delta, old, new, model):
+            seen.append((delta.entity, delta.type, delta.get_id()))
+
+        warm.add_observer(observe)
+        await warm._apply_deltas([self._raw("relation", relation)])
+        await jasyncio.sleep(0)
+
+        self.assertEqual(seen, [("relation", "change", 5)])
+        self.assertEqual(list(warm.state.state["relation"]), [5])
+        self.assertEqual([r.id for r in warm.relations], [5])
+
+    def test_load_missing_snapshot(self):
+        m = self._model()
+        self.assertFalse(m.state.load("/nonexistent/state.json.gz"))
+        self.assertFalse(m.state.stale)
+
+
+class TestModelEntityData(unittest.TestCase):
+    def test_cached_history(self):
+        import tempfile
+        from pathlib import Path
+
+        from juju.exceptions import DeadEntityException
+
+        m = Model()
+        m.state.apply_delta(
+            _make_delta("unit", "add", {"name": "app/0", "machine-id": "0"})
+        )
+        unit = m.units["app/0"]
+        self.assertEqual(unit.entity_type, "unit")
+        self.assertEqual(unit.machine_id, "0")
+        with self.assertRaises(KeyError):
+            _ = unit.no_such_key
+
+        # New deltas are seen without looking the entity up again
+        m.state.apply_delta(
+            _make_delta("unit", "change", {"name": "app/0", "machine-id": "1"})
+        )
+        self.assertEqual(unit.machine_id, "1")
+        self.assertEqual(unit.previous().machine_id, "0")
+
+        # Loading a snapshot replaces the history
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state.json.gz"
+            other = Model()
+            other.state.apply_delta(
+                _make_delta("unit", "add", {"name": "app/0", "machine-id": "2"})
+            )
+            other.state.save(path)
+            self.assertTrue(m.state.load(path))
+        self.assertEqual(unit.machine_id, "2")
+
+        m.state.apply_delta(_make_delta("unit", "remove", {"name": "app/0"}))
+        self.assertTrue(unit.dead)
+        with self.assertRaises(DeadEntityException):
+            _ = unit.machine_id
+
+
+class TestWatchFilter(unittest.IsolatedAsyncioTestCase):
+    def test_matches(self):
+        from juju.model import WatchFilter
+
+        f = WatchFilter(
+            entity_types=["application", "unit", "relation"], applications=["db-*"]
+        )
+        self.assertTrue(f.matches(_make_delta("model", "change", {"model-uuid": "u"})))
+        self.assertTrue(
+            f.matches(_make_delta("application", "change", {"name": "db-1"}))
+        )
+        self.assertFalse(
+            f.matches(_make_delta("application", "change", {"name": "web"}))
+        )
+        self.assertTrue(
+            f.matches(
+                _make_delta("unit", "change", {"name": "db-1/0", "application": "db-1"})
+            )
+        )
+        self.assertFalse(
+            f.matches(
+                _make_delta("unit", "change", {"name": "web/0", "application": "web"})
+            )
+        )
+        self.assertTrue(
+            f.matches(
+                _make_delta(
+                    "relation",
+                    "change",
+                    {
+                        "key": "web:db db-1:db",
+                        "endpoints": [
+                            {"application-name": "web"},
+                            {"application-name": "db-1"},
+                        ],
+                    },
+                )
+            )
+        )
+        self.assertFalse(f.matches(_make_delta("machine", "change", {"id": "0"})))
+
+        f = WatchFilter(units=["app/0"])
+        self.assertTrue(f.matches(_make_delta("unit", "change", {"name": "app/0"})))
+        self.assertFalse(f.matches(_make_delta("unit", "change", {"name": "app/1"})))
+
+    async def test_connect_sets_filter(self):
+        from juju.client.client import Delta
+
+        m = Model()
+        m._connector = mock.MagicMock()
+        m._connector.connect_model = mock.AsyncMock(return_value="uuid")
+        m._connector.is_connected.return_value = False
+        with mock.patch.object(Model, "_after_connect"):
+            await m.connect("foo", watch_filter={"entity_types": ["unit"]})
+        observer = mock.AsyncMock()
+        m.add_observer(observer)
+
+        await m._apply_deltas([
+            Delta(["application", "change", {"name": "app"}]),
+            Delta(["unit", "change", {"name": "app/0", "application": "app"}]),
+        ])
+        await jasyncio.sleep(0)
+
+        self.assertEqual(list(m.state.state), ["unit"])
+        observer.assert_awaited_once()
+        m._connector.connect_model.assert_awaited_once_with("foo")
+
+
+class TestCharmArchiveGenerator(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.charm_dir = self.tmp / "charm"
+        (self.charm_dir / "src").mkdir(parents=True)
+        (self.charm_dir / "wheels").mkdir()
+        (self.charm_dir / "metadata.yaml").write_text("name: charm\n")
+        (self.charm_dir / "src" / "charm.py").write_text("print('charm')\n" * 100)
+        (self.charm_dir / "wheels" / "dep.whl").write_bytes(bytes(range(256)) * 8)
+        (self.charm_dir / "src" / "café.txt").write_text("unicode\n")
+        (self.charm_dir / "config.yaml").symlink_to("metadata.yaml")
+        (self.charm_dir / ".git").mkdir()
+
+    def test_make_archive(self):
+        import zipfile
+
+        from juju.model import CharmArchiveGenerator
+
+        path = CharmArchiveGenerator(str(self.charm_dir)).make_archive(
+            self.tmp / "charm.charm", workers=2
+        )
+
+        with zipfile.ZipFile(path) as zf:
+            self.assertIsNone(zf.testzip())
+            infos = {info.filename: info for info in zf.infolist()}
+            self.assertEqual(
+                sorted(infos),
+                [
+                    "config.yaml",
+                    "metadata.yaml",
+                    "src/",
+                    "src/café.txt",
+                    "src/charm.py",
+                    "wheels/",
+                    "wheels/dep.whl",
+                ],
+            )
+            self.assertEqual(zf.read("src/charm.py"), b"print('charm')\n" * 100)
+            self.assertEqual(infos["src/charm.py"].compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(zf.read("wheels/dep.whl"), bytes(range(256)) * 8)
+            self.assertEqual(infos["wheels/dep.whl"].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.read("config.yaml"), b"metadata.yaml")
+            self.assertEqual(infos["config.yaml"].external_attr >> 28, 0o12)
+
+    def test_iter_archive(self):
+        from juju.model import CharmArchiveGenerator
+
+        generator = CharmArchiveGenerator(str(self.charm_dir))
+        path = generator.make_archive(self.tmp / "charm.charm", workers=1)
+        self.assertEqual(b"".join(generator.iter_archive(workers=4)), path.read_bytes())
+
+
+class TestAddLocalCharmDir(unittest.IsolatedAsyncioTestCase):
+    async def test_stream(self):
+        import tempfile
+        import zipfile
+        from io import BytesIO
+        from pathlib import Path
+
+        with tempfile.TemporaryDirectory() as tmp:
+            charm_dir = Path(tmp, "charm")
+            charm_dir.mkdir()
+            (charm_dir / "metadata.yaml").write_text("name: charm\n")
+            m = Model()
+            uploaded = []
+
+            def add_local_charm(charm_file, series, size=None):
+                uploaded.append((b"".join(charm_file), size))
+                return f"local:{series}/charm-0"
+
+            m.add_local_charm = add_local_charm
+            url = await m.add_local_charm_dir(charm_dir, "jammy", stream=True)
+
+        self.assertEqual(url, "local:jammy/charm-0")
+        [(data, size)] = uploaded
+        self.assertIsNone(size)
+        with zipfile.ZipFile(BytesIO(data)) as zf:
+            self.assertEqual(zf.read("metadata.yaml"), b"name: charm\n")
+
+
+class TestAddLocalResources(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("juju.client.client.ResourcesFacade")
+    async def test_concurrent_uploads(self, mock_rf):
+        import threading
+        import time
+
+        from juju.client import client
+
+        facade = mock_rf.from_connection.return_value
+        facade.AddPendingResources = mock.AsyncMock(
+            return_value=client.AddPendingResourcesResult(pending_ids=["1", "2", "3"])
+        )
+        m = Model(resource_uploads=2)
+        m.connection = mock.MagicMock()
+        lock = threading.Lock()
+        active = []
+        uploads = []
+
+        def upload(data, path, app_name, res_name, res_type, pending_id):
+            with lock:
+                active.append(res_name)
+                uploads.append((res_name, pending_id, len(active)))
+            time.sleep(0.05)
+            with lock:
+                active.remove(res_name)
+
+        m._upload = upload
+        metadata = {
+            "resources": {
+                "a": {"type": "file"},
+                "b": {"type": "oci-image"},
+                "c": {"type": "file"},
+                "d": {"type": "unknown"},
+            }
+        }
+
+        resource_map = await m.add_local_resources(
+            "app",
+            "local:jammy/app-0",
+            metadata,
+            {"a": "a.txt", "b": "image:latest", "c": "c.txt", "d": "d"},
+        )
+
+        self.assertEqual(resource_map, {"a": "1", "b": "2", "c": "3"})
+        facade.AddPendingResources.assert_awaited_once()
+        names = [
+            r.name for r in facade.AddPendingResources.call_args.kwargs["resources"]
+        ]
+        self.assertEqual(names, ["a", "b", "c"])
+        self.assertEqual(
+            sorted((name, pid) for name, pid, _ in uploads),
+            [("a", "1"), ("b", "2"), ("c", "3")],
+        )
+        self.assertEqual(max(n for _, _, n in uploads), 2)
+
+
+class TestSettingsCache(unittest.IsolatedAsyncioTestCase):
+    def _model(self, config_ttl=0):
+        from juju.client import client
+
+        m = Model(config_ttl=config_ttl)
+        m.connection = mock.MagicMock()
+        self.calls = []
+
+        async def model_get():
+            self.calls.append("ModelGet")
+            await jasyncio.sleep(0.01)
+            return client.ModelConfigResults(
+                config={"default-series": {"source": "model", "value": "jammy"}}
+            )
+
+        facade = mock.MagicMock()
+        facade.ModelGet = mock.AsyncMock(side_effect=model_get)
+        facade.ModelSet = mock.AsyncMock()
+        patcher = mock.patch(
+            "juju.client.client.ModelConfigFacade.from_connection",
+            return_value=facade,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return m
+
+    async def test_concurrent_calls_are_shared(self):
+        m = self._model()
+
+        first, second = await jasyncio.gather(m.get_config(), m.get_config())
+
+        self.assertEqual(first["default-series"].value, "jammy")
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.calls, ["ModelGet"])
+        self.assertEqual(
+            m.settings_cache.stats(), {"hits": 0, "misses": 1, "coalesced": 1}
+        )
+
+        # without a ttl, results aren't reused once the call has completed
+        await m.get_config()
+        self.assertEqual(len(self.calls), 2)
+
+    async def test_ttl_and_invalidation(self):
+        m = self._model(config_ttl=60)
+
+        await m.get_config()
+        await m.get_config()
+        self.assertEqual(len(self.calls), 1)
+        await m.get_config(max_age=0)
+        self.assertEqual(len(self.calls), 2)
+
+        await m.set_config({"default-series": "focal"})
+        await m.get_config()
+        self.assertEqual(len(self.calls), 3)
+
+        # a call in flight when the cache is invalidated isn't kept
+        in_flight = jasyncio.ensure_future(m.get_config(max_age=0))
+        await jasyncio.sleep(0.005)
+        m.settings_cache.invalidate()
+        await in_flight
+        await m.get_config()
+        self.assertEqual(len(self.calls), 5)
+
+    async def test_callers_get_copies(self):
+        m = self._model(config_ttl=60)
+
+        config = await m.get_config()
+        config["default-series"].value = "focal"
+        del config["default-series"]
+
+        config = await m.get_config()
+        self.assertEqual(config["default-series"].value, "jammy")
+        self.assertEqual(len(self.calls), 1)
+
+    async def test_deploy_looks_up_config_and_constraints_concurrently(self):
+        from juju.url import Schema
+
+        m = Model()
+        m._info = mock.MagicMock()
+        m.is_connected = mock.MagicMock(return_value=True)
+        m.connection = mock.MagicMock()
+        running = []
+        overlapped = []
+
+        async def lookup(result):
+            running.append(result)
+            await jasyncio.sleep(0.01)
+            overlapped.append(len(running))
+            running.remove(result)
+            return result
+
+        async def resolve_architecture(url):
+            return await lookup("arm64")
+
+        async def get_config():
+            return await lookup({})
+
+        m._resolve_architecture = resolve_architecture
+        m.get_config = get_config
+        deploy_type = mock.MagicMock()
+        deploy_type.resolve = mock.AsyncMock(
+            side_effect=JujuError("unknown charm or bundle")
+        )
+        m.deploy_types = {Schema.CHARM_HUB: deploy_type}
+
+        with mock.patch(
+            "juju.client.client.CharmsFacade.best_facade_version", return_value=3
+        ):
+            with self.assertRaises(JujuError):
+                await m.deploy("ch:app")
+
+        self.assertEqual(overlapped, [2, 1])
+        self.assertEqual(deploy_type.resolve.call_args.args[1], "arm64")
+
+
+class TestDeployMany(unittest.IsolatedAsyncioTestCase):
+    @mock.patch("juju.client.client.ApplicationFacade")
+    async def test_bulk_deploy(self, mock_af):
+        from juju.client import client
+
+        m = Model()
+        m.connection = mock.MagicMock()
+        m._resolve_architecture = mock.AsyncMock(return_value="amd64")
+        m.get_config = mock.AsyncMock(return_value={})
+
+        async def prepare_deploy(entity_url, defaults=None, **kwargs):
+            self.assertEqual(defaults, ["amd64", {}])
+            if entity_url == "broken":
+                raise JujuError("unknown charm or bundle")
+            return {
+                "charm_url": entity_url,
+                "application": entity_url,
+                "series": "jammy",
+                "config": {},
+                "constraints": None,
+                "endpoint_bindings": None,
+                "resources": {},
+                "storage": None,
+                "num_units": kwargs.get("num_units", 1),
+                "charm_origin": client.CharmOrigin(source="charm-hub"),
+                "server_side_deploy": True,
+            }
+
+        async def wait_for_new(entity_type, entity_id):
+            return entity_id
+
+        m._prepare_deploy = prepare_deploy
+        m._wait_for_new = wait_for_new
+        facade = mock_af.from_connection.return_value
+        facade.DeployFromRepository = mock.AsyncMock(
+            return_value=client.DeployFromRepositoryResults(
+                results=[
+                    client.DeployFromRepositoryResult(errors=[]),
+                    client.DeployFromRepositoryResult(
+                        errors=[client.Error(message="application already exists")]
+                    ),
+                    client.DeployFromRepositoryResult(errors=[]),
+                ]
+            )
+        )
+
+        results = await m.deploy_many(
+            [
+                {"entity_url": "a", "num_units": 3},
+                {"entity_url": "broken"},
+                {"entity_url": "b"},
+                {"entity_url": "c"},
+            ],
+            concurrency=2,
+        )
+
+        facade.DeployFromRepository.assert_awaited_once()
+        args = facade.DeployFromRepository.call_args.args[0]
+        self.assertEqual([a.applicationname for a in args], ["a", "b", "c"])
+        self.assertEqual(args[0].num_units, 3)
+        m.get_config.assert_awaited_once()
+        self.assertEqual(results[0], "a")
+        self.assertIsInstance(results[1], JujuError)
+        self.assertIsInstance(results[2], JujuError)
+        self.assertIn("already exists", str(results[2]))
+        self.assertEqual(results[3], "c")
+
+    @mock.patch("juju.client.client.ApplicationFacade")
+    async def test_failed_upload_is_per_application(self, mock_af):
+        from juju.client import client
+
+        m = Model()
+        m.connection = mock.MagicMock()
+
+        def upload(*args):
+            raise JujuError("boom")
+
+        m._upload = upload
+        facade = mock_af.from_connection.return_value
+        facade.DeployFromRepository = mock.AsyncMock(
+            return_value=client.DeployFromRepositoryResults(
+                results=[
+                    client.DeployFromRepositoryResult(
+                        errors=[],
+                        pendingresourceuploads=[
+                            {"filename": "/nonexistent", "name": "res", "type": "file"}
+                        ],
+                    )
+                ]
+            )
+        )
+        facade.Deploy = mock.AsyncMock(
+            return_value=client.ErrorResults(results=[client.ErrorResult()])
+        )
+
+        errors = await m._submit_deploys([
+            client.DeployFromRepositoryArg(applicationname="a"),
+            client.ApplicationDeploy(application="b"),
+        ])
+
+        self.assertEqual(errors, [["uploading resource res: boom"], []])
+        facade.Deploy.assert_awaited_once()
@@ -0,0 +1,102 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+import unittest
+from unittest import mock
+
+from juju.client.client import Delta
+from juju.delta import get_entity_delta
+from juju.model import Model
+from juju.query import StateIndex, get_field
+
+
+def _unit(name, workload="active", machine="0"):
+    return {
+        "name": name,
+        "application": name.split("/")[0],
+        "machine-id": machine,
+        "workload-status": {"current": workload, "message": f"{name} is {workload}"},
+        "agent-status": {"current": "idle"},
+    }
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.model = Model()
+        self.model._connector = mock.MagicMock()
+        self.apply("unit", "add", _unit("db-1/0", "error", "0"))
+        self.apply("unit", "add", _unit("db-1/1", "active", "1"))
+        self.apply("unit", "add", _unit("db-2/0", "error", "2"))
+        self.apply("unit", "add", _unit("web/0", "error", "0"))
+        self.apply(
+            "application", "add", {"name": "db-1", "status": {"current": "error"}}
+        )
+
+    def apply(self, entity, type_, data):
+        self.model.state.apply_delta(get_entity_delta(Delta([entity, type_, data])))
+
+    def ids(self, *args, **kwargs):
+        return [d["id"] for d in self.model.query(*args, fields=[], **kwargs)]
+
+    def test_filters(self):
+        self.assertEqual(
+            self.ids(
+                "unit",
+                application="db-*",
+                where={"workload-status.current": "error"},
+            ),
+            ["db-1/0", "db-2/0"],
+        )
+        self.assertEqual(self.ids("unit", machine="0"), ["db-1/0", "web/0"])
+        self.assertEqual(self.ids("unit", name="*/1"), ["db-1/1"])
+        self.assertEqual(
+            self.ids("unit", where={"workload-status.current": ["active", "err*"]}),
+            ["db-1/0", "db-1/1", "db-2/0", "web/0"],
+        )
+        self.assertEqual(
+            self.ids("unit", where={"workload-status.message": "web*"}), ["web/0"]
+        )
+        self.assertEqual(self.ids("application", application="db-1"), ["db-1"])
+        self.assertEqual(self.ids("application", machine="0"), [])
+        self.assertEqual(self.ids("machine"), [])
+
+    def test_projection(self):
+        self.assertEqual(
+            self.model.query(
+                "unit", name="web/0", fields=["workload-status.message", "missing.x"]
+            ),
+            [
+                {
+                    "id": "web/0",
+                    "workload-status.message": "web/0 is error",
+                    "missing.x": None,
+                }
+            ],
+        )
+        (data,) = self.model.query("unit", name="web/0")
+        self.assertEqual(data["machine-id"], "0")
+
+    def test_index_follows_deltas(self):
+        self.apply("unit", "change", _unit("db-1/0", "active", "0"))
+        self.apply("unit", "remove", _unit("db-2/0", "error", "2"))
+        where = {"workload-status.current": "error"}
+        self.assertEqual(self.ids("unit", where=where), ["web/0"])
+        index = self.model.state.index
+        self.assertEqual(
+            index.lookup("unit", "workload-status.current", "active"),
+            {"db-1/0", "db-1/1"},
+        )
+        self.assertIsNone(index.lookup("unit", "workload-status.message", "x"))
+
+        rebuilt = StateIndex()
+        rebuilt.rebuild(self.model.state.state)
+        self.assertEqual(rebuilt._index, index._index)
+
+
+class TestGetField(unittest.TestCase):
+    def test_get_field(self):
+        data = {"a": {"b": "c"}, "d": "e"}
+        self.assertEqual(get_field(data, "a.b"), "c")
+        self.assertEqual(get_field(data, "d"), "e")
+        self.assertIsNone(get_field(data, "d.x"))
+        self.assertIsNone(get_field(data, "x"))
@@ -0,0 +1,90 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from juju import jasyncio
+from juju.client.client import Delta
+from juju.model import Model
+from juju.replay import DeltaRecorder, DeltaReplay, write_recording
+
+BATCHES = [
+    [
+        ["application", "change", {"name": "app"}],
+        ["unit", "change", {"name": "app/0", "application": "app"}],
+    ],
+    [["unit", "remove", {"name": "app/0", "application": "app"}]],
+]
+
+
+class TestDeltaRecorder(unittest.TestCase):
+    def test_record(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "deltas.jsonl"
+            with DeltaRecorder(model, path, rpc=True) as recorder:
+                self.assertIs(model._delta_recorder, recorder)
+                self.assertIs(model.connection().recorder, recorder)
+                recorder.record_deltas([Delta(d) for d in BATCHES[0]])
+                recorder.record_rpc('{"type": "Client"}', {"response": {}})
+            self.assertIsNone(model._delta_recorder)
+            self.assertIsNone(model.connection().recorder)
+            # Ignored once stopped
+            recorder.record_deltas([Delta(d) for d in BATCHES[1]])
+
+            records = [json.loads(line) for line in path.read_text().splitlines()]
+        self.assertEqual([r["type"] for r in records], ["next", "rpc"])
+        self.assertEqual(records[0]["deltas"], BATCHES[0])
+        self.assertEqual(records[1]["request"], {"type": "Client"})
+        self.assertEqual((recorder.batches, recorder.rpcs), (1, 1))
+
+    def test_login_is_redacted(self):
+        model = Model()
+        model._connector = mock.MagicMock()
+        login = {
+            "type": "Admin",
+            "request": "Login",
+            "params": {"auth-tag": "user-admin", "credentials": "secret"},
+        }
+        response = {"request-id": 1, "response": {"discharge-required": "macaroon"}}
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "deltas.jsonl"
+            with DeltaRecorder(model, path, rpc=True) as recorder:
+                recorder.record_rpc(json.dumps(login), response)
+            contents = path.read_text()
+        record = json.loads(contents)
+        self.assertEqual(record["request"]["request"], "Login")
+        self.assertEqual(record["request"]["params"], "<redacted>")
+        self.assertEqual(record["response"]["response"], "<redacted>")
+        self.assertNotIn("secret", contents)
+        self.assertNotIn("macaroon", contents)
+        self.assertEqual(response["response"], {"discharge-required": "macaroon"})
+
+
+class TestDeltaReplay(unittest.IsolatedAsyncioTestCase):
+    async def test_replay(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "deltas.jsonl"
+            write_recording(path, BATCHES)
+            model = Model()
+            seen = []
+
+            async def on_change(delta, old, new, model):
+                seen.append((delta.entity, delta.type))
+
+            model.add_observer(on_change, queue_size=10)
+            self.assertEqual(await DeltaReplay(path).replay(model, speed=10), 2)
+
+        self.assertEqual(list(model.applications), ["app"])
+        self.assertEqual(model.units, {})
+        self.assertTrue(model._watch_received.is_set())
+        await jasyncio.sleep(0)
+        await model.disconnect()
+        self.assertEqual(
+            seen, [("application", "add"), ("unit", "add"), ("unit", "remove")]
+        )
@@ -3,8 +3,10 @@
 
 import unittest
 from random import sample
+from unittest import mock
 
-from juju.status import derive_status
+from juju import jasyncio
+from juju.status import StatusCache, derive_status
 
 
 class TestStatus(unittest.TestCase):
@@ -23,3 +25,94 @@ class TestStatus(unittest.TestCase):
     def test_derive_status_with_highest_value(self):
         result = derive_status(sample(["error", "active", "terminated"], 3))
         self.assertEqual(result, "error")
+
+
+@mock.patch("juju.client.client.ClientFacade")
+class TestStatusCache(unittest.IsolatedAsyncioTestCase):
+    def _facade(self, mock_cf):
+        release = jasyncio.Event()
+
+        async def full_status(patterns=None):
+            await release.wait()
+            return mock.sentinel.status
+
+        facade = mock_cf.from_connection.return_value
+        facade.FullStatus = mock.AsyncMock(side_effect=full_status)
+        return facade, release
+
+    async def test_concurrent_requests_share_one_call(self, mock_cf):
+        facade, release = self._facade(mock_cf)
+        cache = StatusCache(mock.MagicMock())
+
+        tasks = [jasyncio.ensure_future(cache.get()) for _ in range(200)]
+        await jasyncio.sleep(0)
+        release.set()
+        results = await jasyncio.gather(*tasks)
+
+        self.assertTrue(all(r is mock.sentinel.status for r in results))
+        facade.FullStatus.assert_awaited_once_with(patterns=None)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 1, "coalesced": 199})
+
+        # with no ttl, a later request makes a new call
+        await cache.get()
+        self.assertEqual(facade.FullStatus.await_count, 2)
+
+    async def test_ttl_and_patterns(self, mock_cf):
+        facade, release = self._facade(mock_cf)
+        release.set()
+        cache = StatusCache(mock.MagicMock(), ttl=60)
+
+        await cache.get()
+        await cache.get()
+        self.assertEqual(facade.FullStatus.await_count, 1)
+
+        await cache.get(["db-*", "app"])
+        await cache.get(["app", "db-*"])
+        self.assertEqual(facade.FullStatus.await_count, 2)
+        facade.FullStatus.assert_awaited_with(patterns=["db-*", "app"])
+
+        await cache.get(max_age=0)
+        self.assertEqual(facade.FullStatus.await_count, 3)
+
+        cache.invalidate()
+        await cache.get()
+        self.assertEqual(facade.FullStatus.await_count, 4)
+
+    async def test_results_are_only_kept_while_reusable(self, mock_cf):
+        _, release = self._facade(mock_cf)
+        release.set()
+        cache = StatusCache(mock.MagicMock())
+
+        await cache.get()
+        self.assertEqual(cache._results, {})
+
+        await cache.get(["app"], max_age=10)
+        self.assertEqual(list(cache._results), [("app",)])
+
+        with mock.patch("juju.status.time.monotonic", return_value=1e12):
+            await cache.get()
+        self.assertEqual(cache._results, {})
+
+    async def test_call_in_flight_when_invalidated_is_not_kept(self, mock_cf):
+        _, release = self._facade(mock_cf)
+        cache = StatusCache(mock.MagicMock(), ttl=60)
+
+        in_flight = jasyncio.ensure_future(cache.get())
+        await jasyncio.sleep(0)
+        cache.invalidate()
+        release.set()
+        await in_flight
+
+        self.assertEqual(cache._results, {})
+
+    async def test_cancelled_caller_does_not_fail_others(self, mock_cf):
+        _, release = self._facade(mock_cf)
+        cache = StatusCache(mock.MagicMock())
+
+        first = jasyncio.ensure_future(cache.get())
+        second = jasyncio.ensure_future(cache.get())
+        await jasyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        self.assertIs(await second, mock.sentinel.status)
@@ -5,7 +5,7 @@ import unittest
 
 import pytest
 
-from juju import utils
+from juju import jasyncio, utils
 from juju.client import client
 from juju.errors import JujuError
 from juju.url import URL
@@ -216,3 +216,113 @@ class TestShouldUpgradeResource(unittest.TestCase):
             )
         }
         assert utils.should_upgrade_resource(res, existing, {})
+
+
+class TestBlockUntilNotified(unittest.IsolatedAsyncioTestCase):
+    async def test_checks_only_when_notified(self):
+        event = jasyncio.Event()
+        checks = []
+        ready = False
+
+        def condition():
+            checks.append(ready)
+            return ready
+
+        waiter = jasyncio.ensure_future(
+            utils.block_until_notified(condition, event=event, timeout=1)
+        )
+        await jasyncio.sleep(0.05)
+        self.assertEqual(checks, [False])
+
+        ready = True
+        event.set()
+        await waiter
+        self.assertEqual(checks, [False, True])
+
+    async def test_recheck_period(self):
+        ready = []
+        await utils.block_until_notified(
+            lambda: ready.append(None) or len(ready) > 2,
+            event=jasyncio.Event(),
+            timeout=1,
+            recheck_period=0.01,
+        )
+
+    async def test_timeout(self):
+        with self.assertRaises(jasyncio.TimeoutError):
+            await utils.block_until_notified(
+                lambda: False, event=jasyncio.Event(), timeout=0.01
+            )
+
+
+class TestYaml(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def test_load_yaml_file(self):
+        import os
+        from unittest import mock
+
+        path = self.tmp / "metadata.yaml"
+        path.write_text("name: one\n")
+
+        with mock.patch.object(
+            utils, "yaml_load", side_effect=utils.yaml_load
+        ) as yaml_load:
+            data = utils.load_yaml_file(path)
+            data["name"] = "changed"
+            self.assertEqual(utils.load_yaml_file(path), {"name": "one"})
+            self.assertEqual(yaml_load.call_count, 1)
+
+            path.write_text("name: two\n")
+            os.utime(path, ns=(10**18, 10**18))
+            self.assertEqual(utils.load_yaml_file(path), {"name": "two"})
+            self.assertEqual(yaml_load.call_count, 2)
+
+        path.write_text("name: one\n---\nname: two\n")
+        self.assertEqual(
+            utils.load_yaml_file(path, all_documents=True),
+            [{"name": "one"}, {"name": "two"}],
+        )
+        with self.assertRaises(OSError):
+            utils.load_yaml_file(self.tmp / "missing.yaml")
+
+    def test_local_charm_data(self):
+        import zipfile
+
+        charm_dir = self.tmp / "charm"
+        charm_dir.mkdir()
+        (charm_dir / "metadata.yaml").write_text("name: charm\n")
+        self.assertEqual(utils.get_local_charm_metadata(charm_dir), {"name": "charm"})
+        self.assertEqual(utils.get_local_charm_manifest(charm_dir), {})
+
+        charm = self.tmp / "charm.charm"
+        with zipfile.ZipFile(charm, "w") as zf:
+            zf.writestr("metadata.yaml", "name: archived\n")
+        self.assertEqual(utils.get_local_charm_metadata(charm), {"name": "archived"})
+
+    def test_yaml_dump(self):
+        data = {"app": {"b": 1, "a": [1, 2]}}
+        dumped = utils.yaml_dump(data, default_flow_style=False)
+        self.assertEqual(utils.yaml_load(dumped), data)
+
+    async def test_wait_for_bundle(self):
+        from unittest import mock
+
+        (self.tmp / "bundle.yaml").write_text("applications:\n  app: {}\n")
+        model = mock.Mock()
+        model.wait_for_idle = mock.AsyncMock()
+
+        await utils.wait_for_bundle(model, self.tmp)
+        await utils.wait_for_bundle(model, self.tmp / "bundle.yaml")
+        await utils.wait_for_bundle(model, "services:\n  other: {}\n")
+
+        self.assertEqual(
+            [c.args[0] for c in model.wait_for_idle.await_args_list],
+            [["app"], ["app"], ["other"]],
+        )
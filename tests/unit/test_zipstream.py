@@ -0,0 +1,97 @@
+# Copyright 2026 Canonical Ltd.
+# Licensed under the Apache V2, see LICENCE file for details.
+
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from juju._zipstream import ArchiveMember, iter_zip, zip_end
+
+
+class TestIterZip(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "dir").mkdir()
+        (self.root / "dir" / "text.txt").write_text("text\n" * 100)
+        (self.root / "dir" / "dep.whl").write_bytes(bytes(range(256)) * 4)
+        (self.root / "dir" / "ünïcode").write_text("unicode\n")
+        (self.root / "link").symlink_to("dir/text.txt")
+
+    def _entries(self):
+        return [
+            ("dir", str(self.root / "dir"), "dir"),
+            ("file", str(self.root / "dir" / "text.txt"), "dir/text.txt"),
+            ("file", str(self.root / "dir" / "dep.whl"), "dir/dep.whl"),
+            ("file", str(self.root / "dir" / "ünïcode"), "dir/ünïcode"),
+            ("link", str(self.root / "link"), "link"),
+        ]
+
+    def test_archive(self):
+        data = b"".join(iter_zip(self._entries(), workers=2))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertIsNone(zf.testzip())
+            infos = {info.filename: info for info in zf.infolist()}
+            self.assertEqual(
+                list(infos),
+                ["dir/", "dir/text.txt", "dir/dep.whl", "dir/ünïcode", "link"],
+            )
+            self.assertEqual(zf.read("dir/text.txt"), b"text\n" * 100)
+            self.assertEqual(infos["dir/text.txt"].compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(infos["dir/dep.whl"].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.read("dir/ünïcode"), b"unicode\n")
+            self.assertEqual(zf.read("link"), b"dir/text.txt")
+            self.assertEqual(infos["link"].external_attr >> 28, 0o12)
+            self.assertTrue(infos["dir/"].is_dir())
+
+    def test_same_output_for_any_workers(self):
+        self.assertEqual(
+            b"".join(iter_zip(self._entries(), workers=1)),
+            b"".join(iter_zip(self._entries(), workers=8)),
+        )
+
+    def test_uncompressed(self):
+        data = b"".join(iter_zip(self._entries(), compress=False))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(
+                {info.compress_type for info in zf.infolist()}, {zipfile.ZIP_STORED}
+            )
+
+    def test_empty(self):
+        data = b"".join(iter_zip([]))
+
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.infolist(), [])
+
+
+class TestZip64(unittest.TestCase):
+    def test_large_member_headers(self):
+        with tempfile.NamedTemporaryFile() as f:
+            member = ArchiveMember("file", f.name, os.path.basename(f.name), False)
+        member.size = member.compressed_size = 5 << 30
+        member.offset = 6 << 30
+
+        local = member.local_header()
+        self.assertEqual(struct.unpack("<2L", local[18:26]), (0xFFFFFFFF,) * 2)
+        self.assertEqual(struct.unpack("<2H2Q", local[-20:]), (1, 16, 5 << 30, 5 << 30))
+        central = member.central_header()
+        self.assertEqual(
+            struct.unpack("<2H3Q", central[-28:]),
+            (1, 24, 5 << 30, 5 << 30, 6 << 30),
+        )
+
+    def test_end_records(self):
+        self.assertEqual(len(zip_end(10, 100, 1000)), 22)
+
+        end = zip_end(0x10000, 100, 1000)
+        self.assertEqual(end[:4], b"PK\x06\x06")
+        self.assertEqual(end[56:60], b"PK\x06\x07")
+        self.assertEqual(struct.unpack("<2H", end[-14:-10]), (0xFFFF, 0xFFFF))